@@ -0,0 +1,21 @@
+"""add page content fingerprint to pages
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('pages', sa.Column('fingerprint', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('pages', 'fingerprint')
@@ -0,0 +1,105 @@
+"""
+Redis 配置的进程内快照。
+
+LLM 调用热路径 (provider 列表 / provider 运行时配置) 与 Job 启动 (Pipeline 并发规则)
+每次都读 Redis。快照按 key 缓存解码后的值 (含 "不存在"), 写入方 SET 后向
+CONFIG_CHANNEL 发布 key 名, 各进程的 run() 订阅该频道并失效对应 key, 下次读取时回源。
+
+- run() 未运行 (或订阅断开) 时不使用快照, 直接读 Redis, 避免读到过期配置
+- 订阅 (重) 建立时清空快照, 弥补断开期间错过的通知
+- 条目超过 SNAPSHOT_MAX_AGE 仍回源一次, 兜底漏掉的通知 (如直接改 Redis)
+
+未使用 keyspace notifications: 需要服务端开启 notify-keyspace-events, 部署不可控。
+"""
+from __future__ import annotations
+import asyncio
+import json
+import time
+from typing import Any, Callable
+
+import structlog
+from prometheus_client import Counter
+
+logger = structlog.get_logger()
+
+CONFIG_CHANNEL = "pdf_sku:config_changed"
+SNAPSHOT_MAX_AGE = 300  # 秒
+
+CONFIG_SNAPSHOT_READS = Counter(
+    "pdf_config_snapshot_reads_total", "Config snapshot reads", ["result"])  # hit | miss | bypass
+
+
+class ConfigSnapshot:
+    """按 Redis key 缓存解码后的配置值。"""
+
+    def __init__(self, max_age: float = SNAPSHOT_MAX_AGE) -> None:
+        self._max_age = max_age
+        self._values: dict[str, tuple[float, Any]] = {}
+        self._live = False  # 订阅生效中
+        self._version = 0  # 每次失效 +1; 回源期间发生失效则不写入快照
+
+    async def get(
+        self,
+        redis,
+        key: str,
+        decode: Callable[[str], Any] = json.loads,
+    ) -> Any:
+        """读取 key 的解码值; 不存在返回 None。Redis 异常向上抛出。"""
+        if self._live:
+            entry = self._values.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self._max_age:
+                CONFIG_SNAPSHOT_READS.labels(result="hit").inc()
+                return entry[1]
+            CONFIG_SNAPSHOT_READS.labels(result="miss").inc()
+        else:
+            CONFIG_SNAPSHOT_READS.labels(result="bypass").inc()
+        version = self._version
+        raw = await redis.get(key)
+        value = decode(raw) if raw else None
+        if self._live and version == self._version:
+            self._values[key] = (time.monotonic(), value)
+        return value
+
+    def invalidate(self, key: str | None = None) -> None:
+        self._version += 1
+        if key is None:
+            self._values.clear()
+        else:
+            self._values.pop(key, None)
+
+    async def publish_change(self, redis, key: str) -> None:
+        """写入方调用: 本进程立即失效并通知其他进程。"""
+        self.invalidate(key)
+        try:
+            await redis.publish(CONFIG_CHANNEL, key)
+        except Exception as e:
+            logger.warning("config_change_publish_failed", key=key, error=str(e))
+
+    async def run(self, redis) -> None:
+        """订阅配置变更频道。在 lifespan 中启动。"""
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(CONFIG_CHANNEL)
+                self.invalidate()
+                self._live = True
+                async for msg in pubsub.listen():
+                    if msg.get("type") == "message":
+                        self.invalidate(msg["data"])
+                        logger.info("config_snapshot_invalidated", key=msg["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("config_snapshot_pubsub_error")
+                self._live = False
+                await asyncio.sleep(1)
+            finally:
+                self._live = False
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+# 全局单例
+config_snapshot = ConfigSnapshot()
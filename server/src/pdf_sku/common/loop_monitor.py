@@ -0,0 +1,36 @@
+"""
+事件循环延迟监控。
+
+周期性 sleep(interval), 实际唤醒时间与预期之差即为事件循环被阻塞的时长
+(同步 I/O、CPU 密集计算)。导出 pdf_event_loop_lag_seconds (Histogram + 最近值 Gauge)。
+"""
+from __future__ import annotations
+import asyncio
+import os
+import time
+
+from prometheus_client import Gauge, Histogram
+import structlog
+
+logger = structlog.get_logger()
+
+LOOP_LAG_INTERVAL = float(os.environ.get("LOOP_LAG_INTERVAL", "0.5"))  # 秒
+LOOP_LAG_WARN = 0.25  # 秒, 超过时打日志
+
+EVENT_LOOP_LAG = Histogram(
+    "pdf_event_loop_lag_seconds", "Event loop wake-up delay",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5))
+EVENT_LOOP_LAG_LAST = Gauge(
+    "pdf_event_loop_lag_last_seconds", "Most recent event loop wake-up delay")
+
+
+async def loop_lag_loop(interval: float = LOOP_LAG_INTERVAL) -> None:
+    """后台采样循环。在 lifespan 中启动。"""
+    while True:
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.perf_counter() - expected)
+        EVENT_LOOP_LAG.observe(lag)
+        EVENT_LOOP_LAG_LAST.set(lag)
+        if lag > LOOP_LAG_WARN:
+            logger.warning("event_loop_lag", lag_ms=round(lag * 1000, 1))
@@ -163,6 +163,7 @@ class Page(Base):
     features: Mapped[dict | None] = mapped_column(JSONB)
     product_description: Mapped[dict | None] = mapped_column(JSONB)
     screenshot_path: Mapped[str | None] = mapped_column(Text)
+    fingerprint: Mapped[str | None] = mapped_column(Text)  # 页面内容指纹 (页级结果缓存键)
     parse_time_ms: Mapped[int | None] = mapped_column(Integer)
     ocr_time_ms: Mapped[int | None] = mapped_column(Integer)
     llm_time_ms: Mapped[int | None] = mapped_column(Integer)
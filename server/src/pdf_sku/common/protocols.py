@@ -70,6 +70,7 @@ class FeedbackCollector(Protocol):
 class StorageProvider(Protocol):
     """§2.9 Storage → 文件存储"""
     async def save_file(self, path: str, data: bytes) -> str: ...
+    async def save_file_from_path(self, object_name: str, file_path: str) -> str: ...
     async def read_file(self, path: str) -> bytes: ...
     async def delete_file(self, path: str) -> bool: ...
     async def get_url(self, path: str, expires: int = 3600) -> str: ...
@@ -0,0 +1,56 @@
+"""
+进程常驻内存 (RSS) 采样。
+
+PeakRSS 在 async with 块内周期性读取当前 RSS, 记录块内峰值及相对进入时的增量。
+RSS 为进程级指标: 同进程并发的其他任务也会计入, 用于观察趋势而非精确归因。
+"""
+from __future__ import annotations
+import asyncio
+import os
+import resource
+
+RSS_SAMPLE_INTERVAL = 0.2  # 秒
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss() -> int:
+    """当前 RSS (bytes)。无 /proc 时退化为进程生命周期峰值。"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class PeakRSS:
+    """async with PeakRSS() as rss: ... → rss.peak / rss.growth (bytes)。"""
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL) -> None:
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self.baseline = 0
+        self.peak = 0
+
+    @property
+    def growth(self) -> int:
+        return max(0, self.peak - self.baseline)
+
+    def sample(self) -> None:
+        self.peak = max(self.peak, current_rss())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            self.sample()
+
+    async def __aenter__(self) -> "PeakRSS":
+        self.baseline = self.peak = current_rss()
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self.sample()
@@ -6,8 +6,8 @@ EvaluatorService — 主入口。对齐: Evaluator 详设 §5.1
 2. Cache 查询 (Redis → DB)
 3. 分布式锁内评估:
    a. 采样 (Sampler)
-   b. 截图渲染 (PyMuPDF)
-   c. LLM 评估 (LLMService)
+   b. 截图渲染 (PyMuPDF, 分组经有界队列流式交给评估)
+   c. LLM 评估 (LLMService, 与渲染重叠)
    d. 聚合评分 (Scorer → C_doc)
    e. 方差检测 (VarianceDetector)
    f. 路由决策 (RouteDecider)
@@ -16,6 +16,8 @@ EvaluatorService — 主入口。对齐: Evaluator 详设 §5.1
 """
 from __future__ import annotations
 import asyncio
+import math
+import os
 import time
 from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
@@ -32,12 +34,27 @@ from pdf_sku.evaluator.scorer import Scorer, PageScore
 from pdf_sku.evaluator.router_logic import RouteDecider
 from pdf_sku.evaluator.variance_detector import VarianceDetector
 from pdf_sku.evaluator.eval_cache import EvalCache
+from pdf_sku.llm_adapter.service import EVAL_BATCH_SIZE
+from pdf_sku.common.rss import PeakRSS
 from pdf_sku.config.service import ConfigProvider
 from pdf_sku.common.exceptions import EvalFailedError
+from pdf_sku.pipeline.raster_store import get_raster_store
+from pdf_sku.settings import settings
+from prometheus_client import Histogram
 import structlog
 
 logger = structlog.get_logger()
 
+EARLY_STOP_MIN_PAGES = 9  # 序贯采样: 至少评估的页数 (3 批)
+EVAL_RENDER_AHEAD = int(os.environ.get("EVAL_RENDER_AHEAD", "2"))  # 预渲染组数上限
+
+EVAL_TIME_TO_ROUTE = Histogram(
+    "pdf_eval_time_to_route_seconds", "Sampling start to route decision", ["mode"],
+    buckets=(1, 5, 10, 20, 30, 60, 120, 300, 600))
+EVAL_PEAK_RSS = Histogram(
+    "pdf_eval_peak_rss_bytes", "Process RSS high-water mark while a job is evaluating",
+    buckets=tuple(2**20 * mb for mb in (128, 256, 512, 1024, 2048, 4096, 8192)))
+
 # 进程池 (PDF 渲染)
 _render_pool: ProcessPoolExecutor | None = None
 
@@ -62,6 +79,58 @@ def _render_pages_batch(file_path: str, pages: list[int], dpi: int = 150) -> lis
     return screenshots
 
 
+_DONE = object()
+
+
+class _ScreenshotStream:
+    """
+    按 EVAL_BATCH_SIZE 分组渲染截图, 经有界队列 (EVAL_RENDER_AHEAD 组) 交给评估方。
+
+    后台任务顺序渲染各组, 队列满时暂停, 内存中的截图最多约
+    (EVAL_RENDER_AHEAD + 评估并发 + 1) 组。渲染失败 (空截图) 的页被剔除。
+    """
+
+    def __init__(self, render, pages: list[int]) -> None:
+        self._render = render
+        self._pages = pages
+        self.groups = 0  # 已交出的组数 (= LLM 调用数)
+        self.rendered = 0
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=EVAL_RENDER_AHEAD)
+        producer = asyncio.create_task(self._produce(queue))
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                pages, shots = item
+                self.groups += 1
+                yield pages, shots
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def _produce(self, queue: asyncio.Queue) -> None:
+        try:
+            for i in range(0, len(self._pages), EVAL_BATCH_SIZE):
+                group = self._pages[i:i + EVAL_BATCH_SIZE]
+                shots = await self._render(group)
+                valid = [(p, s) for p, s in zip(group, shots) if s]
+                if not valid:
+                    continue
+                self.rendered += len(valid)
+                await queue.put(([p for p, _ in valid], [s for _, s in valid]))
+            await queue.put(_DONE)
+        except Exception as e:
+            await queue.put(e)
+
+
 class EvaluatorService:
     """文档质量评估 + 路由决策的完整编排器。"""
 
@@ -71,6 +140,7 @@ class EvaluatorService:
         cache: EvalCache,
         config_provider: ConfigProvider,
         process_pool: ProcessPoolExecutor | None = None,
+        adaptive_sampling: bool | None = None,
     ) -> None:
         self._llm = llm_service
         self._cache = cache
@@ -80,6 +150,8 @@ class EvaluatorService:
         self._router = RouteDecider()
         self._variance = VarianceDetector()
         self._pool = process_pool
+        self._adaptive = (settings.eval_adaptive_sampling
+                          if adaptive_sampling is None else adaptive_sampling)
 
     async def evaluate(
         self,
@@ -159,6 +231,7 @@ class EvaluatorService:
         cache_key: str,
     ) -> dict:
         """实际评估逻辑 (锁内执行)。"""
+        t0 = time.monotonic()
         # 1. 采样
         sample_pages = self._sampler.select_pages(
             total=job.total_pages,
@@ -170,46 +243,53 @@ class EvaluatorService:
                 db, job, prescan_data, profile,
                 route="HUMAN_ALL", reason="no_pages_to_sample")
 
-        # 2. 截图渲染
-        file_path = self._resolve_file_path(job)
-        loop = asyncio.get_event_loop()
-        if self._pool:
-            screenshots = await loop.run_in_executor(
-                self._pool, _render_pages_batch, str(file_path), sample_pages)
-        else:
-            screenshots = _render_pages_batch(str(file_path), sample_pages)
+        prescan_penalty = prescan_data.get("total_penalty", 0.0)
+        if isinstance(prescan_penalty, list):
+            prescan_penalty = sum(p.get("weight", 0) for p in prescan_penalty) if prescan_penalty else 0.0
+        variance_threshold = profile.get("prescan_rules", {}).get("score_variance_threshold", 0.08)
 
-        # 过滤空截图
-        valid_pairs = [(p, s) for p, s in zip(sample_pages, screenshots) if s]
-        if not valid_pairs:
+        stop_when = None
+        if self._adaptive:
+            # 序贯采样: 按均匀覆盖顺序渲染 / 发送, C_doc 区间落入单一路由带即停止
+            sample_pages = self._sampler.sequential_order(sample_pages)
+            stop_when = self._early_stop_check(
+                job, weights, thresholds, prescan_penalty, variance_threshold)
+
+        # 2-3. 截图渲染 + LLM 评估 (流式: 分组渲染经有界队列交给评估, 渲染与 LLM 调用重叠)
+        stream = _ScreenshotStream(self._render_group(job), sample_pages)
+        async with PeakRSS() as rss:
+            page_scores = await self._llm.evaluate_stream(
+                stream,
+                category=job.category,
+                stop_when=stop_when,
+                planned_pages=len(sample_pages),
+            )
+        EVAL_PEAK_RSS.observe(rss.peak)
+        logger.info("eval_memory", job_id=str(job.job_id),
+                    peak_rss_mb=round(rss.peak / 2**20, 1),
+                    rss_growth_mb=round(rss.growth / 2**20, 1))
+
+        if not page_scores and stream.rendered == 0:
             return await self._create_degraded(
                 db, job, prescan_data, profile,
                 route="HUMAN_ALL", reason="screenshot_render_failed")
-
-        valid_pages, valid_screenshots = zip(*valid_pairs)
-
-        # 3. LLM 评估
-        page_scores = await self._llm.evaluate_document(
-            screenshots=list(valid_screenshots),
-            category=job.category,
-            sample_pages=list(valid_pages),
-        )
+        evaluated_pages = sorted(ps.page_no for ps in page_scores)
+        calls = stream.groups
+        calls_planned = math.ceil(len(sample_pages) / EVAL_BATCH_SIZE)
 
         # 4. 聚合评分
         dimension_scores = self._scorer.aggregate(page_scores)
-        prescan_penalty = prescan_data.get("total_penalty", 0.0)
-        if isinstance(prescan_penalty, list):
-            prescan_penalty = sum(p.get("weight", 0) for p in prescan_penalty) if prescan_penalty else 0.0
         c_doc = self._scorer.compute_c_doc(dimension_scores, weights, prescan_penalty)
 
         # 5. 方差检测
         overall_scores = [ps.overall for ps in page_scores]
-        variance_threshold = profile.get("prescan_rules", {}).get("score_variance_threshold", 0.08)
         variance, variance_forced = self._variance.check(
             overall_scores, variance_threshold=variance_threshold)
 
         # 6. 路由决策
         route, route_reason = self._router.decide(c_doc, thresholds, variance_forced)
+        time_to_route = time.monotonic() - t0
+        EVAL_TIME_TO_ROUTE.labels(mode="adaptive" if self._adaptive else "full").observe(time_to_route)
 
         # 7. 持久化
         eval_data = {
@@ -224,10 +304,17 @@ class EvaluatorService:
             "thresholds_used": thresholds,
             "prescan": prescan_data,
             "sampling": {
-                "pages": list(valid_pages),
-                "sample_ratio": len(valid_pages) / max(job.total_pages, 1),
+                "pages": evaluated_pages,
+                "sample_ratio": len(evaluated_pages) / max(job.total_pages, 1),
                 "variance": variance,
                 "variance_forced": variance_forced,
+                "adaptive": self._adaptive,
+                "planned_pages": len(sample_pages),
+                "eval_calls": calls,
+                "eval_calls_saved": max(calls_planned - calls, 0),
+                "time_to_route_ms": int(time_to_route * 1000),
+                "peak_rss_mb": round(rss.peak / 2**20, 1),
+                "rss_growth_mb": round(rss.growth / 2**20, 1),
             },
             "page_evaluations": {
                 str(ps.page_no): ps.overall for ps in page_scores
@@ -260,6 +347,51 @@ class EvaluatorService:
 
         return eval_data
 
+    def _render_group(self, job: PDFJob):
+        """单组截图渲染 (经 RasterStore, 已落盘的页不再渲染)。"""
+        file_path = str(self._resolve_file_path(job))
+        job_id = str(job.job_id)
+
+        async def render_batch(pages: list[int]) -> list[bytes]:
+            if self._pool:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._pool, _render_pages_batch, file_path, pages)
+            return await asyncio.to_thread(_render_pages_batch, file_path, pages)
+
+        async def render(pages: list[int]) -> list[bytes]:
+            return await get_raster_store().get_many(
+                job_id, pages, render_batch, caller="evaluator")
+        return render
+
+    def _early_stop_check(
+        self,
+        job: PDFJob,
+        weights: dict | None,
+        thresholds: dict,
+        prescan_penalty: float,
+        variance_threshold: float,
+    ):
+        """构造 evaluate_document 的 stop_when 判定。"""
+        def settled(page_scores: list[PageScore]) -> bool:
+            if len(page_scores) < EARLY_STOP_MIN_PAGES:
+                return False
+            c_doc, low, high = self._scorer.c_doc_interval(
+                page_scores, weights, prescan_penalty)
+            route = self._router.settled_route(low, high, thresholds)
+            if route is None:
+                return False
+            if route == "AUTO":
+                # AUTO 可被方差强制降级: 当前样本已触发时继续采样
+                _, forced = self._variance.check(
+                    [ps.overall for ps in page_scores], variance_threshold=variance_threshold)
+                if forced:
+                    return False
+            logger.info("eval_early_stop", job_id=str(job.job_id), route=route,
+                        pages=len(page_scores), c_doc=round(c_doc, 4),
+                        ci=[round(low, 4), round(high, 4)])
+            return True
+        return settled
+
     async def _create_degraded(
         self,
         db: AsyncSession,
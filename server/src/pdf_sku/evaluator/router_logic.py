@@ -59,6 +59,26 @@ class RouteDecider:
             logger.info("route_decided", route="HUMAN_ALL", c_doc=c_doc)
             return "HUMAN_ALL", reason
 
+    @staticmethod
+    def band(c_doc: float, thresholds: ThresholdSet | dict) -> str:
+        """C_doc 所在阈值带 (不含方差强制)。"""
+        if isinstance(thresholds, dict):
+            A = thresholds.get("A", 0.85)
+            B = thresholds.get("B", 0.45)
+        else:
+            A = thresholds.A
+            B = thresholds.B
+        if c_doc >= A:
+            return "AUTO"
+        return "HYBRID" if c_doc >= B else "HUMAN_ALL"
+
+    def settled_route(
+        self, low: float, high: float, thresholds: ThresholdSet | dict,
+    ) -> str | None:
+        """置信区间两端落在同一阈值带时返回该路由, 否则 None。"""
+        route = self.band(low, thresholds)
+        return route if route == self.band(high, thresholds) else None
+
     @staticmethod
     def _build_reason(c_doc: float, A: float, B: float, route: str, extra: str | None = None) -> str:
         parts = [f"C_doc={c_doc:.3f}", f"A={A}", f"B={B}", f"→ {route}"]
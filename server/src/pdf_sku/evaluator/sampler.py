@@ -6,6 +6,7 @@
 - >40 页: 特征加权分层采样 (高/中/低复杂度)
 - 目录页过滤 (TOC_KEYWORDS)
 - 首尾各 2 页必选
+- 序贯采样时按 van der Corput 顺序发送, 任意前缀都覆盖全文档
 """
 from __future__ import annotations
 import random
@@ -123,9 +124,39 @@ class Sampler:
             middle = middle_pool[::step][:remaining]
         return sorted(set(head + middle + tail))
 
+    @staticmethod
+    def sequential_order(pages: list[int]) -> list[int]:
+        """
+        重排采样页, 使任意前缀在文档中均匀分布 (序贯采样提前停止时不偏向开头)。
+
+        第 k 个取 floor(vdc(k) × n) 位置 (vdc 为二进制 van der Corput 序列), 跳过重复。
+        """
+        n = len(pages)
+        order: list[int] = []
+        seen: set[int] = set()
+        k = 0
+        while len(order) < n:
+            idx = int(_radical_inverse(k) * n)
+            if idx not in seen:
+                seen.add(idx)
+                order.append(pages[idx])
+            k += 1
+        return order
+
     @staticmethod
     def _is_toc_page(page_no: int, page_features: dict) -> bool:
         feat = page_features.get(page_no, {})
         text_hint = feat.get("text_hint", "").lower()
         return (feat.get("image_count", 0) == 0 and
                 any(kw in text_hint for kw in TOC_KEYWORDS))
+
+
+def _radical_inverse(k: int) -> float:
+    """二进制 van der Corput: k 的二进制位镜像到小数点后。"""
+    inv, base = 0.0, 0.5
+    while k:
+        if k & 1:
+            inv += base
+        k >>= 1
+        base /= 2
+    return inv
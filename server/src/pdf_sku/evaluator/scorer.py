@@ -9,8 +9,12 @@
 - sku_density: SKU 信息密度
 
 C_doc = Σ(Wi × Di) - prescan_penalty
+
+序贯采样: C_doc 对各维度均值线性, 等于逐页 c_i = Σ(Wi × Di,page) 的均值减惩罚,
+故以逐页 c_i 的标准误给出 C_doc 的正态近似置信区间。
 """
 from __future__ import annotations
+import math
 from dataclasses import dataclass, field
 import structlog
 
@@ -25,6 +29,7 @@ DEFAULT_WEIGHTS = {
 }
 
 DIMENSION_NAMES = list(DEFAULT_WEIGHTS.keys())
+DEFAULT_CI_Z = 1.96  # 95% 置信区间
 
 
 @dataclass
@@ -97,3 +102,34 @@ class Scorer:
                      dimensions={d: round(dimension_scores.get(d, 0), 3)
                                  for d in DIMENSION_NAMES})
         return round(c_doc, 4)
+
+    def c_doc_interval(
+        self,
+        page_scores: list[PageScore],
+        weights: dict[str, float] | None = None,
+        prescan_penalty: float = 0.0,
+        z: float = DEFAULT_CI_Z,
+    ) -> tuple[float, float, float]:
+        """
+        已采样页的 C_doc 估计及置信区间。
+
+        与 aggregate 一致, 无维度评分的页 (解析失败的兜底评分) 不计入样本。
+
+        Returns:
+            (c_doc, low, high), 均 clamp 到 [0.0, 1.0]; 少于 2 页时区间为 [0, 1]
+        """
+        w = weights or DEFAULT_WEIGHTS
+        per_page = [
+            sum(w.get(d, DEFAULT_WEIGHTS[d]) * ps.dimensions.get(d, 0.0) for d in DIMENSION_NAMES)
+            for ps in page_scores if ps.dimensions
+        ]
+        n = len(per_page)
+        if n == 0:
+            return 0.0, 0.0, 1.0
+        mean = sum(per_page) / n - prescan_penalty
+        c_doc = max(0.0, min(1.0, mean))
+        if n < 2:
+            return c_doc, 0.0, 1.0
+        var = sum((c - mean - prescan_penalty) ** 2 for c in per_page) / (n - 1)
+        half = z * math.sqrt(var / n)
+        return c_doc, max(0.0, mean - half), min(1.0, mean + half)
@@ -1,39 +1,203 @@
-"""进程内事件总线。生产中可替换为 Redis Stream / NATS。"""
+"""
+事件总线。默认进程内分发; 挂载持久化后端 (gateway.event_stream.RedisStreamBackend)
+后, DURABLE 事件写入 Redis Stream, 由任意 worker 经消费组消费 (ack / 重试 / 死信),
+其余事件 (SSE 推送类) 仍在进程内分发。
+
+队列模式 (enable_queues): 每个订阅者独立的有界 asyncio.Queue + worker 任务,
+publish 入队即返回, 慢订阅者不拖慢发布方; 同一订阅者内事件保持发布顺序。
+队列满时按 overflow 策略处理: block (发布方等待) | drop_oldest | drop_newest。
+丢弃策略只作用于以 lossy=True 订阅的处理器 (SSE 推送等可丢帧场景); 其余订阅者
+(导入、Pipeline 启动等依赖每条事件的处理器) 恒为 block。
+"""
 from __future__ import annotations
 import asyncio
+import time
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, Coroutine, Protocol
+from prometheus_client import Counter, Gauge, Histogram
 import structlog
 
 logger = structlog.get_logger()
 
 EventHandler = Callable[[dict], Coroutine[Any, Any, None]]
 
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST)
+
+SUBSCRIBER_QUEUE_DEPTH = Gauge(
+    "pdf_event_subscriber_queue_depth", "Events queued for a subscriber", ["subscriber"])
+SUBSCRIBER_DROPPED = Counter(
+    "pdf_event_subscriber_dropped_total", "Events dropped on subscriber queue overflow", ["subscriber"])
+SUBSCRIBER_LAG = Histogram(
+    "pdf_event_subscriber_lag_seconds", "Delay between publish and subscriber pickup", ["subscriber"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30, 120))
+
+
+class EventBackend(Protocol):
+    """持久化事件后端。"""
+    def handles(self, event_type: str) -> bool: ...
+    async def append(self, event_type: str, data: dict) -> None: ...
+
+
+def subscriber_name(event_type: str, handler: EventHandler) -> str:
+    owner = getattr(handler, "__self__", None)
+    qualname = getattr(handler, "__qualname__", repr(handler))
+    if owner is not None and "." not in qualname:
+        qualname = f"{type(owner).__name__}.{qualname}"
+    return f"{event_type}:{getattr(handler, '__module__', '')}.{qualname}"
+
+
+class _SubscriberQueue:
+    """单个订阅者的有界队列 + worker 任务。"""
+
+    def __init__(self, event_type: str, handler: EventHandler, maxsize: int, overflow: str) -> None:
+        self.event_type = event_type
+        self.handler = handler
+        self.name = subscriber_name(event_type, handler)
+        self.overflow = overflow
+        self.queue: asyncio.Queue[tuple[float, dict]] = asyncio.Queue(maxsize=maxsize)
+        self.task: asyncio.Task | None = None
+
+    def ensure_worker(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(), name=f"event-sub:{self.name}")
+
+    async def put(self, data: dict) -> None:
+        self.ensure_worker()
+        item = (time.perf_counter(), data)
+        if self.overflow == OVERFLOW_BLOCK:
+            await self.queue.put(item)
+        else:
+            if self.queue.full():
+                SUBSCRIBER_DROPPED.labels(subscriber=self.name).inc()
+                logger.warning("event_subscriber_overflow", subscriber=self.name,
+                               policy=self.overflow)
+                if self.overflow == OVERFLOW_DROP_NEWEST:
+                    return
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                except asyncio.QueueEmpty:
+                    pass
+            self.queue.put_nowait(item)
+        SUBSCRIBER_QUEUE_DEPTH.labels(subscriber=self.name).set(self.queue.qsize())
+
+    async def _run(self) -> None:
+        while True:
+            enqueued_at, data = await self.queue.get()
+            SUBSCRIBER_LAG.labels(subscriber=self.name).observe(time.perf_counter() - enqueued_at)
+            SUBSCRIBER_QUEUE_DEPTH.labels(subscriber=self.name).set(self.queue.qsize())
+            try:
+                await self.handler(data)
+            except Exception:
+                logger.exception("event_handler_error", event_type=self.event_type,
+                                 subscriber=self.name)
+            finally:
+                self.queue.task_done()
+
+    async def close(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
 
 @dataclass
 class EventBus:
     """简单的进程内发布/订阅总线。"""
     _subscribers: dict[str, list[EventHandler]] = field(default_factory=lambda: defaultdict(list))
+    _backend: EventBackend | None = None
+    _queue_size: int = 0  # 0 = 发布方内联调用订阅者
+    _overflow: str = OVERFLOW_BLOCK  # lossy 订阅者的溢出策略
+    _lossy: set[tuple[str, int]] = field(default_factory=set)
+    _queues: dict[tuple[str, int], _SubscriberQueue] = field(default_factory=dict)
+
+    def use_backend(self, backend: EventBackend | None) -> None:
+        """挂载 / 卸载持久化后端。"""
+        self._backend = backend
+
+    def enable_queues(self, maxsize: int, overflow: str = OVERFLOW_BLOCK) -> None:
+        """开启订阅者队列模式 (maxsize ≤ 0 恢复内联分发); overflow 仅作用于 lossy 订阅者。"""
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self._queue_size = max(0, maxsize)
+        self._overflow = overflow
 
-    def subscribe(self, event_type: str, handler: EventHandler) -> None:
+    def has_subscribers(self, event_type: str) -> bool:
+        return bool(self._subscribers.get(event_type))
+
+    def subscribe(self, event_type: str, handler: EventHandler, lossy: bool = False) -> None:
+        """
+        注册订阅者。
+
+        Args:
+            lossy: 队列满时允许按 overflow 策略丢弃事件; 默认 False 恒为 block
+        """
         self._subscribers[event_type].append(handler)
+        if lossy:
+            self._lossy.add((event_type, id(handler)))
 
     def unsubscribe(self, event_type: str, handler: EventHandler) -> None:
         handlers = self._subscribers.get(event_type, [])
         if handler in handlers:
             handlers.remove(handler)
+        self._lossy.discard((event_type, id(handler)))
+        sq = self._queues.pop((event_type, id(handler)), None)
+        if sq is not None and sq.task is not None:
+            sq.task.cancel()
 
     async def publish(self, event_type: str, data: dict) -> None:
         data["_event_type"] = event_type
         data["_timestamp"] = datetime.now(timezone.utc).isoformat()
-        handlers = self._subscribers.get(event_type, [])
+        if self._backend is not None and self._backend.handles(event_type):
+            await self._backend.append(event_type, data)
+            return
+        if self._queue_size > 0:
+            for h in list(self._subscribers.get(event_type, [])):
+                await self._subscriber_queue(event_type, h).put(data)
+            return
+        await self.dispatch(event_type, data)
+
+    def _subscriber_queue(self, event_type: str, handler: EventHandler) -> _SubscriberQueue:
+        key = (event_type, id(handler))
+        sq = self._queues.get(key)
+        if sq is None or sq.handler is not handler:
+            overflow = self._overflow if key in self._lossy else OVERFLOW_BLOCK
+            sq = _SubscriberQueue(event_type, handler, self._queue_size, overflow)
+            self._queues[key] = sq
+        return sq
+
+    async def dispatch(self, event_type: str, data: dict, strict: bool = False) -> None:
+        """
+        调用本进程订阅者。
+
+        Args:
+            strict: True 时任一订阅者失败即抛出 (持久化后端据此不 ack, 稍后重投)
+        """
+        handlers = list(self._subscribers.get(event_type, []))
+        failed: Exception | None = None
         for h in handlers:
             try:
                 await h(data)
-            except Exception:
+            except Exception as e:
                 logger.exception("event_handler_error", event_type=event_type)
+                failed = failed or e
+        if strict and failed is not None:
+            raise failed
+
+    async def drain(self) -> None:
+        """等待所有订阅者队列处理完毕。"""
+        await asyncio.gather(*(sq.queue.join() for sq in list(self._queues.values())))
+
+    async def aclose(self) -> None:
+        """停止订阅者 worker (未处理事件丢弃)。"""
+        queues, self._queues = list(self._queues.values()), {}
+        for sq in queues:
+            await sq.close()
 
 
 # 全局单例
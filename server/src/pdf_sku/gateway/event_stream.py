@@ -0,0 +1,179 @@
+"""
+Redis Streams 持久化事件后端。
+
+- 每种事件一个 Stream: events:{event_type}, XADD MAXLEN ~ EVENT_STREAM_MAXLEN
+- 全部 worker 加入同一消费组 (EVENT_STREAM_GROUP), 每条消息只由一个 worker 处理,
+  该 worker 依次调用本进程全部订阅者; 全部成功才 XACK
+- 未 ack 消息闲置超过 RETRY_IDLE_MS 后经 XAUTOCLAIM 重投 (含崩溃 worker 遗留),
+  投递次数超过 MAX_DELIVERIES 转入 events:dead 并 ack; XAUTOCLAIM 游标跨批次
+  延续, 每轮至多 RECLAIM_MAX_PAGES 批, 未扫完的下一轮从游标处继续
+- 语义为至少一次, 订阅者需幂等 (导入侧有 import_dedup)
+
+计量: pdf_event_stream_{acked,retried,dead}_total{event_type},
+pdf_event_stream_pending{event_type} (消费组待确认), pdf_event_stream_lag{event_type} (未投递)。
+"""
+from __future__ import annotations
+import asyncio
+import os
+
+import orjson
+from prometheus_client import Counter, Gauge
+from redis.exceptions import ResponseError
+import structlog
+
+from pdf_sku.gateway.event_bus import EventBus
+
+logger = structlog.get_logger()
+
+DURABLE_EVENTS = ("JobCreated", "EvaluationCompleted", "PageCompleted", "TaskCompleted")
+EVENT_STREAM_PREFIX = "events:"
+DEAD_LETTER_STREAM = "events:dead"
+EVENT_STREAM_GROUP = os.environ.get("EVENT_STREAM_GROUP", "pdf-sku")
+EVENT_STREAM_MAXLEN = int(os.environ.get("EVENT_STREAM_MAXLEN", "100000"))
+READ_COUNT = 16
+READ_BLOCK_MS = 5000
+RETRY_IDLE_MS = 60_000
+MAX_DELIVERIES = 5
+RECLAIM_MAX_PAGES = 8  # 每轮维护至多 XAUTOCLAIM 批数
+METRICS_INTERVAL = 15  # 秒
+
+STREAM_ACKED = Counter(
+    "pdf_event_stream_acked_total", "Stream events handled and acked", ["event_type"])
+STREAM_RETRIED = Counter(
+    "pdf_event_stream_retried_total", "Stream events left pending after a handler failure", ["event_type"])
+STREAM_DEAD = Counter(
+    "pdf_event_stream_dead_total", "Stream events moved to the dead-letter stream", ["event_type"])
+STREAM_PENDING = Gauge(
+    "pdf_event_stream_pending", "Delivered but unacked stream events", ["event_type"])
+STREAM_LAG = Gauge(
+    "pdf_event_stream_lag", "Stream events not yet delivered to the consumer group", ["event_type"])
+
+
+def stream_key(event_type: str) -> str:
+    return f"{EVENT_STREAM_PREFIX}{event_type}"
+
+
+class RedisStreamBackend:
+    def __init__(
+        self,
+        redis,
+        consumer: str,
+        events: tuple[str, ...] = DURABLE_EVENTS,
+        group: str = EVENT_STREAM_GROUP,
+    ) -> None:
+        self._redis = redis
+        self._consumer = consumer
+        self._events = frozenset(events)
+        self._group = group
+        self._reclaim_cursor: dict[str, str] = {}  # event_type → XAUTOCLAIM 游标
+
+    def handles(self, event_type: str) -> bool:
+        return event_type in self._events
+
+    async def append(self, event_type: str, data: dict) -> None:
+        await self._redis.xadd(
+            stream_key(event_type),
+            {"data": orjson.dumps(data, default=str).decode()},
+            maxlen=EVENT_STREAM_MAXLEN, approximate=True,
+        )
+
+    async def run(self, bus: EventBus) -> None:
+        """为本进程有订阅者的每种事件启动一个消费循环。在 lifespan 中启动。"""
+        types = [t for t in sorted(self._events) if bus.has_subscribers(t)]
+        for t in types:
+            await self._ensure_group(stream_key(t))
+        logger.info("event_stream_consumer_started",
+                    consumer=self._consumer, events=types)
+        await asyncio.gather(*(self._consume(bus, t) for t in types))
+
+    async def _ensure_group(self, stream: str) -> None:
+        try:
+            await self._redis.xgroup_create(stream, self._group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _consume(self, bus: EventBus, event_type: str) -> None:
+        stream = stream_key(event_type)
+        loop = asyncio.get_running_loop()
+        next_maintenance = 0.0
+        while True:
+            try:
+                if loop.time() >= next_maintenance:
+                    await self._reclaim(bus, event_type)
+                    await self._report_backlog(event_type)
+                    next_maintenance = loop.time() + METRICS_INTERVAL
+                resp = await self._redis.xreadgroup(
+                    self._group, self._consumer, {stream: ">"},
+                    count=READ_COUNT, block=READ_BLOCK_MS,
+                )
+                for _, messages in resp or []:
+                    for msg_id, fields in messages:
+                        await self._handle(bus, event_type, msg_id, fields)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("event_stream_consume_error", event_type=event_type)
+                await asyncio.sleep(1)
+
+    async def _handle(self, bus: EventBus, event_type: str, msg_id: str, fields: dict) -> bool:
+        try:
+            data = orjson.loads(fields["data"])
+            await bus.dispatch(event_type, data, strict=True)
+        except Exception:
+            # 不 ack: 闲置 RETRY_IDLE_MS 后由 _reclaim 重投
+            STREAM_RETRIED.labels(event_type=event_type).inc()
+            return False
+        await self._redis.xack(stream_key(event_type), self._group, msg_id)
+        STREAM_ACKED.labels(event_type=event_type).inc()
+        return True
+
+    async def _reclaim(self, bus: EventBus, event_type: str) -> int:
+        """重投闲置的待确认消息; 超过投递上限的转入死信。"""
+        stream = stream_key(event_type)
+        handled = 0
+        for _ in range(RECLAIM_MAX_PAGES):
+            cursor = self._reclaim_cursor.get(event_type, "0-0")
+            resp = await self._redis.xautoclaim(
+                stream, self._group, self._consumer,
+                min_idle_time=RETRY_IDLE_MS, start_id=cursor, count=READ_COUNT,
+            )
+            next_cursor = resp[0] if resp else "0-0"
+            self._reclaim_cursor[event_type] = next_cursor
+            handled += await self._reclaim_batch(
+                bus, event_type, resp[1] if resp and len(resp) > 1 else [])
+            if next_cursor == "0-0":  # 已扫完整个待确认列表
+                break
+        return handled
+
+    async def _reclaim_batch(self, bus: EventBus, event_type: str, messages: list) -> int:
+        stream = stream_key(event_type)
+        handled = 0
+        for msg_id, fields in messages:
+            if fields is None:  # 已被 XTRIM 截断
+                await self._redis.xack(stream, self._group, msg_id)
+                continue
+            info = await self._redis.xpending_range(
+                stream, self._group, min=msg_id, max=msg_id, count=1)
+            deliveries = info[0]["times_delivered"] if info else 0
+            if deliveries > MAX_DELIVERIES:
+                await self._redis.xadd(DEAD_LETTER_STREAM, {
+                    "event_type": event_type, "id": msg_id,
+                    "data": fields.get("data", ""),
+                }, maxlen=EVENT_STREAM_MAXLEN, approximate=True)
+                await self._redis.xack(stream, self._group, msg_id)
+                STREAM_DEAD.labels(event_type=event_type).inc()
+                logger.error("event_stream_dead_letter",
+                             event_type=event_type, id=msg_id, deliveries=deliveries)
+                continue
+            if await self._handle(bus, event_type, msg_id, fields):
+                handled += 1
+        return handled
+
+    async def _report_backlog(self, event_type: str) -> None:
+        stream = stream_key(event_type)
+        summary = await self._redis.xpending(stream, self._group)
+        STREAM_PENDING.labels(event_type=event_type).set(summary.get("pending", 0) or 0)
+        for g in await self._redis.xinfo_groups(stream):
+            if g.get("name") == self._group and g.get("lag") is not None:
+                STREAM_LAG.labels(event_type=event_type).set(g["lag"])
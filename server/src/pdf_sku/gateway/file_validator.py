@@ -40,14 +40,29 @@ class FileValidator:
             try:
                 with fitz.open(str(file_path)) as doc:
                     page_count = doc.page_count
-                if page_count > self.MAX_PAGES:
-                    errors.append(ValidationError(
-                        "PAGE_COUNT_EXCEEDED", f"{page_count} > {self.MAX_PAGES}"))
-                if page_count == 0:
-                    errors.append(ValidationError("EMPTY_PDF", "No pages"))
+                errors.extend(self.check_page_count(page_count))
             except Exception as e:
                 errors.append(ValidationError("PDF_PARSE_ERROR", str(e)))
 
+        return self.build_result(file_path, errors, page_count, mime)
+
+    @classmethod
+    def check_page_count(cls, page_count: int) -> list[ValidationError]:
+        errors: list[ValidationError] = []
+        if page_count > cls.MAX_PAGES:
+            errors.append(ValidationError(
+                "PAGE_COUNT_EXCEEDED", f"{page_count} > {cls.MAX_PAGES}"))
+        if page_count == 0:
+            errors.append(ValidationError("EMPTY_PDF", "No pages"))
+        return errors
+
+    @staticmethod
+    def build_result(
+        file_path: Path,
+        errors: list[ValidationError],
+        page_count: int | None,
+        mime: str,
+    ) -> ValidationResult:
         file_size_mb = file_path.stat().st_size / (1024 * 1024)
         result = ValidationResult(
             valid=len(errors) == 0,
@@ -0,0 +1,95 @@
+"""
+上传文件 Intake (进程池单次遍历)。对齐: Gateway 详设 §4.1 Step 1-5
+
+一次子进程任务内完成:
+1. 流式计算 sha256 (同一次读取取 magic bytes 判定 MIME); TUS 上传已算好时只读 magic
+2. fitz 单次打开 → 页数校验
+3. 安全检查 (加密 / JavaScript / 对象数)
+4. 规则预筛 (空白页 / OCR 率 / 图片数 / 页面指纹, 单次页面遍历)
+校验或安全检查不通过时提前返回, 不再执行后续步骤。
+"""
+from __future__ import annotations
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from pdf_sku.gateway.file_validator import FileValidator, ValidationError, ValidationResult
+from pdf_sku.gateway.pdf_security import PDFSecurityChecker, SecurityResult
+from pdf_sku.gateway.prescanner import Prescanner, PrescanResult, PrescanRuleConfig
+
+HASH_CHUNK_SIZE = 1024 * 1024
+INTAKE_TIMEOUT = 120  # 秒 (含 1000 页预筛)
+
+
+@dataclass
+class IntakeResult:
+    validation: ValidationResult
+    security: SecurityResult | None = None
+    file_hash: str = ""
+    prescan: PrescanResult | None = None
+
+
+def hash_and_sniff(file_path: Path) -> tuple[str, str]:
+    """单次读取: (sha256, mime)。"""
+    h = hashlib.sha256()
+    header = b""
+    with open(file_path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            if not header:
+                header = chunk[:8]
+            h.update(chunk)
+    mime = "application/pdf" if header[:5] == b"%PDF-" else "application/octet-stream"
+    return h.hexdigest(), mime
+
+
+def sniff_mime(file_path: Path) -> str:
+    with open(file_path, "rb") as f:
+        header = f.read(8)
+    return "application/pdf" if header[:5] == b"%PDF-" else "application/octet-stream"
+
+
+def run_intake(
+    file_path: str,
+    rules: PrescanRuleConfig | None = None,
+    file_hash: str | None = None,
+) -> IntakeResult:
+    """
+    在进程池中执行: 校验 + 安全检查 + hash + 预筛, 文档只打开一次。
+
+    Args:
+        file_hash: 上传阶段已增量计算的 SHA-256; 给定时不再读取整个文件
+    """
+    import fitz
+
+    path = Path(file_path)
+    if file_hash:
+        mime = sniff_mime(path)
+    else:
+        file_hash, mime = hash_and_sniff(path)
+    if mime != "application/pdf":
+        errors = [ValidationError("INVALID_MIME", f"Expected PDF, got {mime}")]
+        return IntakeResult(FileValidator.build_result(path, errors, None, mime),
+                            file_hash=file_hash)
+
+    try:
+        doc = fitz.open(file_path)
+    except Exception as e:
+        errors = [ValidationError("PDF_PARSE_ERROR", str(e))]
+        return IntakeResult(FileValidator.build_result(path, errors, None, mime),
+                            file_hash=file_hash)
+
+    try:
+        page_count = doc.page_count
+        validation = FileValidator.build_result(
+            path, FileValidator.check_page_count(page_count), page_count, mime)
+        if not validation.valid:
+            return IntakeResult(validation, file_hash=file_hash)
+
+        security = PDFSecurityChecker.check_document(doc)
+        if not security.safe:
+            return IntakeResult(validation, security, file_hash)
+
+        prescan = Prescanner().scan_document(doc, rules)
+        return IntakeResult(validation, security, file_hash, prescan)
+    finally:
+        doc.close()
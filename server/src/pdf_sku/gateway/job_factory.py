@@ -1,8 +1,9 @@
 """Job 创建工厂。对齐: Gateway 详设 §4.1 Step 1-8"""
 from __future__ import annotations
-import hashlib
+import asyncio
 import shutil
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from dataclasses import asdict
 from datetime import datetime, timezone
@@ -21,6 +22,7 @@ from pdf_sku.common.models import PDFJob, Page, StateTransition
 from pdf_sku.gateway.file_validator import FileValidator
 from pdf_sku.gateway.pdf_security import PDFSecurityChecker
 from pdf_sku.gateway.prescanner import Prescanner, PrescanRuleConfig
+from pdf_sku.gateway.intake import INTAKE_TIMEOUT, IntakeResult, run_intake
 from pdf_sku.gateway.event_bus import event_bus
 from pdf_sku.settings import settings
 import structlog
@@ -36,10 +38,12 @@ class JobFactory:
         validator: FileValidator,
         security_checker: PDFSecurityChecker,
         prescanner: Prescanner,
+        process_pool: ProcessPoolExecutor | None = None,
     ) -> None:
         self._validator = validator
         self._security = security_checker
         self._prescanner = prescanner
+        self._pool = process_pool
 
     async def create_job(
         self,
@@ -50,14 +54,23 @@ class JobFactory:
         merchant_id: str,
         category: str | None = None,
         uploaded_by: str = "",
+        file_hash: str | None = None,
     ) -> PDFJob:
         """
         创建 Job 主流程 (对齐 Gateway 详设 §4.1 Step 1-8):
         1. 文件校验 → 2. 安全检查 → 3. 冻结配置 → 4. 规则预筛
         5. 组装 Job → 6. 移动文件 → 7. 落库 → 8. 发事件
+
+        Step 1/2/3(hash)/5 由 Intake 在进程池中一次完成 (文档只打开一次)。
+        file_hash 由 TUS 上传阶段增量计算时, 先做去重检查再执行 Intake。
         """
+        if file_hash:
+            await self._check_duplicate(db, file_hash, merchant_id)
+
+        intake = await self._run_intake(upload_file_path, file_hash)
+
         # === Step 1: 文件校验 ===
-        validation = await self._validator.validate(upload_file_path)
+        validation = intake.validation
         if not validation.valid:
             for err in validation.errors:
                 if err.code == "PAGE_COUNT_EXCEEDED":
@@ -65,7 +78,7 @@ class JobFactory:
                 raise FileSizeExceededError(err.message)
 
         # === Step 2: 安全检查 (进程池隔离) ===
-        security = await self._security.check(str(upload_file_path))
+        security = intake.security
         if not security.safe:
             for issue in security.security_issues:
                 if "javascript" in issue:
@@ -75,23 +88,15 @@ class JobFactory:
                 raise FileSizeExceededError(f"Security check failed: {issue}")
 
         # === Step 3: 计算文件 hash + 去重检查 ===
-        file_hash = await self._compute_file_hash(upload_file_path)
-        existing = await db.execute(
-            select(PDFJob).where(
-                PDFJob.file_hash == file_hash,
-                PDFJob.merchant_id == merchant_id,
-                PDFJob.status.notin_(["CANCELLED", "REJECTED"]),
-            ).limit(1)
-        )
-        if existing.scalar_one_or_none():
-            raise FileHashDuplicateError(
-                f"Duplicate file detected for merchant {merchant_id}")
+        if not file_hash:
+            file_hash = intake.file_hash
+            await self._check_duplicate(db, file_hash, merchant_id)
 
         # === Step 4: 冻结配置版本 ===
         config_version = "default"  # 初始默认, 运行时由 ConfigProvider 返回活跃版本
 
         # === Step 5: 规则预筛 ===
-        prescan = await self._prescanner.scan(str(upload_file_path))
+        prescan = intake.prescan
 
         # === Step 6: 组装 Job ===
         job_id = uuid.uuid4()
@@ -149,6 +154,7 @@ class JobFactory:
                     job_id=job_id,
                     page_number=page_no,
                     status=page_status.value,
+                    fingerprint=prescan.page_fingerprints.get(page_no),
                 ))
             # 状态转换记录
             db.add(StateTransition(
@@ -188,12 +194,43 @@ class JobFactory:
         return job
 
     @staticmethod
-    async def _compute_file_hash(file_path: Path) -> str:
-        h = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            while True:
-                chunk = f.read(8192)
-                if not chunk:
-                    break
-                h.update(chunk)
-        return h.hexdigest()
+    async def _check_duplicate(db: AsyncSession, file_hash: str, merchant_id: str) -> None:
+        existing = await db.execute(
+            select(PDFJob).where(
+                PDFJob.file_hash == file_hash,
+                PDFJob.merchant_id == merchant_id,
+                PDFJob.status.notin_(["CANCELLED", "REJECTED"]),
+            ).limit(1)
+        )
+        if existing.scalar_one_or_none():
+            raise FileHashDuplicateError(
+                f"Duplicate file detected for merchant {merchant_id}")
+
+    async def _run_intake(
+        self, upload_file_path: Path, file_hash: str | None = None,
+    ) -> IntakeResult:
+        """进程池执行 Intake; 无进程池时在线程中执行。超时/崩溃按安全检查失败处理。"""
+        loop = asyncio.get_running_loop()
+        try:
+            if self._pool is not None:
+                intake = await asyncio.wait_for(
+                    loop.run_in_executor(
+                        self._pool, run_intake, str(upload_file_path), None, file_hash),
+                    timeout=INTAKE_TIMEOUT)
+            else:
+                intake = await asyncio.wait_for(
+                    asyncio.to_thread(run_intake, str(upload_file_path), None, file_hash),
+                    timeout=INTAKE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.error("intake_timeout", file_path=str(upload_file_path))
+            raise FileSizeExceededError("Security check failed: parse_timeout")
+        except Exception as e:
+            logger.error("intake_error", file_path=str(upload_file_path), error=str(e))
+            raise FileSizeExceededError(f"Security check failed: parse_failed: {e}")
+
+        logger.info("intake_complete",
+                    valid=intake.validation.valid,
+                    pages=intake.validation.page_count,
+                    safe=intake.security.safe if intake.security else None,
+                    issues=(intake.security.security_issues or None) if intake.security else None)
+        return intake
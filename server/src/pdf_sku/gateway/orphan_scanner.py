@@ -7,8 +7,9 @@
 2. 查 DB: status IN (UPLOADED, EVALUATING, PROCESSING) AND worker_id NOT IN alive_set → 孤儿
 3. 标记 ORPHANED + state_transition
 4. 冷却 5min 后自动 requeue (最多 3 次)
-   - UPLOADED 来源的孤儿 → 重新触发评估 (发布 JobCreated 事件)
-   - 其他来源的孤儿 → 恢复到 PROCESSING 继续处理
+   - UPLOADED / EVALUATING 来源的孤儿 → 重新触发评估 (发布 JobCreated 事件)
+   - PROCESSING 来源的孤儿 → 恢复到 PROCESSING, 断点续跑 (仅重跑未完成页)
+   - 事件在重提事务提交后发布
 """
 from __future__ import annotations
 import asyncio
@@ -20,6 +21,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from pdf_sku.common.models import PDFJob, StateTransition
 from pdf_sku.common.enums import JobInternalStatus
 from pdf_sku.gateway.event_bus import event_bus
+from pdf_sku.pipeline.checkpoint import build_resume_plan
 from pdf_sku.settings import settings
 import structlog
 
@@ -125,7 +127,7 @@ class OrphanScanner:
         })
 
     async def _auto_requeue(self, job_id: str, previous_alive: set[str]) -> None:
-        """冷却后自动重提: 分配给新的存活 Worker。"""
+        """冷却后自动重提: 分配给新的存活 Worker。事件在事务提交后发布。"""
         try:
             current_alive = await self._get_alive_workers()
             if not current_alive:
@@ -145,51 +147,55 @@ class OrphanScanner:
                     new_worker = next(iter(current_alive))
                     old_status = job.status
 
-                    # UPLOADED 阶段的孤儿：重新触发评估流程
-                    # 其他阶段：恢复到 PROCESSING 继续处理
+                    # PROCESSING 阶段的孤儿：恢复到 PROCESSING 断点续跑
+                    # 其他阶段 (UPLOADED / EVALUATING)：未完成评估, 重新触发评估流程
                     orphan_origin = await self._get_orphan_origin(db, job_id)
-                    if orphan_origin == JobInternalStatus.UPLOADED.value:
-                        job.status = JobInternalStatus.UPLOADED.value
-                        job.worker_id = new_worker
-                        db.add(StateTransition(
-                            entity_type="job",
-                            entity_id=str(job.job_id),
-                            from_status=old_status,
-                            to_status=JobInternalStatus.UPLOADED.value,
-                            trigger="auto_requeue_eval",
-                        ))
-                        # 更新 Redis 路由
-                        await self._redis.set(
-                            f"job_worker:{job.job_id}", new_worker, ex=86400 * 7
-                        )
-                        # 重新触发评估
-                        await event_bus.publish("JobCreated", {
-                            "job_id": str(job.job_id),
-                            "prescan": job.processing_trace.get("prescan", {}) if job.processing_trace else {},
-                        })
-                        logger.info("orphan_requeued_to_eval",
-                                    job_id=job_id, new_worker=new_worker)
-                    else:
-                        job.status = JobInternalStatus.PROCESSING.value
-                        job.worker_id = new_worker
-                        db.add(StateTransition(
-                            entity_type="job",
-                            entity_id=str(job.job_id),
-                            from_status=old_status,
-                            to_status=JobInternalStatus.PROCESSING.value,
-                            trigger="auto_requeue",
-                        ))
-                        # 更新 Redis 路由
-                        await self._redis.set(
-                            f"job_worker:{job.job_id}", new_worker, ex=86400 * 7
-                        )
-                        await event_bus.publish("JobRequeued", {
+                    resume = orphan_origin == JobInternalStatus.PROCESSING.value
+                    to_status = (JobInternalStatus.PROCESSING.value if resume
+                                 else JobInternalStatus.UPLOADED.value)
+                    job.status = to_status
+                    job.worker_id = new_worker
+                    db.add(StateTransition(
+                        entity_type="job",
+                        entity_id=str(job.job_id),
+                        from_status=old_status,
+                        to_status=to_status,
+                        trigger="auto_requeue" if resume else "auto_requeue_eval",
+                    ))
+                    # 更新 Redis 路由
+                    await self._redis.set(
+                        f"job_worker:{job.job_id}", new_worker, ex=86400 * 7
+                    )
+
+                    if resume:
+                        # 落库的 prescan 仅有 raw_metrics (blank_page_count), 空白页以 Job 为准
+                        blank_pages = list(job.blank_pages or [])
+                        prescan = {**(job.processing_trace or {}).get("prescan", {}),
+                                   "blank_pages": blank_pages}
+                        plan = await build_resume_plan(db, job, blank_pages)
+                        event, payload = "JobRequeued", {
                             "job_id": str(job.job_id),
                             "new_worker": new_worker,
                             "checkpoint_page": job.checkpoint_page,
-                        })
-                        logger.info("orphan_requeued",
-                                    job_id=job_id, new_worker=new_worker)
+                            "route": job.route,
+                            "prescan": prescan,
+                            "resume": True,
+                            **plan.to_dict(),
+                        }
+                    else:
+                        event, payload = "JobCreated", {
+                            "job_id": str(job.job_id),
+                            "prescan": (job.processing_trace or {}).get("prescan", {}),
+                        }
+
+            # 事务已提交: 订阅方看到的状态与事件一致
+            await event_bus.publish(event, payload)
+            if resume:
+                logger.info("orphan_requeued", job_id=job_id, new_worker=new_worker,
+                            **plan.to_dict())
+            else:
+                logger.info("orphan_requeued_to_eval", job_id=job_id,
+                            new_worker=new_worker, origin=orphan_origin)
 
         except Exception:
             logger.exception("auto_requeue_failed", job_id=job_id)
@@ -203,7 +209,7 @@ class OrphanScanner:
                 StateTransition.entity_id == job_id,
                 StateTransition.to_status == JobInternalStatus.ORPHANED.value,
             )
-            .order_by(StateTransition.transitioned_at.desc())
+            .order_by(StateTransition.timestamp.desc(), StateTransition.id.desc())
             .limit(1)
         )
         row = result.scalar_one_or_none()
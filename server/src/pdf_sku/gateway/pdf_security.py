@@ -43,44 +43,48 @@ class PDFSecurityChecker:
         """在子进程中执行，与主进程内存隔离。"""
         import fitz
 
-        issues: list[str] = []
         doc = fitz.open(file_path)
-
         try:
-            # 1. 加密检测
-            if doc.is_encrypted:
-                issues.append("encrypted_pdf")
-
-            # 2. JavaScript 注入 — 文档级（部分 PyMuPDF 版本无 get_js，需兼容）
-            if hasattr(doc, "get_js"):
-                try:
-                    doc_js = doc.get_js()
-                    if doc_js:
-                        issues.append("javascript_embedded")
-                except Exception:
-                    # 安全检查不应因接口缺失直接失败，继续后续检查
-                    pass
-
-            # 3. JavaScript — Widget 注解级 (抽查前50页)
-            if "javascript_embedded" not in issues:
-                for page_no in range(min(doc.page_count, 50)):
-                    page = doc[page_no]
-                    for annot in page.annots() or []:
-                        if annot.type[0] == 20:  # PDF_ANNOT_WIDGET
-                            xref = annot.xref
-                            obj_str = doc.xref_object(xref)
-                            if "/JS" in obj_str or "/JavaScript" in obj_str:
-                                issues.append("javascript_embedded")
-                                break
-                    if "javascript_embedded" in issues:
-                        break
-
-            # 4. 对象数 (PDF炸弹检测)
-            xref_len = doc.xref_length()
-            if xref_len > 500_000:
-                issues.append("object_count_exceeded")
-
+            return PDFSecurityChecker.check_document(doc)
         finally:
             doc.close()
 
+    @staticmethod
+    def check_document(doc) -> SecurityResult:
+        """对已打开的文档执行安全检查 (须在子进程中调用)。"""
+        issues: list[str] = []
+
+        # 1. 加密检测
+        if doc.is_encrypted:
+            issues.append("encrypted_pdf")
+
+        # 2. JavaScript 注入 — 文档级（部分 PyMuPDF 版本无 get_js，需兼容）
+        if hasattr(doc, "get_js"):
+            try:
+                doc_js = doc.get_js()
+                if doc_js:
+                    issues.append("javascript_embedded")
+            except Exception:
+                # 安全检查不应因接口缺失直接失败，继续后续检查
+                pass
+
+        # 3. JavaScript — Widget 注解级 (抽查前50页)
+        if "javascript_embedded" not in issues:
+            for page_no in range(min(doc.page_count, 50)):
+                page = doc[page_no]
+                for annot in page.annots() or []:
+                    if annot.type[0] == 20:  # PDF_ANNOT_WIDGET
+                        xref = annot.xref
+                        obj_str = doc.xref_object(xref)
+                        if "/JS" in obj_str or "/JavaScript" in obj_str:
+                            issues.append("javascript_embedded")
+                            break
+                if "javascript_embedded" in issues:
+                    break
+
+        # 4. 对象数 (PDF炸弹检测)
+        xref_len = doc.xref_length()
+        if xref_len > 500_000:
+            issues.append("object_count_exceeded")
+
         return SecurityResult(safe=len(issues) == 0, security_issues=issues)
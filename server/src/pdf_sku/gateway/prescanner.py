@@ -1,5 +1,7 @@
 """规则预筛。对齐: Gateway 详设 §5.4"""
 from __future__ import annotations
+import asyncio
+import hashlib
 from dataclasses import dataclass, field
 import fitz  # PyMuPDF
 import structlog
@@ -36,26 +38,59 @@ class PrescanResult:
     penalties: list[PrescanPenalty] = field(default_factory=list)
     total_penalty: float = 0.0
     raw_metrics: dict = field(default_factory=dict)
+    page_fingerprints: dict[int, str] = field(default_factory=dict)  # page_no → 指纹
 
 
 class Prescanner:
+    """
+    单次遍历文档完成: 空白页检测 / OCR 率 / 图片数 / 页面内容指纹。
+
+    scan() 在线程中执行; Intake 进程池任务直接调用 scan_document() 复用已打开的文档。
+    """
+
     async def scan(self, file_path: str, rules: PrescanRuleConfig | None = None) -> PrescanResult:
+        return await asyncio.to_thread(self.scan_file, file_path, rules)
+
+    def scan_file(self, file_path: str, rules: PrescanRuleConfig | None = None) -> PrescanResult:
+        with fitz.open(file_path) as doc:
+            return self.scan_document(doc, rules)
+
+    def scan_document(
+        self, doc: fitz.Document, rules: PrescanRuleConfig | None = None,
+    ) -> PrescanResult:
         if rules is None:
             rules = PrescanRuleConfig()
 
-        with fitz.open(file_path) as doc:
-            total = doc.page_count
+        total = doc.page_count
+        blank_pages: list[int] = []
+        text_pages = 0
+        seen_xrefs: set[int] = set()
+        page_fingerprints: dict[int, str] = {}
+
+        for i in range(total):
+            page = doc[i]
+            text = page.get_text("text").strip()
+            images = page.get_images(full=True)
 
             # 1. 空白页检测
-            blank_pages = self._detect_blank_pages(doc, rules.min_text_chars_for_blank)
-            all_blank = len(blank_pages) == total and total > 0
+            if len(text) < rules.min_text_chars_for_blank and not images:
+                blank_pages.append(i + 1)  # 1-indexed
+                continue
 
             # 2. OCR率 (非空白页的文本覆盖度)
-            non_blank_indices = [i for i in range(total) if (i + 1) not in blank_pages]
-            ocr_rate = self._compute_ocr_rate(doc, non_blank_indices) if non_blank_indices else 0.0
+            if len(text) > 20:
+                text_pages += 1
 
-            # 3. 图片数
-            image_count = self._count_images(doc, non_blank_indices) if non_blank_indices else 0
+            # 3. 图片数 (按 xref 去重)
+            seen_xrefs.update(img[0] for img in images)
+
+            # 4. 页面内容指纹 (页级结果缓存键)
+            page_fingerprints[i + 1] = self._page_fingerprint(doc, page, images)
+
+        all_blank = len(blank_pages) == total and total > 0
+        non_blank_count = total - len(blank_pages)
+        ocr_rate = text_pages / non_blank_count if non_blank_count else 0.0
+        image_count = len(seen_xrefs)
 
         blank_rate = len(blank_pages) / total if total > 0 else 1.0
         raw_metrics = {
@@ -66,7 +101,7 @@ class Prescanner:
             "image_count": image_count,
         }
 
-        # 4. 计算扣分
+        # 5. 计算扣分
         penalties = self._apply_penalties(raw_metrics, rules)
         total_penalty = sum(p.weight for p in penalties)
 
@@ -76,6 +111,7 @@ class Prescanner:
             penalties=penalties,
             total_penalty=round(total_penalty, 4),
             raw_metrics=raw_metrics,
+            page_fingerprints=page_fingerprints,
         )
         logger.info("prescan_complete",
                      total_pages=total, blank_count=len(blank_pages),
@@ -83,38 +119,29 @@ class Prescanner:
                      all_blank=all_blank, penalty=round(total_penalty, 3))
         return result
 
-    def _detect_blank_pages(self, doc: fitz.Document, min_chars: int) -> list[int]:
-        blank = []
-        for i in range(doc.page_count):
-            page = doc[i]
-            text = page.get_text("text").strip()
-            images = page.get_images()
-            if len(text) < min_chars and len(images) == 0:
-                blank.append(i + 1)  # 1-indexed
-        return blank
-
-    def _compute_ocr_rate(self, doc: fitz.Document, page_indices: list[int]) -> float:
-        if not page_indices:
-            return 0.0
-        has_text_count = 0
-        for i in page_indices:
-            page = doc[i]
-            text = page.get_text("text").strip()
-            if len(text) > 20:
-                has_text_count += 1
-        return has_text_count / len(page_indices)
-
-    def _count_images(self, doc: fitz.Document, page_indices: list[int]) -> int:
-        total_images = 0
-        seen_xrefs: set[int] = set()
-        for i in page_indices:
-            page = doc[i]
-            for img in page.get_images():
-                xref = img[0]
-                if xref not in seen_xrefs:
-                    seen_xrefs.add(xref)
-                    total_images += 1
-        return total_images
+    @staticmethod
+    def _page_fingerprint(
+        doc: fitz.Document, page: fitz.Page, images: list | None = None,
+    ) -> str:
+        """页面指纹: 页面尺寸 + 内容流 + 引用图片/表单 XObject 原始流摘要。"""
+        h = hashlib.sha256()
+        rect = page.rect
+        h.update(f"{rect.width:.1f}x{rect.height:.1f}".encode())
+        try:
+            h.update(page.read_contents())
+        except Exception:
+            pass
+        if images is None:
+            images = page.get_images(full=True)
+        xrefs = [img[0] for img in images]
+        xrefs += [xo[0] for xo in page.get_xobjects()]
+        for xref in xrefs:
+            try:
+                raw = doc.xref_stream_raw(xref) or b""
+            except Exception:
+                raw = b""
+            h.update(hashlib.sha256(raw).digest())
+        return h.hexdigest()[:32]
 
     def _apply_penalties(self, metrics: dict, rules: PrescanRuleConfig) -> list[PrescanPenalty]:
         penalties = []
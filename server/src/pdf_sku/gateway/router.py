@@ -9,6 +9,7 @@ Gateway API 路由。对齐: OpenAPI V2.0 §/jobs + §/uploads + §/dashboard
 - Dashboard: GET /dashboard/metrics
 """
 from __future__ import annotations
+import asyncio
 import uuid
 import shutil
 from pathlib import Path
@@ -41,6 +42,9 @@ from pdf_sku.common.schemas import PaginationMeta, ErrorResponse
 from pdf_sku.auth.dependencies import CurrentUser, UploaderUser, AnyUser, AdminUser
 from pdf_sku.settings import settings
 from pdf_sku.gateway.event_bus import event_bus
+from pdf_sku.common.config_snapshot import config_snapshot
+from pdf_sku.pipeline.scheduler import PRIORITY_REPROCESS
+from pdf_sku.pipeline.raster_store import get_raster_store, render_page_png
 import structlog
 
 logger = structlog.get_logger()
@@ -125,11 +129,10 @@ async def tus_patch(
     upload_checksum: str | None = Header(None, alias="Upload-Checksum"),
     content_type: str = Header("application/offset+octet-stream", alias="Content-Type"),
 ):
-    """TUS PATCH — 写入分片"""
-    chunk = await request.body()
+    """TUS PATCH — 写入分片 (请求体流式落盘, 不整体读入内存)"""
     handler = get_tus_handler()
     new_offset, is_complete = await handler.handle_patch(
-        upload_id, upload_offset, chunk, upload_checksum
+        upload_id, upload_offset, request.stream(), upload_checksum
     )
     headers = {
         "Upload-Offset": str(new_offset),
@@ -189,6 +192,7 @@ async def create_job(
         merchant_id=merchant_id,
         category=category,
         uploaded_by=f"{user.username} ({str(user.user_id)[:8]})",
+        file_hash=meta.get("file_hash") or None,
     )
     # 注意: job_factory.create_job 内部已 commit，此处无需再次 commit
 
@@ -384,6 +388,7 @@ async def reprocess_job_ai(job_id: uuid.UUID, db: DBSession):
         "route": "AI_ONLY",
         "degrade_reason": None,
         "prescan": {"blank_pages": []},
+        "priority": PRIORITY_REPROCESS,
     }
     await event_bus.publish("EvaluationCompleted", eval_data)
 
@@ -431,15 +436,9 @@ async def reprocess_single_page(
     )
     await db.commit()
 
-    # 直接调用 orchestrator 单页处理
+    # 直接调用 orchestrator 单页处理 (全局调度器最高优先级)
     orchestrator = request.app.state.orchestrator
-    file_path = orchestrator._resolve_file_path(job)
-
-    async with orchestrator._db_factory() as page_db:
-        result = await orchestrator._process_single_page(
-            page_db, job, page_number, file_path)
-        await orchestrator._on_page_done(page_db, job, page_number, result)
-        await page_db.commit()
+    result = await orchestrator.reprocess_page(job, page_number)
 
     return {
         "job_id": str(job_id),
@@ -499,10 +498,11 @@ async def get_page_screenshot(
         })
 
     job_dir = Path(settings.job_data_dir) / str(job_id)
-    cache_path = job_dir / "screenshots" / f"page-{page_number}.png"
+    store = get_raster_store()
 
-    # 优先返回已缓存的截图
-    if cache_path.exists():
+    # 优先返回已落盘的截图 (评估 / Pipeline 渲染时写入)
+    cache_path = store.cached_path(str(job_id), page_number, caller="api")
+    if cache_path is not None:
         return FileResponse(str(cache_path), media_type="image/png")
 
     # 显式指定的截图路径
@@ -521,21 +521,15 @@ async def get_page_screenshot(
         })
 
     try:
-        import fitz
-
-        doc = fitz.open(source_pdf)
-        try:
-            if page_number < 1 or page_number > doc.page_count:
-                return JSONResponse(status_code=404, content={
-                    "error_code": "PAGE_OUT_OF_RANGE",
-                    "message": f"Page {page_number} is out of range",
-                })
-
-            zoom = 150 / 72
-            pix = doc[page_number - 1].get_pixmap(matrix=fitz.Matrix(zoom, zoom))
-            png_bytes = pix.tobytes("png")
-        finally:
-            doc.close()
+        png_bytes = await store.get(
+            str(job_id), page_number,
+            lambda: asyncio.to_thread(render_page_png, str(source_pdf), page_number),
+            caller="api")
+    except IndexError:
+        return JSONResponse(status_code=404, content={
+            "error_code": "PAGE_OUT_OF_RANGE",
+            "message": f"Page {page_number} is out of range",
+        })
     except Exception as e:
         logger.exception(
             "screenshot_render_failed",
@@ -548,17 +542,6 @@ async def get_page_screenshot(
             "message": "Failed to render page screenshot",
         })
 
-    try:
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-        cache_path.write_bytes(png_bytes)
-    except Exception as e:
-        logger.warning(
-            "screenshot_cache_failed",
-            job_id=str(job_id),
-            page_number=page_number,
-            error=str(e),
-        )
-
     return Response(content=png_bytes, media_type="image/png")
 
 
@@ -1028,8 +1011,12 @@ async def get_evaluation(job_id: uuid.UUID, db: DBSession):
 # ───────────────────────── SSE ─────────────────────────
 
 @router.get("/jobs/{job_id}/events")
-async def sse_stream(job_id: uuid.UUID, db: DBSession):
-    """SSE 事件流。对齐: Gateway 详设 §4.3"""
+async def sse_stream(
+    job_id: uuid.UUID,
+    db: DBSession,
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+):
+    """SSE 事件流。对齐: Gateway 详设 §4.3 (Last-Event-ID 断线续传)"""
     # 验证 Job 存在
     result = await db.execute(select(PDFJob.job_id).where(PDFJob.job_id == job_id))
     if not result.scalar_one_or_none():
@@ -1037,7 +1024,7 @@ async def sse_stream(job_id: uuid.UUID, db: DBSession):
 
     mgr = get_sse_manager()
     return EventSourceResponse(
-        mgr.subscribe_job(str(job_id)),
+        mgr.subscribe_job(str(job_id), last_event_id=last_event_id),
         headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
@@ -1128,40 +1115,32 @@ async def ocr_region(
             "message": "LLM service is not initialized",
         })
 
-    # Get page screenshot PNG bytes
+    # Get page screenshot PNG bytes (与截图 API 共用 RasterStore)
     job_dir = Path(settings.job_data_dir) / str(job_id)
-    cache_path = job_dir / "screenshots" / f"page-{page_number}.png"
-    png_bytes: bytes | None = None
-
-    if cache_path.exists():
-        png_bytes = cache_path.read_bytes()
-    else:
-        source_pdf = job_dir / "source.pdf"
-        if not source_pdf.exists():
-            return JSONResponse(status_code=404, content={
-                "error_code": "SOURCE_PDF_MISSING",
-                "message": f"Source PDF not found for job {job_id}",
-            })
-        try:
-            import fitz
-            doc = fitz.open(source_pdf)
-            try:
-                if page_number < 1 or page_number > doc.page_count:
-                    return JSONResponse(status_code=404, content={
-                        "error_code": "PAGE_OUT_OF_RANGE",
-                        "message": f"Page {page_number} is out of range",
-                    })
-                zoom = 150 / 72
-                pix = doc[page_number - 1].get_pixmap(matrix=fitz.Matrix(zoom, zoom))
-                png_bytes = pix.tobytes("png")
-            finally:
-                doc.close()
-        except Exception as e:
-            logger.exception("ocr_screenshot_failed", error=str(e))
-            return JSONResponse(status_code=500, content={
-                "error_code": "RENDER_FAILED",
-                "message": "Failed to render page for OCR",
-            })
+    source_pdf = job_dir / "source.pdf"
+    store = get_raster_store()
+    if store.cached_path(str(job_id), page_number, caller="ocr") is None \
+            and not source_pdf.exists():
+        return JSONResponse(status_code=404, content={
+            "error_code": "SOURCE_PDF_MISSING",
+            "message": f"Source PDF not found for job {job_id}",
+        })
+    try:
+        png_bytes = await store.get(
+            str(job_id), page_number,
+            lambda: asyncio.to_thread(render_page_png, str(source_pdf), page_number),
+            caller="ocr")
+    except IndexError:
+        return JSONResponse(status_code=404, content={
+            "error_code": "PAGE_OUT_OF_RANGE",
+            "message": f"Page {page_number} is out of range",
+        })
+    except Exception as e:
+        logger.exception("ocr_screenshot_failed", error=str(e))
+        return JSONResponse(status_code=500, content={
+            "error_code": "RENDER_FAILED",
+            "message": "Failed to render page for OCR",
+        })
 
     # Crop bbox region using Pillow
     try:
@@ -1357,6 +1336,7 @@ async def set_pipeline_concurrency(request: Request, _admin: AdminUser):
     # Sort by min_pages ascending for consistency
     rules = sorted(rules, key=lambda r: r["min_pages"])
     await redis.set(CONCURRENCY_RULES_KEY, json_mod.dumps(rules))
+    await config_snapshot.publish_change(redis, CONCURRENCY_RULES_KEY)
     logger.info("pipeline_concurrency_rules_updated", rules=rules)
     return {"rules": rules}
 
@@ -1366,6 +1346,7 @@ async def set_pipeline_concurrency(request: Request, _admin: AdminUser):
 from pdf_sku.llm_adapter.provider_config import (
     LLMProviderConfig,
     DEFAULT_PROVIDER_CONFIGS,
+    IMAGE_FORMATS,
     get_provider_config,
     set_provider_config,
     list_provider_configs,
@@ -1411,6 +1392,9 @@ async def update_llm_provider_config(
         timeout_seconds=body.get("timeout_seconds", current.timeout_seconds),
         vlm_timeout_seconds=body.get("vlm_timeout_seconds", current.vlm_timeout_seconds),
         max_retries=body.get("max_retries", current.max_retries),
+        image_max_edge=body.get("image_max_edge", current.image_max_edge),
+        image_format=body.get("image_format", current.image_format),
+        image_quality=body.get("image_quality", current.image_quality),
     )
 
     # Basic validation
@@ -1425,11 +1409,24 @@ async def update_llm_provider_config(
             "message": "max_retries must be between 0 and 10",
         })
 
+    if updated.image_format not in IMAGE_FORMATS:
+        return JSONResponse(status_code=400, content={
+            "error_code": "INVALID_VALUE",
+            "message": f"image_format must be one of {list(IMAGE_FORMATS)}",
+        })
+    if updated.image_max_edge < 0 or not 1 <= updated.image_quality <= 100:
+        return JSONResponse(status_code=400, content={
+            "error_code": "INVALID_VALUE",
+            "message": "image_max_edge must be >= 0 and image_quality between 1 and 100",
+        })
+
     await set_provider_config(redis, provider, updated)
     logger.info("llm_provider_config_updated", provider=provider,
                 timeout=updated.timeout_seconds,
                 vlm_timeout=updated.vlm_timeout_seconds,
-                max_retries=updated.max_retries)
+                max_retries=updated.max_retries,
+                image_max_edge=updated.image_max_edge,
+                image_format=updated.image_format)
 
     return {"provider": provider, "config": _asdict(updated)}
 
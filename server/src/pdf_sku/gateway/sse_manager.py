@@ -3,19 +3,28 @@ SSE 推送引擎。对齐: Gateway 详设 §4.3 + Data Dictionary §4.2
 
 核心设计:
 - 每个 Job 级别的 SSE 连接维护独立 asyncio.Queue (maxsize=100)
-- EventBus 订阅 → queue.put → SSE 输出
+- EventBus 订阅 → 帧 → 各 worker 的连接队列 → SSE 输出
+- 多 worker: 帧经 Redis pub/sub (频道 sse:job:{job_id}) 广播, 任意 worker 上的
+  连接都能收到其他 worker 上运行的 Job 的进度; 无 Redis 时仅本进程分发
+- 页面事件合并: PageStatusChanged 按 Job 缓冲, 每 SSE_COALESCE_INTERVAL 合并为一帧
+  pages_batch_update (同页只保留最新状态); 其他事件到达前先冲刷该 Job 的缓冲, 保序
+- 断线续传: 每帧带 id, 写入每 Job 的短环形缓冲 (Redis Stream MAXLEN / 本地 deque),
+  客户端携带 Last-Event-ID 重连时补发其后的帧
 - 心跳 30s / 背压溢出丢弃最旧事件
 - Job 终态自动关闭流
 """
 from __future__ import annotations
 import asyncio
-import time
-from collections import defaultdict
+import itertools
+import os
+import re
+from collections import defaultdict, deque
 from typing import AsyncGenerator
 from datetime import datetime, timezone
 
+import orjson
 from sse_starlette.sse import ServerSentEvent
-from pdf_sku.gateway.event_bus import event_bus
+from pdf_sku.gateway.event_bus import EventBus, event_bus
 from pdf_sku.common.enums import SSEEventType, JobInternalStatus
 import structlog
 
@@ -31,31 +40,122 @@ TERMINAL_STATUSES = {
 
 HEARTBEAT_INTERVAL = 30  # 秒
 QUEUE_MAX_SIZE = 100
+SSE_COALESCE_INTERVAL = float(os.environ.get("SSE_COALESCE_INTERVAL", "1.0"))  # 秒
+SSE_RING_SIZE = 200  # 每 Job 可续传的帧数
+SSE_RING_TTL = 3600  # 秒
+SSE_CHANNEL_PREFIX = "sse:job:"
+SSE_RING_PREFIX = "sse:ring:"
+_STREAM_ID_RE = re.compile(r"\d+-\d+")  # Redis Stream 条目 ID: <ms>-<seq>
+
+PAGE_EVENT = "PageStatusChanged"
+EVENT_TYPE_MAP = {
+    "PageStatusChanged": SSEEventType.PAGE_COMPLETED,
+    "JobStatusChanged": SSEEventType.JOB_COMPLETED,
+    "JobFailed": SSEEventType.JOB_FAILED,
+    "HumanNeeded": SSEEventType.HUMAN_NEEDED,
+    "SLAEscalated": SSEEventType.SLA_ESCALATED,
+}
 
 
 class SSEManager:
     """管理所有活跃 SSE 连接。"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        redis=None,
+        bus: EventBus | None = None,
+        coalesce_interval: float = SSE_COALESCE_INTERVAL,
+    ) -> None:
+        self._redis = redis
+        self._bus = bus or event_bus
+        self._coalesce_interval = coalesce_interval
         # job_id → list[asyncio.Queue]
         self._connections: dict[str, list[asyncio.Queue]] = defaultdict(list)
+        # 页面事件合并缓冲: job_id → {page_no: page 数据}
+        self._page_buf: dict[str, dict[int, dict]] = {}
+        self._flusher: asyncio.Task | None = None
+        # 无 Redis 时的本地环形缓冲与帧序号
+        self._rings: dict[str, deque] = {}
+        self._seq = itertools.count(1)
         self._setup_subscriptions()
 
     def _setup_subscriptions(self) -> None:
         """订阅 EventBus 事件 → 分发到对应 Job 的 SSE 队列。"""
-        for evt in [
-            "PageStatusChanged", "JobStatusChanged", "JobFailed",
-            "HumanNeeded", "SLAEscalated",
-        ]:
-            event_bus.subscribe(evt, self._dispatch_event)
+        for evt in EVENT_TYPE_MAP:
+            # 仅用于实时推送, 允许队列溢出时丢弃
+            self._bus.subscribe(evt, self._dispatch_event, lossy=True)
 
     async def _dispatch_event(self, data: dict) -> None:
-        """将事件路由到对应 job 的所有 SSE 连接队列。"""
+        """EventBus 事件 → SSE 帧 (页面事件进入合并缓冲)。"""
         job_id = data.get("job_id", "")
         if not job_id:
             return
-        queues = self._connections.get(job_id, [])
-        for q in queues:
+        if data.get("_event_type") == PAGE_EVENT:
+            page = {k: v for k, v in data.items() if not k.startswith("_")}
+            self._page_buf.setdefault(job_id, {})[page.get("page_no", 0)] = page
+            self._ensure_flusher()
+            return
+
+        await self._flush_job(job_id)
+        await self._emit(job_id, self._map_event_type(data), data)
+        status = data.get("status", "")
+        if status in TERMINAL_STATUSES:
+            await self._emit(
+                job_id,
+                SSEEventType.JOB_COMPLETED if status == JobInternalStatus.FULL_IMPORTED.value
+                else SSEEventType.JOB_FAILED,
+                data, close=True,
+            )
+
+    # ─── 合并 ───
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while self._page_buf:
+            await asyncio.sleep(self._coalesce_interval)
+            for job_id in list(self._page_buf):
+                try:
+                    await self._flush_job(job_id)
+                except Exception:
+                    logger.exception("sse_flush_error", job_id=job_id)
+
+    async def _flush_job(self, job_id: str) -> None:
+        pages = self._page_buf.pop(job_id, None)
+        if not pages:
+            return
+        ordered = [pages[p] for p in sorted(pages)]
+        await self._emit(job_id, SSEEventType.PAGES_BATCH_UPDATE, {
+            "job_id": job_id,
+            "count": len(ordered),
+            "pages": ordered,
+        })
+
+    # ─── 帧发布 / 分发 ───
+
+    async def _emit(self, job_id: str, event: str, data: dict, close: bool = False) -> None:
+        """生成帧 → 写入环形缓冲 → 广播 (Redis) 或本地分发。"""
+        clean = {k: v for k, v in data.items() if not k.startswith("_")}
+        frame = {"event": str(event), "data": orjson.dumps(clean, default=str).decode()}
+        if close:
+            frame["close"] = "1"
+
+        if self._redis is None:
+            frame["id"] = str(next(self._seq))
+            self._rings.setdefault(job_id, deque(maxlen=SSE_RING_SIZE)).append(frame)
+            self._deliver(job_id, frame)
+            return
+
+        ring = f"{SSE_RING_PREFIX}{job_id}"
+        frame["id"] = await self._redis.xadd(ring, dict(frame), maxlen=SSE_RING_SIZE, approximate=False)
+        await self._redis.expire(ring, SSE_RING_TTL)
+        await self._redis.publish(f"{SSE_CHANNEL_PREFIX}{job_id}", orjson.dumps(frame).decode())
+
+    def _deliver(self, job_id: str, frame: dict) -> None:
+        """将帧放入本进程该 job 的所有 SSE 连接队列。"""
+        for q in self._connections.get(job_id, []):
             if q.full():
                 # 背压: 丢弃最旧事件
                 try:
@@ -64,43 +164,87 @@ class SSEManager:
                     pass
                 logger.warning("sse_queue_overflow", job_id=job_id)
             try:
-                q.put_nowait(data)
+                q.put_nowait(frame)
             except asyncio.QueueFull:
                 pass
 
-    async def subscribe_job(self, job_id: str) -> AsyncGenerator[ServerSentEvent, None]:
+    async def run(self) -> None:
+        """订阅 Redis 广播频道, 转发到本进程连接。在 lifespan 中启动。"""
+        if self._redis is None:
+            return
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.psubscribe(f"{SSE_CHANNEL_PREFIX}*")
+                async for msg in pubsub.listen():
+                    if msg.get("type") != "pmessage":
+                        continue
+                    job_id = msg["channel"][len(SSE_CHANNEL_PREFIX):]
+                    if job_id in self._connections:
+                        self._deliver(job_id, orjson.loads(msg["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("sse_pubsub_error")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def _replay(self, job_id: str, last_event_id: str) -> list[dict]:
+        """环形缓冲中 Last-Event-ID 之后的帧。"""
+        if self._redis is None:
+            ring = self._rings.get(job_id, ())
+            try:
+                last = int(last_event_id)
+            except ValueError:
+                return []
+            return [f for f in ring if int(f["id"]) > last]
+        if not _STREAM_ID_RE.fullmatch(last_event_id):
+            # 非法 Last-Event-ID (客户端伪造 / 跨后端切换): 跳过补发, 仅推送新帧
+            logger.warning("sse_bad_last_event_id", job_id=job_id, last_event_id=last_event_id[:64])
+            return []
+        entries = await self._redis.xrange(
+            f"{SSE_RING_PREFIX}{job_id}", min=f"({last_event_id}", max="+")
+        return [{**fields, "id": entry_id} for entry_id, fields in entries]
+
+    # ─── 连接 ───
+
+    async def subscribe_job(
+        self, job_id: str, last_event_id: str | None = None,
+    ) -> AsyncGenerator[ServerSentEvent, None]:
         """
         生成 SSE 事件流。调用方通过 async for 消费。
         产出 ServerSentEvent 对象，由 EventSourceResponse 正确序列化。
         """
-        import orjson
-
         queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_MAX_SIZE)
         self._connections[job_id].append(queue)
         logger.info("sse_connected", job_id=job_id,
-                     total_conns=len(self._connections[job_id]))
+                     total_conns=len(self._connections[job_id]),
+                     resume_from=last_event_id)
 
         try:
             # 初始心跳
             yield self._make_sse(SSEEventType.HEARTBEAT, {"ts": _now_iso()})
 
+            sent_id = None
+            if last_event_id:
+                for frame in await self._replay(job_id, last_event_id):
+                    yield self._frame_sse(frame)
+                    sent_id = frame["id"]
+                    if frame.get("close"):
+                        return
+
             while True:
                 try:
                     # 等待事件，超时则发心跳
-                    data = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_INTERVAL)
-
-                    # 映射事件类型
-                    sse_event = self._map_event_type(data)
-                    yield self._make_sse(sse_event, data)
-
-                    # 检查终态
-                    status = data.get("status", "")
-                    if status in TERMINAL_STATUSES:
-                        yield self._make_sse(
-                            SSEEventType.JOB_COMPLETED if status == JobInternalStatus.FULL_IMPORTED.value
-                            else SSEEventType.JOB_FAILED,
-                            data,
-                        )
+                    frame = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_INTERVAL)
+                    if sent_id is not None and not _after(frame["id"], sent_id):
+                        continue  # 已在补发中送出
+                    yield self._frame_sse(frame)
+                    if frame.get("close"):
                         break
 
                 except asyncio.TimeoutError:
@@ -117,19 +261,14 @@ class SSEManager:
 
     def _map_event_type(self, data: dict) -> str:
         """将 EventBus 事件名映射到 SSE event type。"""
-        evt = data.get("_event_type", "")
-        mapping = {
-            "PageStatusChanged": SSEEventType.PAGE_COMPLETED,
-            "JobStatusChanged": SSEEventType.JOB_COMPLETED,
-            "JobFailed": SSEEventType.JOB_FAILED,
-            "HumanNeeded": SSEEventType.HUMAN_NEEDED,
-            "SLAEscalated": SSEEventType.SLA_ESCALATED,
-        }
-        return mapping.get(evt, SSEEventType.HEARTBEAT)
+        return EVENT_TYPE_MAP.get(data.get("_event_type", ""), SSEEventType.HEARTBEAT)
+
+    @staticmethod
+    def _frame_sse(frame: dict) -> ServerSentEvent:
+        return ServerSentEvent(data=frame["data"], event=frame["event"], id=frame["id"])
 
     @staticmethod
     def _make_sse(event_type: str, data: dict) -> ServerSentEvent:
-        import orjson
         # 剔除内部字段
         clean = {k: v for k, v in data.items() if not k.startswith("_")}
         json_str = orjson.dumps(clean).decode()
@@ -140,5 +279,12 @@ class SSEManager:
         return sum(len(qs) for qs in self._connections.values())
 
 
+def _after(frame_id: str, ref_id: str) -> bool:
+    """帧 id 比较: 本地为整数序号, Redis 为 "<ms>-<seq>"。"""
+    a = tuple(int(x) for x in frame_id.split("-"))
+    b = tuple(int(x) for x in ref_id.split("-"))
+    return a > b
+
+
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
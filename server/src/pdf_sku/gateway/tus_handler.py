@@ -2,7 +2,8 @@
 from __future__ import annotations
 import base64
 import hashlib
-from pdf_sku.gateway.tus_store import TusStore
+from typing import AsyncIterable, AsyncIterator
+from pdf_sku.gateway.tus_store import TusStore, _single
 from pdf_sku.common.exceptions import PDFSKUError
 import structlog
 
@@ -10,15 +11,26 @@ logger = structlog.get_logger()
 
 
 class UploadTooLargeError(PDFSKUError):
-    code = "UPLOAD_TOO_LARGE"; http_status = 413
+    code = "UPLOAD_TOO_LARGE"
+    http_status = 413
 
 
 class OffsetMismatchError(PDFSKUError):
-    code = "OFFSET_MISMATCH"; http_status = 409
+    code = "OFFSET_MISMATCH"
+    http_status = 409
 
 
 class ChecksumFailedError(PDFSKUError):
-    code = "CHECKSUM_FAILED"; http_status = 460
+    code = "CHECKSUM_FAILED"
+    http_status = 460
+
+
+class InvalidUploadTypeError(PDFSKUError):
+    code = "INVALID_MIME"
+    http_status = 415
+
+
+PDF_MAGIC = b"%PDF-"
 
 
 class TusHandler:
@@ -42,34 +54,80 @@ class TusHandler:
         return meta["offset"], meta["upload_length"]
 
     async def handle_patch(
-        self, upload_id: str, offset: int, chunk: bytes,
+        self, upload_id: str, offset: int, chunk: bytes | AsyncIterable[bytes],
         checksum: str | None = None,
     ) -> tuple[int, bool]:
-        current_offset = await self._store.get_offset(upload_id)
+        """
+        写入一个 PATCH 分片。chunk 可为完整 bytes 或 ASGI 请求体流
+        (request.stream()), 后者边收边写, 不在内存中缓冲整个分片。
+        """
+        meta = await self._store.get_metadata(upload_id)
+        current_offset = meta["offset"]
         if offset != current_offset:
             raise OffsetMismatchError(
                 f"Offset mismatch: expected {current_offset}, got {offset}"
             )
-        if checksum:
-            self._verify_checksum(chunk, checksum)
-        new_offset = await self._store.append(upload_id, offset, chunk)
-        meta = await self._store.get_metadata(upload_id)
+        sha1, expected = self._checksum_hasher(checksum) if checksum else (None, "")
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = _single(bytes(chunk))
+        body = self._guarded(chunk, offset, meta["upload_length"] - offset, sha1)
+        try:
+            new_offset = await self._store.append_stream(
+                upload_id, offset, body, keep_partial=sha1 is None)
+        except InvalidUploadTypeError:
+            # 首个分片即可判定非 PDF: 立即终止上传, 不再接收后续分片
+            await self._store.delete(upload_id)
+            raise
+        except UploadTooLargeError:
+            # 超长分片整体作废: 回退到原 offset, 上传不会停在 offset == length 却未完成
+            await self._store.rollback(upload_id, offset)
+            raise
+        if sha1 is not None and base64.b64encode(sha1.digest()).decode() != expected:
+            # 分片已落盘但校验失败: 回退 offset, 客户端从原位置重传
+            await self._store.rollback(upload_id, offset)
+            raise ChecksumFailedError("Checksum mismatch")
+
         is_complete = new_offset >= meta["upload_length"]
         if is_complete:
-            await self._store.mark_complete(upload_id)
+            file_hash = await self._store.mark_complete(upload_id)
             logger.info("tus_upload_complete", upload_id=upload_id,
-                        size=new_offset, filename=meta["filename"])
+                        size=new_offset, filename=meta["filename"],
+                        file_hash=file_hash[:16])
         return new_offset, is_complete
 
+    async def _guarded(
+        self, chunks: AsyncIterable[bytes], offset: int, remaining: int, sha1,
+    ) -> AsyncIterator[bytes]:
+        """流经时校验: 首部 magic (offset=0)、不超出 upload_length、分片 sha1。"""
+        head = b"" if offset == 0 else None
+        received = 0
+        async for piece in chunks:
+            received += len(piece)
+            if received > remaining:
+                raise UploadTooLargeError(
+                    f"Chunk exceeds declared upload length by {received - remaining} bytes")
+            if head is not None:
+                head += piece[:len(PDF_MAGIC) - len(head)]
+                if not self._has_pdf_magic(head):
+                    raise InvalidUploadTypeError("Upload is not a PDF file")
+                if len(head) >= len(PDF_MAGIC):
+                    head = None
+            if sha1 is not None:
+                sha1.update(piece)
+            yield piece
+
     async def handle_delete(self, upload_id: str) -> None:
         await self._store.delete(upload_id)
 
     @staticmethod
-    def _verify_checksum(chunk: bytes, checksum_header: str) -> None:
+    def _has_pdf_magic(first_chunk: bytes) -> bool:
+        head = first_chunk[:len(PDF_MAGIC)]
+        return PDF_MAGIC.startswith(head) if len(head) < len(PDF_MAGIC) else head == PDF_MAGIC
+
+    @staticmethod
+    def _checksum_hasher(checksum_header: str) -> tuple["hashlib._Hash", str]:
+        """Upload-Checksum → (增量 sha1, 期望的 base64 摘要)。"""
         parts = checksum_header.split(" ", 1)
         if len(parts) != 2 or parts[0] != "sha1":
             raise ChecksumFailedError(f"Unsupported checksum algorithm: {parts[0] if parts else 'none'}")
-        expected = parts[1]
-        actual = base64.b64encode(hashlib.sha1(chunk).digest()).decode()
-        if actual != expected:
-            raise ChecksumFailedError("Checksum mismatch")
+        return hashlib.sha1(), parts[1]
@@ -1,22 +1,50 @@
-"""TUS 存储后端: Redis 元数据 + 磁盘文件。对齐: Gateway 详设 §5.1"""
+"""
+TUS 存储后端: Redis 元数据 + 磁盘文件。对齐: Gateway 详设 §5.1
+
+上传过程中增量计算 SHA-256: 进程内保留 hasher, Redis 记录已摘要的字节数
+(sha256_offset)。PATCH 落到无 hasher 的 worker (或重启后) 时从磁盘补算前缀。
+上传完成时摘要写入 tus: 哈希的 sha256 字段, 创建 Job 时无需再读整个文件。
+
+写入路径: create 时预分配 (posix_fallocate, 至多 PREALLOCATE_MAX_BYTES, 超出部分
+按需增长); PATCH 请求体按 ASGI 分片流式写入 (pwritev + 增量摘要在线程中执行, 不阻塞
+事件循环), offset 每 OFFSET_FLUSH_BYTES 批量回写 Redis, 中断时回写已落盘字节数以支持
+续传。带分片校验的 PATCH 不保留部分数据: 中断时回退到原 offset。
+"""
 from __future__ import annotations
+import asyncio
+import hashlib
 import os
 import time
 from pathlib import Path
+from typing import AsyncIterable, AsyncIterator
 from nanoid import generate as nanoid  # type: ignore[import-untyped]
 from redis.asyncio import Redis
 import structlog
+from prometheus_client import Counter, Histogram
 
 logger = structlog.get_logger()
 
 TUS_UPLOAD_DIR = Path(os.environ.get("TUS_UPLOAD_DIR", "/data/tus-uploads"))
 TUS_REDIS_PREFIX = "tus:"
 TUS_EXPIRE_SECONDS = 86400  # 24h
+HASH_CATCHUP_CHUNK = 1024 * 1024
+WRITE_BATCH_BYTES = 1024 * 1024  # 攒够后一次 pwritev
+OFFSET_FLUSH_BYTES = 8 * 1024 * 1024  # offset 回写 Redis 间隔
+PREALLOCATE_MAX_BYTES = 256 * 1024 * 1024  # create 时预分配上限, 避免声明长度直接占满磁盘
+
+TUS_BYTES_WRITTEN = Counter(
+    "pdf_tus_bytes_written_total", "Bytes written by TUS PATCH requests")
+TUS_PATCH_SECONDS = Histogram(
+    "pdf_tus_patch_seconds", "TUS PATCH request duration")
+TUS_PATCH_THROUGHPUT = Histogram(
+    "pdf_tus_patch_throughput_mbps", "TUS PATCH throughput (MB/s)",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000))
 
 
 class TusStore:
     def __init__(self, redis: Redis) -> None:
         self._redis = redis
+        self._hashers: dict[str, tuple["hashlib._Hash", int]] = {}  # upload_id → (hasher, 已摘要字节数)
         TUS_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
     async def create(self, upload_length: int, metadata: dict[str, str]) -> str:
@@ -29,11 +57,12 @@ class TusStore:
             "filetype": metadata.get("filetype", "application/pdf"),
             "status": "uploading",
             "created_at": str(time.time()),
+            "sha256_offset": "0",
         })
         await self._redis.expire(key, TUS_EXPIRE_SECONDS)
         # 创建磁盘文件 (预分配)
         file_path = TUS_UPLOAD_DIR / upload_id
-        file_path.touch()
+        await asyncio.to_thread(self._preallocate, file_path, upload_length)
         logger.info("tus_upload_created", upload_id=upload_id, length=upload_length)
         return upload_id
 
@@ -55,27 +84,140 @@ class TusStore:
             "filename": data["filename"],
             "filetype": data.get("filetype", ""),
             "status": data.get("status", "uploading"),
+            "file_hash": data.get("sha256", ""),
         }
 
+    @staticmethod
+    def _preallocate(file_path: Path, length: int) -> None:
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            length = min(length, PREALLOCATE_MAX_BYTES)
+            if length > 0 and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(fd, 0, length)
+                except OSError as e:
+                    # 文件系统不支持或空间不足: 退化为按需增长
+                    logger.warning("tus_fallocate_failed", length=length, error=str(e))
+        finally:
+            os.close(fd)
+
     async def append(self, upload_id: str, offset: int, chunk: bytes) -> int:
-        file_path = TUS_UPLOAD_DIR / upload_id
-        with open(file_path, "r+b" if file_path.stat().st_size > 0 else "wb") as f:
-            f.seek(offset)
-            f.write(chunk)
-        new_offset = offset + len(chunk)
+        return await self.append_stream(upload_id, offset, _single(chunk))
+
+    async def append_stream(
+        self,
+        upload_id: str,
+        offset: int,
+        chunks: AsyncIterable[bytes],
+        keep_partial: bool = True,
+    ) -> int:
+        """
+        流式写入 PATCH 请求体, 返回新 offset。
+
+        分片攒批后在线程中 pwritev 并更新摘要。迭代中途异常 (断连 / 超长) 时:
+        keep_partial=True 写入已收到的数据并回写 offset 后再抛出 (支持续传);
+        keep_partial=False (分片需整体校验) 丢弃本次数据, offset 保持原值。
+        """
+        t0 = time.perf_counter()
+        await self._ensure_hasher(upload_id, offset)
+        hasher, _ = self._hashers[upload_id]
         key = f"{TUS_REDIS_PREFIX}{upload_id}"
-        await self._redis.hset(key, "offset", str(new_offset))
-        return new_offset
 
-    async def mark_complete(self, upload_id: str) -> None:
+        fd = os.open(TUS_UPLOAD_DIR / upload_id, os.O_WRONLY)
+        pos = flushed = offset
+        pending: list[bytes] = []
+        pending_bytes = 0
+        completed = False
+        try:
+            async for piece in chunks:
+                if not piece:
+                    continue
+                pending.append(piece)
+                pending_bytes += len(piece)
+                if pending_bytes >= WRITE_BATCH_BYTES:
+                    pos = await asyncio.to_thread(_write_and_hash, fd, pending, pos, hasher)
+                    self._hashers[upload_id] = (hasher, pos)
+                    pending, pending_bytes = [], 0
+                    if keep_partial and pos - flushed >= OFFSET_FLUSH_BYTES:
+                        await self._flush_offset(key, pos)
+                        flushed = pos
+            completed = True
+        finally:
+            keep = completed or keep_partial
+            try:
+                # 正常结束或中途断开 (keep_partial) 都落盘已收到的尾部分片
+                if pending and keep:
+                    pos = await asyncio.to_thread(_write_and_hash, fd, pending, pos, hasher)
+                    self._hashers[upload_id] = (hasher, pos)
+            finally:
+                os.close(fd)
+            if not keep:
+                # 已落盘部分不计入 offset, 重传时覆盖; 摘要状态作废, 下次从磁盘补算
+                self._hashers.pop(upload_id, None)
+                pos = offset
+            elif pos != flushed:
+                await self._flush_offset(key, pos)
+
+        written = pos - offset
+        elapsed = time.perf_counter() - t0
+        TUS_BYTES_WRITTEN.inc(written)
+        TUS_PATCH_SECONDS.observe(elapsed)
+        if written and elapsed > 0:
+            TUS_PATCH_THROUGHPUT.observe(written / elapsed / (1024 * 1024))
+        return pos
+
+    async def _flush_offset(self, key: str, offset: int) -> None:
+        await self._redis.hset(key, mapping={
+            "offset": str(offset),
+            "sha256_offset": str(offset),
+        })
+
+    async def rollback(self, upload_id: str, offset: int) -> None:
+        """回退 offset (分片校验失败), 丢弃进程内摘要状态。"""
+        self._hashers.pop(upload_id, None)
+        await self._flush_offset(f"{TUS_REDIS_PREFIX}{upload_id}", offset)
+
+    async def _ensure_hasher(self, upload_id: str, offset: int) -> None:
+        hasher, hashed = self._hashers.get(upload_id, (None, -1))
+        if hasher is None or hashed != offset:
+            # 本进程无连续状态: 从磁盘补算 [0, offset)
+            hasher = await asyncio.to_thread(
+                self._hash_prefix, TUS_UPLOAD_DIR / upload_id, offset)
+            if offset:
+                logger.info("tus_hash_catchup", upload_id=upload_id, bytes=offset)
+            self._hashers[upload_id] = (hasher, offset)
+
+    @staticmethod
+    def _hash_prefix(file_path: Path, length: int) -> "hashlib._Hash":
+        h = hashlib.sha256()
+        remaining = length
+        with open(file_path, "rb") as f:
+            while remaining > 0:
+                block = f.read(min(HASH_CATCHUP_CHUNK, remaining))
+                if not block:
+                    break
+                h.update(block)
+                remaining -= len(block)
+        return h
+
+    async def mark_complete(self, upload_id: str) -> str:
+        """标记完成并落定文件 SHA-256, 返回摘要。"""
         key = f"{TUS_REDIS_PREFIX}{upload_id}"
-        await self._redis.hset(key, "status", "complete")
+        offset = await self.get_offset(upload_id)
+        hasher, hashed = self._hashers.pop(upload_id, (None, -1))
+        if hasher is None or hashed != offset:
+            hasher = await asyncio.to_thread(
+                self._hash_prefix, TUS_UPLOAD_DIR / upload_id, offset)
+        file_hash = hasher.hexdigest()
+        await self._redis.hset(key, mapping={"status": "complete", "sha256": file_hash})
+        return file_hash
 
     def get_file_path(self, upload_id: str) -> Path:
         return TUS_UPLOAD_DIR / upload_id
 
     async def delete(self, upload_id: str) -> None:
         key = f"{TUS_REDIS_PREFIX}{upload_id}"
+        self._hashers.pop(upload_id, None)
         await self._redis.delete(key)
         file_path = TUS_UPLOAD_DIR / upload_id
         if file_path.exists():
@@ -91,6 +233,7 @@ class TusStore:
             data = await self._redis.hgetall(key)
             if not data:
                 # Redis 已过期但文件还在
+                self._hashers.pop(upload_id, None)
                 file_path.unlink(missing_ok=True)
                 cleaned += 1
                 continue
@@ -100,6 +243,47 @@ class TusStore:
             if now - created > max_age_hours * 3600:
                 await self.delete(upload_id)
                 cleaned += 1
-        if cleaned:
-            logger.info("tus_cleanup", cleaned=cleaned)
+        evicted = await self._evict_stale_hashers()
+        if cleaned or evicted:
+            logger.info("tus_cleanup", cleaned=cleaned, hashers_evicted=evicted)
         return cleaned
+
+    async def _evict_stale_hashers(self) -> int:
+        """
+        丢弃已无用的进程内摘要状态: 上传已过期/删除/完成, 或续传已落到其他
+        worker (Redis offset 超过本进程已摘要字节数, 下次 PATCH 本就要补算)。
+        """
+        evicted = 0
+        for upload_id, (_, hashed) in list(self._hashers.items()):
+            data = await self._redis.hgetall(f"{TUS_REDIS_PREFIX}{upload_id}")
+            if (not data or data.get("status") == "complete"
+                    or int(data.get("offset", "0")) > hashed):
+                self._hashers.pop(upload_id, None)
+                evicted += 1
+        return evicted
+
+
+def _write_and_hash(fd: int, pieces: list[bytes], pos: int, hasher) -> int:
+    """线程中执行: pwritev 一批分片 (不拼接) 并更新摘要, 返回新位置。"""
+    total = sum(len(p) for p in pieces)
+    if hasattr(os, "pwritev"):
+        written = os.pwritev(fd, pieces, pos)
+        if written < total:  # 部分写入: 剩余部分逐段补写
+            _pwrite_all(fd, b"".join(pieces)[written:], pos + written)
+    else:
+        _pwrite_all(fd, b"".join(pieces), pos)
+    for p in pieces:
+        hasher.update(p)
+    return pos + total
+
+
+def _pwrite_all(fd: int, data: bytes, pos: int) -> None:
+    view = memoryview(data)
+    while view:
+        n = os.pwrite(fd, view, pos)
+        view = view[n:]
+        pos += n
+
+
+async def _single(chunk: bytes) -> AsyncIterator[bytes]:
+    yield chunk
@@ -1,7 +1,37 @@
 """LLM 客户端基类。"""
 from __future__ import annotations
+import base64
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+
+@dataclass(frozen=True)
+class ImagePayload:
+    """已按 provider 配置编码的图片 (image_prep.ImagePreparer 产出)。"""
+    data: bytes
+    mime: str
+    scale: float = 1.0  # 发送尺寸 / 原图尺寸 (未缩放为 1.0)
+
+
+def sniff_image_mime(data: bytes) -> str:
+    """按文件头判定图片 MIME (调用方传入原始 bytes 时使用)。"""
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return "image/jpeg"
+
+
+def encode_image(image: bytes | ImagePayload) -> tuple[str, str]:
+    """图片 → (mime, base64)。"""
+    if isinstance(image, ImagePayload):
+        return image.mime, base64.b64encode(image.data).decode()
+    return sniff_image_mime(image), base64.b64encode(image).decode()
 
 
 @dataclass
@@ -13,6 +43,16 @@ class LLMResponse:
     finish_reason: str = ""
     latency_ms: float = 0.0
     raw_response: dict | None = None
+    cached: bool = False  # 来自响应缓存, 未实际调用 provider
+    # 待提交的响应缓存写入 (由 LLMService 设置, 调用方解析成功后 commit_cache)
+    pending_cache: Callable[[], Awaitable[None]] | None = field(
+        default=None, repr=False, compare=False)
+
+    async def commit_cache(self) -> None:
+        """调用方解析成功后写入响应缓存; 未启用缓存或已提交时为空操作。"""
+        commit, self.pending_cache = self.pending_cache, None
+        if commit is not None:
+            await commit()
 
     @property
     def text(self) -> str:
@@ -42,7 +82,7 @@ class BaseLLMClient(ABC):
         temperature: float = 0.1,
         max_tokens: int = 4096,
         json_mode: bool = False,
-        images: list[bytes] | None = None,
+        images: list[bytes | ImagePayload] | None = None,
         timeout: float | None = None,
     ) -> LLMResponse:
         """发送 completion 请求。"""
@@ -10,12 +10,13 @@ Google Gemini LLM 客户端（原生 API 直连）。
 """
 from __future__ import annotations
 import asyncio
-import base64
 import time
 import httpx
 import structlog
 
-from pdf_sku.llm_adapter.client.base import BaseLLMClient, LLMResponse
+from pdf_sku.llm_adapter.client.base import (
+    BaseLLMClient, ImagePayload, LLMResponse, encode_image,
+)
 
 logger = structlog.get_logger()
 
@@ -43,15 +44,15 @@ class GeminiClient(BaseLLMClient):
         temperature: float = 0.1,
         max_tokens: int = 4096,
         json_mode: bool = False,
-        images: list[bytes] | None = None,
+        images: list[bytes | ImagePayload] | None = None,
         timeout: float | None = None,
     ) -> LLMResponse:
         parts = []
         if images:
-            for img_bytes in images:
-                b64 = base64.b64encode(img_bytes).decode()
+            for img in images:
+                mime, b64 = encode_image(img)
                 parts.append({
-                    "inline_data": {"mime_type": "image/jpeg", "data": b64}
+                    "inline_data": {"mime_type": mime, "data": b64}
                 })
         parts.append({"text": prompt})
 
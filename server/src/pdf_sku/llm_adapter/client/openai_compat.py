@@ -8,12 +8,13 @@
 """
 from __future__ import annotations
 import asyncio
-import base64
 import time
 import httpx
 import structlog
 
-from pdf_sku.llm_adapter.client.base import BaseLLMClient, LLMResponse
+from pdf_sku.llm_adapter.client.base import (
+    BaseLLMClient, ImagePayload, LLMResponse, encode_image,
+)
 
 logger = structlog.get_logger()
 
@@ -51,7 +52,7 @@ class OpenAICompatClient(BaseLLMClient):
         temperature: float = 0.1,
         max_tokens: int = 4096,
         json_mode: bool = False,
-        images: list[bytes] | None = None,
+        images: list[bytes | ImagePayload] | None = None,
         timeout: float | None = None,
     ) -> LLMResponse:
         messages = []
@@ -62,11 +63,11 @@ class OpenAICompatClient(BaseLLMClient):
         user_content: list | str
         if images:
             parts = []
-            for img_bytes in images:
-                b64 = base64.b64encode(img_bytes).decode()
+            for img in images:
+                mime, b64 = encode_image(img)
                 parts.append({
                     "type": "image_url",
-                    "image_url": {"url": f"data:image/jpeg;base64,{b64}"},
+                    "image_url": {"url": f"data:{mime};base64,{b64}"},
                 })
             parts.append({"type": "text", "text": prompt})
             user_content = parts
@@ -10,7 +10,9 @@ import time
 import httpx
 import structlog
 
-from pdf_sku.llm_adapter.client.base import BaseLLMClient, LLMResponse
+from pdf_sku.llm_adapter.client.base import (
+    BaseLLMClient, ImagePayload, LLMResponse, encode_image,
+)
 
 logger = structlog.get_logger()
 
@@ -39,7 +41,7 @@ class QwenClient(BaseLLMClient):
         temperature: float = 0.1,
         max_tokens: int = 4096,
         json_mode: bool = False,
-        images: list[bytes] | None = None,
+        images: list[bytes | ImagePayload] | None = None,
         timeout: float | None = None,
     ) -> LLMResponse:
         is_vl = "vl" in self._model.lower()
@@ -49,12 +51,11 @@ class QwenClient(BaseLLMClient):
 
         if is_vl and images:
             # Qwen-VL multimodal format (with images)
-            import base64
             content_parts = []
-            for img_bytes in images:
-                b64 = base64.b64encode(img_bytes).decode()
+            for img in images:
+                mime, b64 = encode_image(img)
                 content_parts.append({
-                    "image": f"data:image/jpeg;base64,{b64}",
+                    "image": f"data:{mime};base64,{b64}",
                 })
             content_parts.append({"text": prompt})
             messages.append({"role": "user", "content": content_parts})
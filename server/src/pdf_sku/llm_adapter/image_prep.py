@@ -0,0 +1,146 @@
+"""
+VLM 图片载荷准备。对齐: LLM Adapter 详设 §5.2
+
+按 provider 配置 (LLMProviderConfig.image_max_edge / image_format / image_quality)
+将截图缩放到有效输入分辨率并重新编码; 编码结果按 (图片摘要, 配置) 缓存在进程内 LRU,
+同一截图多次调用 (分类 → 提取 → 重试 / fallback) 只编码一次。
+
+- 重新编码后反而更大且未缩放时保留原图
+- image_format="original" 仅修正 MIME (按文件头识别), 不做转换
+- 返回像素坐标的操作 (COORDINATE_OPERATIONS) 不缩放, 只做格式转换:
+  下游按原截图 (150 DPI) 像素解释 bbox, 缩放会使坐标整体偏小
+- 每次调用发送的图片字节数计入 pdf_llm_image_bytes_per_call
+"""
+from __future__ import annotations
+import asyncio
+import hashlib
+import io
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+
+import structlog
+from prometheus_client import Counter, Histogram
+
+from pdf_sku.llm_adapter.client.base import ImagePayload, sniff_image_mime
+from pdf_sku.llm_adapter.provider_config import LLMProviderConfig
+
+logger = structlog.get_logger()
+
+DEFAULT_PREP_CACHE_SIZE = 256
+
+# 响应中包含截图像素坐标的操作
+COORDINATE_OPERATIONS = frozenset({"identify_boundaries"})
+
+_FORMAT_MIME = {"jpeg": "image/jpeg", "png": "image/png", "webp": "image/webp"}
+
+LLM_IMAGE_BYTES = Counter(
+    "pdf_llm_image_bytes_total", "VLM image payload bytes", ["provider", "stage"])  # original | sent
+LLM_IMAGE_BYTES_PER_CALL = Histogram(
+    "pdf_llm_image_bytes_per_call", "Image bytes sent per VLM call", ["provider"],
+    buckets=(50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000))
+LLM_IMAGE_PREP_CACHE = Counter(
+    "pdf_llm_image_prep_cache_total", "Encoded image payload cache lookups", ["result"])
+
+
+@dataclass(frozen=True)
+class ImageProfile:
+    max_edge: int = 0
+    fmt: str = "original"
+    quality: int = 85
+
+    @classmethod
+    def from_config(cls, cfg: LLMProviderConfig) -> "ImageProfile":
+        return cls(max_edge=max(0, cfg.image_max_edge),
+                   fmt=cfg.image_format if cfg.image_format in _FORMAT_MIME else "original",
+                   quality=min(max(cfg.image_quality, 1), 100))
+
+    def for_operation(self, operation: str) -> "ImageProfile":
+        """返回坐标的操作保持原始分辨率。"""
+        if operation in COORDINATE_OPERATIONS and self.max_edge:
+            return replace(self, max_edge=0)
+        return self
+
+
+class ImagePreparer:
+    """图片缩放 / 重编码 + 编码结果 LRU。"""
+
+    def __init__(self, max_entries: int = DEFAULT_PREP_CACHE_SIZE) -> None:
+        self._max = max_entries
+        self._lru: OrderedDict[tuple[str, ImageProfile], ImagePayload] = OrderedDict()
+
+    async def prepare(
+        self,
+        images: list[bytes],
+        profile: ImageProfile,
+        provider: str = "",
+    ) -> list[ImagePayload]:
+        """按 profile 准备一次调用的全部图片, 记录发送字节数。"""
+        out: list[ImagePayload] = []
+        for img in images:
+            key = (hashlib.sha256(img).hexdigest(), profile)
+            payload = self._lru.get(key)
+            if payload is not None:
+                self._lru.move_to_end(key)
+                LLM_IMAGE_PREP_CACHE.labels(result="hit").inc()
+            else:
+                LLM_IMAGE_PREP_CACHE.labels(result="miss").inc()
+                try:
+                    payload = await asyncio.to_thread(encode_for_profile, img, profile)
+                except Exception as e:
+                    logger.warning("llm_image_prep_failed", error=str(e))
+                    payload = ImagePayload(img, sniff_image_mime(img))
+                self._lru[key] = payload
+                while len(self._lru) > self._max:
+                    self._lru.popitem(last=False)
+            out.append(payload)
+
+        original = sum(len(i) for i in images)
+        sent = sum(len(p.data) for p in out)
+        LLM_IMAGE_BYTES.labels(provider=provider, stage="original").inc(original)
+        LLM_IMAGE_BYTES.labels(provider=provider, stage="sent").inc(sent)
+        LLM_IMAGE_BYTES_PER_CALL.labels(provider=provider).observe(sent)
+        logger.debug("llm_images_prepared", provider=provider, count=len(out),
+                     original_bytes=original, sent_bytes=sent)
+        return out
+
+
+def encode_for_profile(data: bytes, profile: ImageProfile) -> ImagePayload:
+    """同步: 缩放 + 重新编码 (线程中执行)。"""
+    mime = sniff_image_mime(data)
+    if profile.fmt == "original" and profile.max_edge <= 0:
+        return ImagePayload(data, mime)
+
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as im:
+        im.load()
+        resized = False
+        ratio = 1.0
+        if profile.max_edge and max(im.size) > profile.max_edge:
+            ratio = profile.max_edge / max(im.size)
+            im = im.resize((max(1, round(im.width * ratio)), max(1, round(im.height * ratio))),
+                           Image.LANCZOS)
+            resized = True
+        fmt = profile.fmt
+        if fmt == "original":
+            if not resized:
+                return ImagePayload(data, mime)
+            fmt = {"image/png": "png", "image/webp": "webp"}.get(mime, "jpeg")
+        if fmt == "jpeg" and im.mode != "RGB":
+            if im.mode in ("RGBA", "LA", "P"):
+                im = im.convert("RGBA")
+                bg = Image.new("RGB", im.size, (255, 255, 255))
+                bg.paste(im, mask=im.getchannel("A"))
+                im = bg
+            else:
+                im = im.convert("RGB")
+        buf = io.BytesIO()
+        if fmt == "png":
+            im.save(buf, format="PNG", optimize=True)
+        else:
+            im.save(buf, format=fmt.upper(), quality=profile.quality)
+        encoded = buf.getvalue()
+
+    if not resized and len(encoded) >= len(data):
+        return ImagePayload(data, mime)
+    return ImagePayload(encoded, _FORMAT_MIME[fmt], ratio)
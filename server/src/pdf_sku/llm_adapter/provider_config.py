@@ -1,18 +1,31 @@
-"""Per-provider LLM runtime configuration (Redis-backed with code defaults)."""
+"""Per-provider LLM runtime configuration (Redis-backed with code defaults).
+
+Reads go through the in-process config snapshot; writers publish the changed key
+so every worker drops its copy (see common.config_snapshot).
+"""
 from __future__ import annotations
 
 import json
 from dataclasses import asdict, dataclass, field
 
+from pdf_sku.common.config_snapshot import config_snapshot
+
 REDIS_KEY_PREFIX = "pdf_sku:llm_provider_config:"
 REDIS_PROVIDERS_KEY = "pdf_sku:llm_providers"
 
 
+IMAGE_FORMATS = ("jpeg", "png", "webp", "original")
+
+
 @dataclass
 class LLMProviderConfig:
     timeout_seconds: int = 60
     vlm_timeout_seconds: int = 180
     max_retries: int = 2
+    # VLM 图片载荷: 长边上限 (px, 0 = 不缩放) / 编码格式 / 有损质量
+    image_max_edge: int = 1568
+    image_format: str = "jpeg"
+    image_quality: int = 85
 
 
 @dataclass
@@ -33,15 +46,21 @@ class LLMProviderEntry:
     tpm_limit: int = 100000  # per-provider TPM
 
 
+# 图片长边默认值按各 provider 的有效输入分辨率: 超出部分会被服务端缩放, 上传纯属浪费
 DEFAULT_PROVIDER_CONFIGS: dict[str, LLMProviderConfig] = {
-    "gemini": LLMProviderConfig(timeout_seconds=60, vlm_timeout_seconds=120, max_retries=2),
-    "qwen": LLMProviderConfig(timeout_seconds=60, vlm_timeout_seconds=180, max_retries=2),
+    "gemini": LLMProviderConfig(timeout_seconds=60, vlm_timeout_seconds=120, max_retries=2,
+                                image_max_edge=2048),
+    "qwen": LLMProviderConfig(timeout_seconds=60, vlm_timeout_seconds=180, max_retries=2,
+                              image_max_edge=1344),
 }
 # Also match by model-name-based keys for new naming convention
 _PROVIDER_TYPE_DEFAULTS = {
-    "gemini": LLMProviderConfig(timeout_seconds=60, vlm_timeout_seconds=120, max_retries=2),
-    "qwen": LLMProviderConfig(timeout_seconds=60, vlm_timeout_seconds=180, max_retries=2),
-    "claude": LLMProviderConfig(timeout_seconds=90, vlm_timeout_seconds=180, max_retries=2),
+    "gemini": LLMProviderConfig(timeout_seconds=60, vlm_timeout_seconds=120, max_retries=2,
+                                image_max_edge=2048),
+    "qwen": LLMProviderConfig(timeout_seconds=60, vlm_timeout_seconds=180, max_retries=2,
+                              image_max_edge=1344),
+    "claude": LLMProviderConfig(timeout_seconds=90, vlm_timeout_seconds=180, max_retries=2,
+                                image_max_edge=1568),
     "deepseek": LLMProviderConfig(timeout_seconds=60, vlm_timeout_seconds=180, max_retries=2),
 }
 
@@ -52,13 +71,15 @@ async def get_provider_config(redis, provider: str) -> LLMProviderConfig:
     if redis is None:
         return default
     try:
-        raw = await redis.get(f"{REDIS_KEY_PREFIX}{provider}")
-        if raw:
-            data = json.loads(raw)
+        data = await config_snapshot.get(redis, f"{REDIS_KEY_PREFIX}{provider}")
+        if data:
             return LLMProviderConfig(
                 timeout_seconds=data.get("timeout_seconds", default.timeout_seconds),
                 vlm_timeout_seconds=data.get("vlm_timeout_seconds", default.vlm_timeout_seconds),
                 max_retries=data.get("max_retries", default.max_retries),
+                image_max_edge=data.get("image_max_edge", default.image_max_edge),
+                image_format=data.get("image_format", default.image_format),
+                image_quality=data.get("image_quality", default.image_quality),
             )
     except Exception:
         pass
@@ -67,7 +88,9 @@ async def get_provider_config(redis, provider: str) -> LLMProviderConfig:
 
 async def set_provider_config(redis, provider: str, config: LLMProviderConfig) -> None:
     """Write provider config to Redis."""
-    await redis.set(f"{REDIS_KEY_PREFIX}{provider}", json.dumps(asdict(config)))
+    key = f"{REDIS_KEY_PREFIX}{provider}"
+    await redis.set(key, json.dumps(asdict(config)))
+    await config_snapshot.publish_change(redis, key)
 
 
 async def list_provider_configs(redis) -> dict[str, dict]:
@@ -86,9 +109,8 @@ async def get_provider_entries(redis) -> list[LLMProviderEntry]:
     if redis is None:
         return []
     try:
-        raw = await redis.get(REDIS_PROVIDERS_KEY)
-        if raw:
-            items = json.loads(raw)
+        items = await config_snapshot.get(redis, REDIS_PROVIDERS_KEY)
+        if items:
             entries = [LLMProviderEntry(**item) for item in items]
             entries.sort(key=lambda e: e.priority)
             return entries
@@ -103,6 +125,7 @@ async def set_provider_entries(redis, entries: list[LLMProviderEntry]) -> None:
         return
     data = [asdict(e) for e in entries]
     await redis.set(REDIS_PROVIDERS_KEY, json.dumps(data))
+    await config_snapshot.publish_change(redis, REDIS_PROVIDERS_KEY)
 
 
 async def merge_provider_entries(
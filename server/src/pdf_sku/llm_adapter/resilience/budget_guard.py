@@ -17,6 +17,7 @@ logger = structlog.get_logger()
 
 BUDGET_KEY = "llm:daily_budget"
 USAGE_KEY_PREFIX = "llm:daily_usage"
+CACHE_STATS_KEY_PREFIX = "llm:daily_cache"
 
 
 class BudgetPhase(StrEnum):
@@ -76,15 +77,33 @@ class BudgetGuard:
         await self._redis.expire(key, 86400 * 2)
         return float(new_total)
 
+    async def record_cache_lookup(self, hit: bool, saved_usd: float = 0.0) -> None:
+        """记录响应缓存命中 / 未命中及命中节省的成本 (不计入已用预算)。"""
+        import datetime
+        today = datetime.date.today().isoformat()
+        key = f"{CACHE_STATS_KEY_PREFIX}:{today}"
+
+        # 每次 LLM 调用都会经过此处: 合并为一次往返
+        pipe = self._redis.pipeline()
+        pipe.hincrby(key, "hits" if hit else "misses", 1)
+        if hit and saved_usd:
+            pipe.hincrbyfloat(key, "saved_usd", saved_usd)
+        pipe.expire(key, 86400 * 2)
+        await pipe.execute()
+
     async def get_status(self) -> dict:
         """获取当日预算状态。"""
         import datetime
         today = datetime.date.today().isoformat()
         key = f"{USAGE_KEY_PREFIX}:{today}"
         used = float(await self._redis.get(key) or "0")
+        cache = await self._redis.hgetall(f"{CACHE_STATS_KEY_PREFIX}:{today}") or {}
         return {
             "daily_budget_usd": self._daily_budget,
             "used_usd": round(used, 4),
             "remaining_usd": round(max(0, self._daily_budget - used), 4),
             "remaining_pct": round(max(0, (self._daily_budget - used) / self._daily_budget), 4),
+            "cache_hits": int(cache.get("hits", 0)),
+            "cache_misses": int(cache.get("misses", 0)),
+            "cache_saved_usd": round(float(cache.get("saved_usd", 0)), 4),
         }
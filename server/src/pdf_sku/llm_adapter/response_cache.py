@@ -0,0 +1,143 @@
+"""
+LLM 响应缓存 (两级: 进程内 LRU + Redis)。对齐: LLM Adapter 详设 §5.2
+
+缓存键: llm_cache:{operation}:{provider}:{model_id}:{sha256(prompt + image digests)}
+- 仅缓存 settings.llm_response_cache_ttls 中列出的操作 (opt-in), 各操作独立 TTL
+- 仅写入调用方解析成功的响应 (LLMResponse.commit_cache), 无法解析的回复不会被重放
+- bypass_llm_cache() 上下文内的调用跳过读缓存 (需要多样性的重试), 结果仍回写
+- 命中 / 未命中 / 节省成本计入 Prometheus 与 BudgetGuard 当日统计
+"""
+from __future__ import annotations
+import contextlib
+import contextvars
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Iterator
+
+import orjson
+import structlog
+from prometheus_client import Counter
+
+from pdf_sku.llm_adapter.client.base import LLMResponse
+from pdf_sku.settings import settings
+
+logger = structlog.get_logger()
+
+KEY_PREFIX = "llm_cache"
+DEFAULT_LRU_SIZE = 512
+
+LLM_CACHE_LOOKUPS = Counter(
+    "pdf_llm_cache_lookups_total", "LLM response cache lookups",
+    ["operation", "result"])  # result: memory | redis | miss | bypass
+LLM_CACHE_SAVED_USD = Counter(
+    "pdf_llm_cache_saved_usd_total", "Estimated LLM cost avoided by cache hits",
+    ["operation"])
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "llm_cache_bypass", default=False)
+
+
+@contextlib.contextmanager
+def bypass_llm_cache() -> Iterator[None]:
+    """上下文内的 LLM 调用不读缓存 (结果仍回写)。"""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def cache_bypassed() -> bool:
+    return _bypass.get()
+
+
+def content_digest(prompt: str, images: list[bytes] | None) -> str:
+    """prompt + 各图片摘要 → 内容摘要 (与 provider 无关, 单次调用只算一次)。"""
+    h = hashlib.sha256(prompt.encode("utf-8"))
+    for img in images or ():
+        h.update(b"\x00")
+        h.update(hashlib.sha256(img).digest())
+    return h.hexdigest()
+
+
+class LLMResponseCache:
+    """两级 LLM 响应缓存。"""
+
+    def __init__(
+        self,
+        redis=None,
+        max_entries: int = DEFAULT_LRU_SIZE,
+        ttls: dict[str, int] | None = None,
+    ) -> None:
+        self._redis = redis
+        self._max = max_entries
+        self._ttls = dict(settings.llm_response_cache_ttls if ttls is None else ttls)
+        self._lru: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def enabled_for(self, operation: str) -> bool:
+        return self._ttls.get(operation, 0) > 0
+
+    @staticmethod
+    def key(operation: str, provider: str, model_id: str, digest: str) -> str:
+        return f"{KEY_PREFIX}:{operation}:{provider}:{model_id}:{digest}"
+
+    async def get(self, key: str, operation: str) -> LLMResponse | None:
+        entry = self._lru.get(key)
+        if entry is not None:
+            expires_at, data = entry
+            if expires_at > time.monotonic():
+                self._lru.move_to_end(key)
+                LLM_CACHE_LOOKUPS.labels(operation=operation, result="memory").inc()
+                return _to_response(data)
+            del self._lru[key]
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(key)
+                if raw:
+                    data = orjson.loads(raw)
+                    self._remember(key, operation, data)
+                    LLM_CACHE_LOOKUPS.labels(operation=operation, result="redis").inc()
+                    return _to_response(data)
+            except Exception as e:
+                logger.warning("llm_cache_read_failed", error=str(e))
+
+        LLM_CACHE_LOOKUPS.labels(operation=operation, result="miss").inc()
+        return None
+
+    async def put(self, key: str, operation: str, resp: LLMResponse) -> None:
+        ttl = self._ttls.get(operation, 0)
+        if ttl <= 0 or not resp.content:
+            return
+        data = {
+            "content": resp.content,
+            "model": resp.model,
+            "usage": resp.usage,
+            "finish_reason": resp.finish_reason,
+        }
+        self._remember(key, operation, data)
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, orjson.dumps(data), ex=ttl)
+            except Exception as e:
+                logger.warning("llm_cache_write_failed", error=str(e))
+
+    def _remember(self, key: str, operation: str, data: dict) -> None:
+        self._lru[key] = (time.monotonic() + self._ttls.get(operation, 0), data)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self._max:
+            self._lru.popitem(last=False)
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+
+def _to_response(data: dict) -> LLMResponse:
+    return LLMResponse(
+        content=data.get("content", ""),
+        model=data.get("model", ""),
+        usage=dict(data.get("usage") or {}),
+        finish_reason=data.get("finish_reason", ""),
+        cached=True,
+    )
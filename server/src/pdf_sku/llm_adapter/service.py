@@ -1,11 +1,19 @@
 """
 LLM 统一服务入口。对齐: LLM Adapter 详设 §5.2
 
-调用链: check_budget → check_rate → check_circuit → render_prompt → client.complete → parse → record
+调用链: cache → check_budget → check_rate → check_circuit → render_prompt → prepare_images → client.complete → parse → record
+
+文档评估: 截图按 EVAL_BATCH_SIZE 分批, 最多 EVAL_CONCURRENCY 批并发发送
+(每次调用仍经过限流器)。evaluate_stream 从异步迭代器逐批取截图, 批次就绪即发送,
+上游渲染与 LLM 调用重叠; 传入 stop_when 时每批完成后判断是否停止派发新批次。
 """
 from __future__ import annotations
 import asyncio
+import functools
+import os
 import time
+from typing import AsyncIterable, Callable
+from prometheus_client import Counter
 from pdf_sku.llm_adapter.client.base import BaseLLMClient, LLMResponse
 from pdf_sku.llm_adapter.client.registry import get_client
 from pdf_sku.llm_adapter.prompt.engine import PromptEngine
@@ -13,21 +21,31 @@ from pdf_sku.llm_adapter.parser.response_parser import ResponseParser, ParseResu
 from pdf_sku.llm_adapter.resilience.circuit_breaker import CircuitBreaker
 from pdf_sku.llm_adapter.resilience.budget_guard import BudgetGuard
 from pdf_sku.llm_adapter.resilience.rate_limiter import RateLimiter
+from pdf_sku.llm_adapter.usage import record_llm_call
+from pdf_sku.llm_adapter.response_cache import (
+    LLM_CACHE_LOOKUPS, LLM_CACHE_SAVED_USD,
+    LLMResponseCache, cache_bypassed, content_digest,
+)
 from pdf_sku.evaluator.scorer import PageScore
 from pdf_sku.llm_adapter.provider_config import get_provider_config, get_provider_entries
+from pdf_sku.llm_adapter.image_prep import ImagePreparer, ImageProfile
 from pdf_sku.common.exceptions import LLMCircuitOpenError, RetryableError
 import structlog
 
 logger = structlog.get_logger()
 
 EVAL_BATCH_SIZE = 3
+EVAL_CONCURRENCY = int(os.environ.get("EVAL_CONCURRENCY", "4"))
+
+EVAL_BATCH_CALLS = Counter(
+    "pdf_eval_batch_calls_total", "Document evaluation batch calls", ["result"])  # sent | saved
 
 
 class LLMService:
     """
     LLM 统一调用服务。所有 LLM 调用都通过此入口。
 
-    集成: 熔断 → 限流 → 预算 → Prompt → Client → Parse → 记录
+    集成: 响应缓存 → 熔断 → 限流 → 预算 → Prompt → Client → Parse → 记录
     """
 
     def __init__(
@@ -39,6 +57,8 @@ class LLMService:
         rate_limiter: RateLimiter | None = None,
         default_client_name: str = "gemini",
         redis=None,
+        response_cache: LLMResponseCache | None = None,
+        image_preparer: ImagePreparer | None = None,
     ) -> None:
         self._prompt = prompt_engine
         self._parser = parser
@@ -48,6 +68,8 @@ class LLMService:
         self._default_client = default_client_name
         self._redis = redis
         self._last_used_provider: str | None = None
+        self._cache = response_cache
+        self._images = image_preparer or ImagePreparer()
 
     @property
     def current_model_name(self) -> str:
@@ -63,72 +85,151 @@ class LLMService:
         screenshots: list[bytes],
         category: str | None = None,
         sample_pages: list[int] | None = None,
+        stop_when: Callable[[list[PageScore]], bool] | None = None,
+        concurrency: int = EVAL_CONCURRENCY,
     ) -> list[PageScore]:
         """
         文档级评估: 多页截图 → LLM → PageScore list。
 
         对齐: Evaluator 详设 §5.1 Step 4
         """
-        prompt_text = self._prompt.get_prompt("eval_document", {
-            "category": category or "",
-        })
-
         pages = sample_pages or list(range(1, len(screenshots) + 1))
-        page_scores: list[PageScore] = []
 
-        # 分批发送图片，每批最多 EVAL_BATCH_SIZE 张
-        for batch_start in range(0, len(screenshots), EVAL_BATCH_SIZE):
-            batch_end = batch_start + EVAL_BATCH_SIZE
-            batch_images = screenshots[batch_start:batch_end]
-            batch_pages = pages[batch_start:batch_end]
-
-            logger.info("eval_document_batch",
-                        batch_start=batch_start,
-                        batch_size=len(batch_images),
-                        total=len(screenshots))
-
-            llm_response = await self._call_llm(
-                operation="evaluate_document",
-                prompt=prompt_text,
-                images=batch_images,
-            )
-
-            # 解析响应
-            raw_scores = self._parser.parse_eval_scores(llm_response.content)
-
-            for i, score_data in enumerate(raw_scores):
-                page_no = batch_pages[i] if i < len(batch_pages) else batch_start + i + 1
-                if isinstance(score_data, dict):
-                    ps = PageScore(
-                        page_no=page_no,
-                        overall=float(score_data.get("overall", 0.5)),
-                        dimensions={
-                            "text_clarity": float(score_data.get("text_clarity", 0.5)),
-                            "image_quality": float(score_data.get("image_quality", 0.5)),
-                            "layout_structure": float(score_data.get("layout_structure", 0.5)),
-                            "table_regularity": float(score_data.get("table_regularity", 0.5)),
-                            "sku_density": float(score_data.get("sku_density", 0.5)),
-                        },
-                        raw_response=str(score_data),
-                    )
-                else:
-                    ps = PageScore(page_no=page_no, overall=0.5)
-                page_scores.append(ps)
+        async def batches():
+            for start in range(0, len(screenshots), EVAL_BATCH_SIZE):
+                yield (pages[start:start + EVAL_BATCH_SIZE],
+                       screenshots[start:start + EVAL_BATCH_SIZE])
 
-            logger.info("eval_document_batch_done",
-                        batch_start=batch_start,
-                        batch_scores=len(raw_scores),
-                        model=llm_response.model,
-                        tokens_in=llm_response.usage.get("input_tokens", 0),
-                        tokens_out=llm_response.usage.get("output_tokens", 0),
-                        latency_ms=llm_response.latency_ms)
+        return await self.evaluate_stream(
+            batches(), category=category, stop_when=stop_when, concurrency=concurrency,
+            planned_pages=len(screenshots))
 
+    async def evaluate_stream(
+        self,
+        batches: AsyncIterable[tuple[list[int], list[bytes]]],
+        category: str | None = None,
+        stop_when: Callable[[list[PageScore]], bool] | None = None,
+        concurrency: int = EVAL_CONCURRENCY,
+        planned_pages: int = 0,
+    ) -> list[PageScore]:
+        """
+        流式文档评估: 逐批取 (页号, 截图), 最多 concurrency 批同时调用 LLM。
+
+        Args:
+            batches: 每项至多 EVAL_BATCH_SIZE 页; 仅在有空闲并发槽时拉取下一批,
+                上游可据此限制在内存中的截图数量
+            stop_when: 序贯采样判定; 每批完成后以已得评分 (按批次顺序) 调用,
+                返回 True 后不再派发新批次 (已发出的调用照常完成并计入)
+            planned_pages: 计划评估页数, 用于统计节省的调用数
+        Returns:
+            按批次顺序排列的 PageScore
+        """
+        prompt_text = self._prompt.get_prompt("eval_document", {
+            "category": category or "",
+        })
+        concurrency = max(1, concurrency)
+        results: dict[int, list[PageScore]] = {}
+        pending: dict[asyncio.Task, int] = {}
+        it = aiter(batches)
+        exhausted = stopped = False
+        sent = offset = 0
+        try:
+            while True:
+                while not (exhausted or stopped) and len(pending) < concurrency:
+                    try:
+                        batch_pages, batch_images = await anext(it)
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    task = asyncio.create_task(self._evaluate_batch(
+                        prompt_text, offset, batch_images, batch_pages, total=planned_pages))
+                    pending[task] = sent
+                    sent += 1
+                    offset += len(batch_pages)
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    # 任一批失败即整体失败 (finally 中取消其余调用)
+                    results[pending.pop(task)] = task.result()
+                if stop_when is not None and not stopped:
+                    stopped = stop_when(_ordered(results))
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            if hasattr(it, "aclose"):
+                await it.aclose()
+
+        page_scores = _ordered(results)
+        planned_calls = -(-planned_pages // EVAL_BATCH_SIZE)
+        saved = max(planned_calls - sent, 0)
+        EVAL_BATCH_CALLS.labels(result="sent").inc(sent)
+        if saved:
+            EVAL_BATCH_CALLS.labels(result="saved").inc(saved)
         logger.info("eval_document_complete",
                      pages=len(page_scores),
+                     calls=sent,
+                     calls_saved=saved,
+                     early_stopped=stopped,
                      avg_overall=round(sum(p.overall for p in page_scores) / max(len(page_scores), 1), 3))
 
         return page_scores
 
+    async def _evaluate_batch(
+        self,
+        prompt_text: str,
+        batch_start: int,
+        batch_images: list[bytes],
+        batch_pages: list[int],
+        total: int,
+    ) -> list[PageScore]:
+        """单批评估调用 → 该批 PageScore。"""
+        logger.info("eval_document_batch",
+                    batch_start=batch_start,
+                    batch_size=len(batch_images),
+                    total=total)
+
+        llm_response = await self._call_llm(
+            operation="evaluate_document",
+            prompt=prompt_text,
+            images=batch_images,
+        )
+
+        # 解析响应
+        raw_scores = self._parser.parse_eval_scores(llm_response.content)
+        if raw_scores:
+            await llm_response.commit_cache()
+
+        page_scores: list[PageScore] = []
+        for i, score_data in enumerate(raw_scores):
+            page_no = batch_pages[i] if i < len(batch_pages) else batch_start + i + 1
+            if isinstance(score_data, dict):
+                ps = PageScore(
+                    page_no=page_no,
+                    overall=float(score_data.get("overall", 0.5)),
+                    dimensions={
+                        "text_clarity": float(score_data.get("text_clarity", 0.5)),
+                        "image_quality": float(score_data.get("image_quality", 0.5)),
+                        "layout_structure": float(score_data.get("layout_structure", 0.5)),
+                        "table_regularity": float(score_data.get("table_regularity", 0.5)),
+                        "sku_density": float(score_data.get("sku_density", 0.5)),
+                    },
+                    raw_response=str(score_data),
+                )
+            else:
+                ps = PageScore(page_no=page_no, overall=0.5)
+            page_scores.append(ps)
+
+        logger.info("eval_document_batch_done",
+                    batch_start=batch_start,
+                    batch_scores=len(raw_scores),
+                    model=llm_response.model,
+                    tokens_in=llm_response.usage.get("input_tokens", 0),
+                    tokens_out=llm_response.usage.get("output_tokens", 0),
+                    latency_ms=llm_response.latency_ms)
+        return page_scores
+
     async def evaluate_page_lightweight(
         self,
         screenshot: bytes,
@@ -146,7 +247,11 @@ class LLMService:
                 client_name=client_name,
                 timeout=30.0,
             )
-            return self._parser.parse_page_score(resp.content)
+            parsed = self._parser.parse(resp.content, expected_type="object")
+            if parsed.success and isinstance(parsed.data, dict):
+                await resp.commit_cache()
+                return float(parsed.data.get("score", 0.5))
+            return 0.5  # 中性分
         except Exception as e:
             logger.warning("lightweight_eval_failed", error=str(e))
             return 0.5
@@ -158,11 +263,12 @@ class LLMService:
         images: list[bytes] | None = None,
         client_name: str | None = None,
         timeout: float | None = None,
+        bypass_cache: bool = False,
     ) -> LLMResponse:
         """Public interface for _call_llm. Use this from external callers."""
         return await self._call_llm(
             operation=operation, prompt=prompt, images=images,
-            client_name=client_name, timeout=timeout,
+            client_name=client_name, timeout=timeout, bypass_cache=bypass_cache,
         )
 
     async def _call_llm(
@@ -172,21 +278,44 @@ class LLMService:
         images: list[bytes] | None = None,
         client_name: str | None = None,
         timeout: float | None = None,
+        bypass_cache: bool = False,
     ) -> LLMResponse:
         """
-        核心调用链: circuit → rate_limit → budget → client.complete → record。
+        核心调用链: cache → circuit → rate_limit → budget → client.complete → record。
         带重试 + fallback 到下一个 enabled provider。
+
+        响应缓存按 provider 查询; bypass_cache 或 bypass_llm_cache() 上下文内
+        跳过读缓存。新响应不直接写缓存: 调用方解析成功后 await resp.commit_cache()。
         """
         # Build ordered list of providers to try
         providers_to_try = await self._build_fallback_chain(client_name)
 
+        use_cache = bool(self._cache and self._cache.enabled_for(operation))
+        read_cache = use_cache and not (bypass_cache or cache_bypassed())
+        digest = content_digest(prompt, images) if use_cache else ""
+        if use_cache and not read_cache:
+            LLM_CACHE_LOOKUPS.labels(operation=operation, result="bypass").inc()
+
         last_error: Exception | None = None
         for provider_name in providers_to_try:
+            cache_key = ""
+            if use_cache:
+                cache_key = self._cache_key(operation, provider_name, digest)
+                if read_cache:
+                    cached = await self._cache.get(cache_key, operation)
+                    await self._record_cache_lookup(operation, provider_name, cached)
+                    if cached is not None:
+                        self._last_used_provider = provider_name
+                        return cached
             try:
                 resp = await self._call_single_provider(
                     provider_name, operation, prompt, images, timeout,
                 )
                 self._last_used_provider = provider_name
+                record_llm_call(resp)
+                if cache_key:
+                    resp.pending_cache = functools.partial(
+                        self._cache.put, cache_key, operation, resp)
                 return resp
             except LLMCircuitOpenError:
                 raise  # 不 fallback
@@ -200,6 +329,35 @@ class LLMService:
         raise RetryableError(
             f"All LLM providers failed for '{operation}': {last_error}")
 
+    def _cache_key(self, operation: str, provider_name: str, digest: str) -> str:
+        try:
+            client = get_client(provider_name)
+            provider, model_id = client.provider, client.model_id
+        except (KeyError, AttributeError):
+            provider, model_id = provider_name, provider_name
+        return LLMResponseCache.key(operation, provider, model_id, digest)
+
+    async def _record_cache_lookup(
+        self, operation: str, provider_name: str, cached: LLMResponse | None,
+    ) -> None:
+        """缓存命中/未命中计入 BudgetGuard 当日统计。"""
+        saved = 0.0
+        if cached is not None:
+            try:
+                provider = get_client(provider_name).provider
+            except (KeyError, AttributeError):
+                provider = provider_name
+            saved = self._estimate_cost(
+                provider,
+                cached.usage.get("input_tokens", 0),
+                cached.usage.get("output_tokens", 0))
+            LLM_CACHE_SAVED_USD.labels(operation=operation).inc(saved)
+        if self._budget:
+            try:
+                await self._budget.record_cache_lookup(cached is not None, saved)
+            except Exception as e:
+                logger.warning("llm_cache_stats_failed", error=str(e))
+
     async def _build_fallback_chain(self, client_name: str | None) -> list[str]:
         """Build ordered list of enabled provider names to try.
 
@@ -246,6 +404,11 @@ class LLMService:
         # Dynamic per-provider config from Redis (with code defaults fallback)
         provider_cfg = await get_provider_config(self._redis, client.provider)
         max_retries = provider_cfg.max_retries
+        # 图片按 provider 有效分辨率 / 格式准备 (重试复用同一载荷);
+        # 返回坐标的操作不缩放, 保持与截图像素同系
+        profile = ImageProfile.from_config(provider_cfg).for_operation(operation)
+        payload = (await self._images.prepare(images, profile, client.provider)
+                   if images else images)
 
         for attempt in range(max_retries + 1):
             # 1. 熔断检查
@@ -270,7 +433,7 @@ class LLMService:
 
                 resp = await client.complete(
                     prompt=prompt,
-                    images=images,
+                    images=payload,
                     json_mode=True,
                     timeout=effective_timeout,
                 )
@@ -319,3 +482,7 @@ class LLMService:
         }
         rates = pricing.get(provider, {"input": 0.10, "output": 0.30})
         return (input_tokens * rates["input"] + output_tokens * rates["output"]) / 1_000_000
+
+
+def _ordered(results: dict[int, list[PageScore]]) -> list[PageScore]:
+    return [ps for i in sorted(results) for ps in results[i]]
@@ -0,0 +1,47 @@
+"""
+LLM 调用用量计量 (按调用方作用域)。
+
+track_llm_usage() 上下文内经 LLMService 发出的 provider 调用 (不含缓存命中)
+累计到当前作用域, 供流水线按阶段统计 calls/page、tokens/SKU。
+"""
+from __future__ import annotations
+import contextlib
+import contextvars
+from dataclasses import dataclass
+from typing import Iterator
+
+from pdf_sku.llm_adapter.client.base import LLMResponse
+
+
+@dataclass
+class LLMUsage:
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+
+_current: contextvars.ContextVar[LLMUsage | None] = contextvars.ContextVar(
+    "llm_usage", default=None)
+
+
+@contextlib.contextmanager
+def track_llm_usage() -> Iterator[LLMUsage]:
+    usage = LLMUsage()
+    token = _current.set(usage)
+    try:
+        yield usage
+    finally:
+        _current.reset(token)
+
+
+def record_llm_call(resp: LLMResponse) -> None:
+    usage = _current.get()
+    if usage is None or resp.cached:
+        return
+    usage.calls += 1
+    usage.input_tokens += resp.usage.get("input_tokens", 0)
+    usage.output_tokens += resp.usage.get("output_tokens", 0)
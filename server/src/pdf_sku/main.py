@@ -12,7 +12,7 @@ from concurrent.futures import ProcessPoolExecutor
 import structlog
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from pdf_sku.settings import settings
 
@@ -103,7 +103,13 @@ async def lifespan(app: FastAPI):
         log.error("minio_connection_failed", error=str(e))
         app.state.storage = None
 
-    process_pool = ProcessPoolExecutor(max_workers=2)
+    from pdf_sku.pipeline.parser import doc_cache
+    doc_cache.register_metrics()
+    process_pool = ProcessPoolExecutor(
+        max_workers=2,
+        initializer=doc_cache.init_worker,
+        initargs=(doc_cache.shared_state(),),
+    )
     bg_tasks: list[asyncio.Task] = []
 
     # ─── 4. Component assembly (only if DB + Redis ready) ───
@@ -112,6 +118,11 @@ async def lifespan(app: FastAPI):
         redis = app.state.redis
 
         try:
+            from pdf_sku.gateway.event_bus import event_bus
+            if settings.event_bus_queue_size > 0:
+                event_bus.enable_queues(settings.event_bus_queue_size,
+                                        settings.event_bus_overflow)
+
             # Gateway
             import pdf_sku.gateway._deps as deps
             from pdf_sku.gateway.tus_store import TusStore
@@ -129,8 +140,9 @@ async def lifespan(app: FastAPI):
                 validator=FileValidator(),
                 security_checker=PDFSecurityChecker(process_pool),
                 prescanner=Prescanner(),
+                process_pool=process_pool,
             )
-            deps.sse_manager = SSEManager()
+            deps.sse_manager = SSEManager(redis=redis)
             deps.orphan_scanner = OrphanScanner(session_factory, redis)
             log.info("gateway_initialized")
 
@@ -531,6 +543,7 @@ async def lifespan(app: FastAPI):
             from pdf_sku.llm_adapter.resilience.circuit_breaker import CircuitBreaker
             from pdf_sku.llm_adapter.resilience.budget_guard import BudgetGuard
             from pdf_sku.llm_adapter.resilience.rate_limiter import RateLimiter
+            from pdf_sku.llm_adapter.response_cache import LLMResponseCache
 
             llm_service = LLMService(
                 prompt_engine=PromptEngine(),
@@ -540,6 +553,9 @@ async def lifespan(app: FastAPI):
                 rate_limiter=RateLimiter(redis) if (settings.gemini_api_key or settings.qwen_api_key or getattr(settings, 'openrouter_api_key', None)) else None,
                 default_client_name=settings.default_llm_client or (provider_entries[0].name if provider_entries else "gemini"),
                 redis=redis,
+                response_cache=LLMResponseCache(
+                    redis, max_entries=settings.llm_response_cache_lru_size,
+                ) if settings.llm_response_cache_enabled else None,
             )
             deps.llm_service = llm_service
 
@@ -562,12 +578,14 @@ async def lifespan(app: FastAPI):
             # Pipeline
             from pdf_sku.pipeline.page_processor import PageProcessor
             from pdf_sku.pipeline.orchestrator import Orchestrator
+            from pdf_sku.pipeline.page_cache import PageResultCache
 
             orchestrator = Orchestrator(
                 page_processor=PageProcessor(
                     llm_service=llm_service,
                     process_pool=process_pool,
                     config_provider=ConfigProvider(),
+                    page_cache=PageResultCache(redis),
                 ),
                 db_session_factory=session_factory,
                 redis=app.state.redis,
@@ -587,7 +605,12 @@ async def lifespan(app: FastAPI):
             import_adapter = ImportAdapter(
                 import_url=settings.downstream_import_url,
                 check_url=settings.downstream_check_url,
+                bulk_url=settings.downstream_bulk_import_url,
+                bulk_size=settings.downstream_bulk_size,
+                bulk_check_url=settings.downstream_bulk_check_url,
+                http2=settings.downstream_http2,
             )
+            app.state.import_adapter = import_adapter
             importer = IncrementalImporter(
                 adapter=import_adapter,
                 backpressure=BackpressureMonitor(),
@@ -633,8 +656,22 @@ async def lifespan(app: FastAPI):
 
             # Background tasks
             from pdf_sku.gateway.heartbeat import heartbeat_loop
+            from pdf_sku.common.loop_monitor import loop_lag_loop
 
             bg_tasks.append(asyncio.create_task(heartbeat_loop(redis, session_factory)))
+            bg_tasks.append(asyncio.create_task(loop_lag_loop()))
+            bg_tasks.append(asyncio.create_task(deps.sse_manager.run()))
+            if redis:
+                from pdf_sku.common.config_snapshot import config_snapshot
+                bg_tasks.append(asyncio.create_task(config_snapshot.run(redis)))
+
+            if settings.event_bus_backend == "redis_stream" and redis:
+                from pdf_sku.gateway.event_stream import RedisStreamBackend
+
+                stream_backend = RedisStreamBackend(redis, consumer=settings.worker_id)
+                event_bus.use_backend(stream_backend)
+                bg_tasks.append(asyncio.create_task(stream_backend.run(event_bus)))
+                log.info("event_stream_backend_enabled", consumer=settings.worker_id)
 
             async def orphan_loop():
                 while True:
@@ -645,6 +682,16 @@ async def lifespan(app: FastAPI):
                     await asyncio.sleep(60)
 
             bg_tasks.append(asyncio.create_task(orphan_loop()))
+
+            async def tus_cleanup_loop():
+                while True:
+                    await asyncio.sleep(3600)
+                    try:
+                        await deps.tus_store.cleanup_expired()
+                    except Exception:
+                        log.exception("tus_cleanup_error")
+
+            bg_tasks.append(asyncio.create_task(tus_cleanup_loop()))
             await scheduled_runner.start()
             log.info("background_tasks_started", count=len(bg_tasks))
 
@@ -685,7 +732,13 @@ async def lifespan(app: FastAPI):
     for task in bg_tasks:
         task.cancel()
     await asyncio.gather(*bg_tasks, return_exceptions=True)
+    from pdf_sku.gateway.event_bus import event_bus
+    await event_bus.aclose()
     process_pool.shutdown(wait=False)
+    if getattr(app.state, "storage", None):
+        app.state.storage.close()
+    if getattr(app.state, "import_adapter", None):
+        await app.state.import_adapter.aclose()
     if app.state.redis:
         await app.state.redis.close()
     if app.state.engine:
@@ -740,6 +793,12 @@ def create_app() -> FastAPI:
             content={"status": "healthy" if all_ok else "degraded", "services": services},
         )
 
+    # ─── Prometheus metrics ───
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+        return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
     # ─── Routers ───
     from pdf_sku.auth.router import router as auth_router
     from pdf_sku.gateway.router import router as gateway_router
@@ -4,9 +4,13 @@
 - 幂等键: {sku_id}_v{revision}
 - 4xx 分类: 400→数据错误(不重试), 409→CAS重试, 429→长退避
 - [P1-O9] 429 退避: 30s/60s/120s
+- 共享连接池 (keep-alive, h2 可用时启用 HTTP/2), 不再每个 SKU 新建 TCP+TLS 连接
+- 批量模式: 配置 bulk_url 时每次请求提交至多 bulk_size 个 SKU
+- 对账: check_status_batch 走 bulk_check_url, 未配置时有界并发逐页探测
 """
 from __future__ import annotations
 import asyncio
+import importlib.util
 from dataclasses import dataclass
 
 import httpx
@@ -14,6 +18,8 @@ import structlog
 
 logger = structlog.get_logger()
 
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 
 @dataclass
 class ImportResult:
@@ -38,10 +44,53 @@ class ImportAdapter:
     BACKOFF_429 = [30, 60, 120]
     BACKOFF_5XX = [2, 4, 8]
     MAX_BACKOFF = 300
+    MAX_CONNECTIONS = 20
 
-    def __init__(self, import_url: str = "", check_url: str = ""):
+    def __init__(
+        self,
+        import_url: str = "",
+        check_url: str = "",
+        bulk_url: str = "",
+        bulk_size: int = 50,
+        bulk_check_url: str = "",
+        http2: bool = True,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
         self._import_url = import_url
         self._check_url = check_url
+        self._bulk_url = bulk_url
+        self.bulk_size = max(1, bulk_size)
+        self._bulk_check_url = bulk_check_url
+        self._http2 = http2 and HTTP2_AVAILABLE and transport is None
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def bulk_enabled(self) -> bool:
+        return bool(self._import_url and self._bulk_url)
+
+    @property
+    def check_enabled(self) -> bool:
+        return bool(self._check_url or self._bulk_check_url)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """共享 AsyncClient (懒创建): 连接复用, 避免每次请求握手。"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.TIMEOUT,
+                http2=self._http2,
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_CONNECTIONS,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def import_sku(
         self,
@@ -55,44 +104,99 @@ class ImportAdapter:
             logger.debug("import_no_downstream", sku_id=payload.get("sku_id"))
             return ImportResult(confirmed=False, status_code=202)
 
-        idempotency_key = f"{payload.get('sku_id', 'unknown')}_v{revision}"
+        resp = await self._post_with_retry(
+            self._import_url,
+            {**payload, "image_uris": image_uris or []},
+            self._idempotency_key(payload, revision),
+        )
+        if resp.status_code in (200, 201):
+            return ImportResult(confirmed=True, status_code=resp.status_code)
+        return ImportResult(confirmed=False, status_code=resp.status_code)
+
+    async def import_batch(
+        self,
+        payloads: list[dict],
+        revision: int = 1,
+    ) -> list[ImportResult]:
+        """
+        批量导入 (bulk_url), 一次请求提交多个 SKU。
+
+        请求体: {"items": [{...payload, "idempotency_key"}]}
+        响应体: {"results": [{"sku_id", "status", "error"?}]}, status 按单条语义解释;
+        响应缺失的 SKU 视为 202 (ASSUMED, 由对账确认)。整批 4xx 抛 ImportDataError。
+        """
+        if not self.bulk_enabled:
+            return [await self.import_sku(p, revision=revision) for p in payloads]
+
+        items = [{**p, "image_uris": p.get("image_uris") or [],
+                  "idempotency_key": self._idempotency_key(p, revision)}
+                 for p in payloads]
+        batch_key = f"bulk_{items[0]['idempotency_key']}_{len(items)}"
+        resp = await self._post_with_retry(self._bulk_url, {"items": items}, batch_key)
+        if resp.status_code == 202:
+            return [ImportResult(confirmed=False, status_code=202) for _ in payloads]
+
+        try:
+            entries = resp.json().get("results") or []
+        except ValueError:
+            entries = []
+        by_id = {str(e.get("sku_id")): e for e in entries if isinstance(e, dict)}
+        results = []
+        for p in payloads:
+            entry = by_id.get(str(p.get("sku_id")))
+            if entry is None:
+                results.append(ImportResult(confirmed=False, status_code=202))
+                continue
+            code = int(entry.get("status", 202))
+            if code in (200, 201):
+                results.append(ImportResult(confirmed=True, status_code=code))
+            elif 400 <= code < 500:
+                results.append(ImportResult(
+                    status_code=code, error=str(entry.get("error", ""))[:200] or f"4xx: {code}"))
+            else:
+                results.append(ImportResult(confirmed=False, status_code=code))
+        return results
+
+    @staticmethod
+    def _idempotency_key(payload: dict, revision: int) -> str:
+        return f"{payload.get('sku_id', 'unknown')}_v{revision}"
 
+    async def _post_with_retry(self, url: str, body: dict, idempotency_key: str) -> httpx.Response:
+        """POST + 分类重试。返回 200/201/202 响应, 其余抛 ImportDataError / ImportServerError。"""
+        client = self._get_client()
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                async with httpx.AsyncClient(timeout=self.TIMEOUT) as client:
-                    resp = await client.post(
-                        self._import_url,
-                        json={**payload, "image_uris": image_uris or []},
-                        headers={
-                            "Idempotency-Key": idempotency_key,
-                            "X-API-Version": "v1",
-                        },
-                    )
-                    if resp.status_code in (200, 201):
-                        return ImportResult(confirmed=True, status_code=resp.status_code)
-                    elif resp.status_code == 202:
-                        return ImportResult(confirmed=False, status_code=202)
-                    elif resp.status_code == 409:
-                        if attempt < self.MAX_RETRIES:
-                            await asyncio.sleep(min(1 * (2 ** attempt), self.MAX_BACKOFF))
-                            continue
-                    elif resp.status_code == 429:
-                        delay = (self.BACKOFF_429[attempt]
-                                 if attempt < len(self.BACKOFF_429)
+                resp = await client.post(
+                    url,
+                    json=body,
+                    headers={
+                        "Idempotency-Key": idempotency_key,
+                        "X-API-Version": "v1",
+                    },
+                )
+                if resp.status_code in (200, 201, 202):
+                    return resp
+                elif resp.status_code == 409:
+                    if attempt < self.MAX_RETRIES:
+                        await asyncio.sleep(min(1 * (2 ** attempt), self.MAX_BACKOFF))
+                        continue
+                elif resp.status_code == 429:
+                    delay = (self.BACKOFF_429[attempt]
+                             if attempt < len(self.BACKOFF_429)
+                             else self.MAX_BACKOFF)
+                    logger.warning("import_rate_limited", attempt=attempt, delay=delay)
+                    await asyncio.sleep(delay)
+                    continue
+                elif 400 <= resp.status_code < 500:
+                    raise ImportDataError(f"4xx: {resp.status_code} - {resp.text[:200]}")
+                else:
+                    if attempt < self.MAX_RETRIES:
+                        delay = (self.BACKOFF_5XX[attempt]
+                                 if attempt < len(self.BACKOFF_5XX)
                                  else self.MAX_BACKOFF)
-                        logger.warning("import_rate_limited", attempt=attempt, delay=delay)
                         await asyncio.sleep(delay)
                         continue
-                    elif 400 <= resp.status_code < 500:
-                        raise ImportDataError(f"4xx: {resp.status_code} - {resp.text[:200]}")
-                    else:
-                        if attempt < self.MAX_RETRIES:
-                            delay = (self.BACKOFF_5XX[attempt]
-                                     if attempt < len(self.BACKOFF_5XX)
-                                     else self.MAX_BACKOFF)
-                            await asyncio.sleep(delay)
-                            continue
-                        raise ImportServerError(f"5xx: {resp.status_code}")
+                    raise ImportServerError(f"5xx: {resp.status_code}")
 
             except (httpx.TimeoutException, httpx.ConnectError) as e:
                 if attempt < self.MAX_RETRIES:
@@ -109,16 +213,14 @@ class ImportAdapter:
         if not self._import_url:
             return ImportResult(confirmed=False, status_code=202)
 
-        idempotency_key = f"{payload.get('sku_id', 'unknown')}_v{revision}"
-        async with httpx.AsyncClient(timeout=self.TIMEOUT) as client:
-            resp = await client.put(
-                f"{self._import_url}/{payload.get('sku_id', '')}",
-                json=payload,
-                headers={"Idempotency-Key": idempotency_key},
-            )
-            if resp.status_code in (200, 201):
-                return ImportResult(confirmed=True, status_code=resp.status_code)
-            raise ImportServerError(f"Upsert failed: {resp.status_code}")
+        resp = await self._get_client().put(
+            f"{self._import_url}/{payload.get('sku_id', '')}",
+            json=payload,
+            headers={"Idempotency-Key": self._idempotency_key(payload, revision)},
+        )
+        if resp.status_code in (200, 201):
+            return ImportResult(confirmed=True, status_code=resp.status_code)
+        raise ImportServerError(f"Upsert failed: {resp.status_code}")
 
     async def check_status(
         self, job_id: str, page_number: int,
@@ -127,11 +229,57 @@ class ImportAdapter:
         if not self._check_url:
             return None
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(
-                    f"{self._check_url}?job_id={job_id}&page={page_number}")
-                if resp.status_code == 200:
-                    return resp.json().get("confirmed", False)
+            resp = await self._get_client().get(
+                self._check_url,
+                params={"job_id": job_id, "page": page_number},
+                timeout=10,
+            )
+            if resp.status_code == 200:
+                return resp.json().get("confirmed", False)
             return None
         except Exception:
             return None
+
+    async def check_status_batch(
+        self,
+        pages: list[tuple[str, int]],
+        concurrency: int = 16,
+    ) -> list[bool | None]:
+        """
+        批量检查导入状态 [(job_id, page_number)], 返回顺序与输入一致。
+
+        配置 bulk_check_url 时一次 POST {"pages": [{"job_id", "page"}]},
+        响应 {"results": [{"job_id", "page", "confirmed"}]}; 否则有界并发调用 check_status。
+        不可用 / 缺失的页返回 None (I5 降级)。
+        """
+        if not pages:
+            return []
+        if not self.check_enabled:
+            return [None] * len(pages)
+        if self._bulk_check_url:
+            return await self._check_bulk(pages)
+
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(job_id: str, page_number: int) -> bool | None:
+            async with sem:
+                return await self.check_status(job_id, page_number)
+
+        return list(await asyncio.gather(*(one(j, p) for j, p in pages)))
+
+    async def _check_bulk(self, pages: list[tuple[str, int]]) -> list[bool | None]:
+        try:
+            resp = await self._get_client().post(
+                self._bulk_check_url,
+                json={"pages": [{"job_id": j, "page": p} for j, p in pages]},
+            )
+            if resp.status_code != 200:
+                return [None] * len(pages)
+            entries = resp.json().get("results") or []
+        except Exception:
+            return [None] * len(pages)
+        found = {
+            (str(e.get("job_id")), int(e.get("page", -1))): bool(e.get("confirmed", False))
+            for e in entries if isinstance(e, dict)
+        }
+        return [found.get((j, p)) for j, p in pages]
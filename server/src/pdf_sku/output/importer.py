@@ -6,9 +6,11 @@
 - [P1-O1] Upsert 语义 (跨页修正)
 - [P1-O2] 背压检查
 - [P1-O10] asyncio.create_task 异常回调
+- 单页 SKU 并发导入 (IMPORT_CONCURRENCY), 去重键一次 IN (...) 查询
 """
 from __future__ import annotations
 import asyncio
+import os
 from uuid import UUID
 
 from sqlalchemy import select, update
@@ -23,6 +25,8 @@ import structlog
 
 logger = structlog.get_logger()
 
+IMPORT_CONCURRENCY = int(os.environ.get("IMPORT_CONCURRENCY", "8"))  # 单页并发请求数
+
 
 class IncrementalImporter:
     def __init__(
@@ -64,40 +68,39 @@ class IncrementalImporter:
                            delay=self._bp.delay_seconds)
             await asyncio.sleep(self._bp.delay_seconds)
 
-        success_count = 0
-        for sku in valid_skus:
-            # [C3] 幂等去重检查
-            dedup_key = f"{job_id}:{page_number}:{sku.sku_id}:{attempt_no}"
-            is_dup = await self._check_dedup(db, dedup_key)
-            if is_dup:
-                logger.debug("import_dedup_skip", dedup_key=dedup_key)
-                success_count += 1
-                continue
-
-            try:
-                payload = self._build_payload(sku, job_id, page_number)
-                import_result = await self._adapter.import_sku(
-                    payload, revision=attempt_no)
-
-                # 记录去重
-                await self._record_dedup(
-                    db, dedup_key, UUID(job_id), page_number,
-                    "CONFIRMED" if import_result.confirmed else "ASSUMED")
-                success_count += 1
-                self._bp.on_success(job_id)
-
-            except ImportDataError as e:
-                logger.error("import_data_error",
-                             sku_id=sku.sku_id, error=str(e))
-                self._bp.on_failure(job_id)
-                await self._record_dedup(
-                    db, dedup_key, UUID(job_id), page_number, "FAILED")
+        # [C3] 幂等去重检查 (整页一次查询)
+        keyed = [(f"{job_id}:{page_number}:{sku.sku_id}:{attempt_no}", sku)
+                 for sku in valid_skus]
+        done_keys = await self._existing_dedup_keys(db, [k for k, _ in keyed])
+        pending = [(k, sku) for k, sku in keyed if k not in done_keys]
+        success_count = len(keyed) - len(pending)
+        if success_count:
+            logger.debug("import_dedup_skip", job_id=job_id,
+                         page=page_number, skipped=success_count)
+
+        if self._adapter.bulk_enabled:
+            size = self._adapter.bulk_size
+            groups = [pending[i:i + size] for i in range(0, len(pending), size)]
+        else:
+            groups = [[item] for item in pending]
+        sem = asyncio.Semaphore(IMPORT_CONCURRENCY)
+        outcomes = await asyncio.gather(
+            *(self._import_group(sem, g, job_id, page_number, attempt_no) for g in groups),
+            return_exceptions=True,
+        )
 
-            except Exception as e:
-                logger.error("import_failed",
-                             sku_id=sku.sku_id, error=str(e))
-                self._bp.on_failure(job_id)
-                raise  # 上层重试
+        # 先记录已有结果, 再向上抛出未分类异常 (上层重试时跳过已导入 SKU)
+        error: BaseException | None = None
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                error = error or outcome
+                continue
+            for dedup_key, status in outcome:
+                await self._record_dedup(db, dedup_key, UUID(job_id), page_number, status)
+                if status != "FAILED":
+                    success_count += 1
+        if error is not None:
+            raise error
 
         # 更新 Page 状态
         if success_count == len(valid_skus):
@@ -155,11 +158,51 @@ class IncrementalImporter:
                      job_id=job_id, upserted=upserted)
         return upserted
 
-    async def _check_dedup(self, db: AsyncSession, dedup_key: str) -> bool:
-        """[C3] 检查是否已导入。"""
+    async def _import_group(
+        self,
+        sem: asyncio.Semaphore,
+        group: list[tuple[str, SKUResult]],
+        job_id: str,
+        page_number: int,
+        attempt_no: int,
+    ) -> list[tuple[str, str]]:
+        """导入一组 SKU (单条或一个 bulk 请求), 返回 [(dedup_key, import_status)]。"""
+        payloads = [self._build_payload(sku, job_id, page_number) for _, sku in group]
+        async with sem:
+            try:
+                if len(group) == 1 and not self._adapter.bulk_enabled:
+                    results = [await self._adapter.import_sku(
+                        payloads[0], revision=attempt_no)]
+                else:
+                    results = await self._adapter.import_batch(
+                        payloads, revision=attempt_no)
+            except ImportDataError as e:
+                results = [ImportResult(error=str(e)) for _ in group]
+            except Exception as e:
+                logger.error("import_failed",
+                             skus=[sku.sku_id for _, sku in group], error=str(e))
+                for _ in group:
+                    self._bp.on_failure(job_id)
+                raise  # 上层重试
+
+        statuses = []
+        for (dedup_key, sku), res in zip(group, results):
+            if res.error:
+                logger.error("import_data_error", sku_id=sku.sku_id, error=res.error)
+                self._bp.on_failure(job_id)
+                statuses.append((dedup_key, "FAILED"))
+            else:
+                self._bp.on_success(job_id)
+                statuses.append((dedup_key, "CONFIRMED" if res.confirmed else "ASSUMED"))
+        return statuses
+
+    async def _existing_dedup_keys(self, db: AsyncSession, dedup_keys: list[str]) -> set[str]:
+        """[C3] 已导入的去重键 (单次 IN 查询)。"""
+        if not dedup_keys:
+            return set()
         result = await db.execute(
-            select(ImportDedup.id).where(ImportDedup.dedup_key == dedup_key))
-        return result.scalar_one_or_none() is not None
+            select(ImportDedup.dedup_key).where(ImportDedup.dedup_key.in_(dedup_keys)))
+        return set(result.scalars().all())
 
     async def _record_dedup(
         self,
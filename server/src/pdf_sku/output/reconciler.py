@@ -5,13 +5,17 @@
 - IMPORT_FAILED 滞留 > 24h → SKIPPED
 - Job 终态判定 (并发保护)
 - [P0-2] I5 降级: 24h 自动确认
+- 按 Page.id keyset 分批: 每批并发 / bulk 探测下游, 一条集合 UPDATE 回写
 """
 from __future__ import annotations
+import os
+import time
 from datetime import datetime, timezone, timedelta
 from collections import Counter
 
 from sqlalchemy import select, update, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
+from prometheus_client import Gauge, Histogram
 
 from pdf_sku.common.models import PDFJob, Page
 from pdf_sku.common.enums import JobInternalStatus, PageStatus
@@ -23,6 +27,14 @@ logger = structlog.get_logger()
 
 ASSUMED_AUTO_CONFIRM_SEC = 86400  # 24h
 FAILED_STALE_THRESHOLD = 86400   # 24h
+RECONCILE_BATCH_SIZE = int(os.environ.get("RECONCILE_BATCH_SIZE", "500"))
+RECONCILE_CONCURRENCY = int(os.environ.get("RECONCILE_CONCURRENCY", "16"))
+
+RECONCILE_ROUND_SECONDS = Histogram(
+    "pdf_reconcile_round_seconds", "Reconciliation round duration",
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 1800, 3600))
+RECONCILE_BACKLOG = Gauge(
+    "pdf_reconcile_assumed_backlog", "Pages still imported_assumed after the last reconciliation round")
 TERMINAL_PAGE_STATUSES = {
     PageStatus.AI_COMPLETED.value,
     PageStatus.IMPORTED_CONFIRMED.value,
@@ -42,57 +54,83 @@ class ReconciliationPoller:
         2. FAILED 滞留 → SKIPPED
         3. Job 终态判定
         """
+        t0 = time.perf_counter()
         stats = {"confirmed": 0, "auto_confirmed": 0, "stale_skipped": 0, "finalized": 0}
-
-        # 1. IMPORTED_ASSUMED → 确认
-        result = await db.execute(
-            select(Page).where(Page.import_confirmation == "imported_assumed")
-        )
-        assumed_pages = result.scalars().all()
         now = datetime.now(timezone.utc)
 
-        for page in assumed_pages:
-            confirmed = await self._adapter.check_status(
-                str(page.job_id), page.page_number)
-            if confirmed is True:
-                await db.execute(
-                    update(Page).where(Page.id == page.id)
-                    .values(import_confirmation="imported_confirmed")
-                )
-                stats["confirmed"] += 1
-            elif confirmed is None:
-                # I5 降级: 超 24h 自动确认
-                age = (now - (page.claimed_at or now)).total_seconds()
-                if age > ASSUMED_AUTO_CONFIRM_SEC:
-                    await db.execute(
-                        update(Page).where(Page.id == page.id)
-                        .values(import_confirmation="imported_confirmed")
-                    )
-                    stats["auto_confirmed"] += 1
-
-        # 2. IMPORT_FAILED 滞留 → 标记
+        # 1. IMPORTED_ASSUMED → 确认 (keyset 分批)
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(Page.id, Page.job_id, Page.page_number, Page.claimed_at)
+                .where(Page.import_confirmation == "imported_assumed", Page.id > last_id)
+                .order_by(Page.id)
+                .limit(RECONCILE_BATCH_SIZE)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            confirmed, auto = await self._reconcile_batch(db, rows, now)
+            stats["confirmed"] += confirmed
+            stats["auto_confirmed"] += auto
+            if len(rows) < RECONCILE_BATCH_SIZE:
+                break
+
+        # 2. IMPORT_FAILED 滞留 → 标记为跳过
         cutoff = now - timedelta(seconds=FAILED_STALE_THRESHOLD)
         result = await db.execute(
-            select(Page).where(
+            update(Page).where(
                 Page.status == PageStatus.AI_FAILED.value,
                 Page.claimed_at < cutoff,
-            )
+            ).values(status=PageStatus.BLANK.value)
         )
-        stale = result.scalars().all()
-        for page in stale:
-            await db.execute(
-                update(Page).where(Page.id == page.id)
-                .values(status=PageStatus.BLANK.value)  # 标记为跳过
-            )
-            stats["stale_skipped"] += 1
+        stats["stale_skipped"] = result.rowcount or 0
 
         # 3. Job 终态判定
         stats["finalized"] = await self._check_job_completion(db)
 
+        backlog = (await db.execute(
+            select(func.count()).select_from(Page)
+            .where(Page.import_confirmation == "imported_assumed")
+        )).scalar_one()
+        duration = time.perf_counter() - t0
+        RECONCILE_ROUND_SECONDS.observe(duration)
+        RECONCILE_BACKLOG.set(backlog)
+
         if any(v > 0 for v in stats.values()):
-            logger.info("reconciliation_complete", **stats)
+            logger.info("reconciliation_complete", **stats,
+                        backlog=backlog, duration_ms=int(duration * 1000))
+        stats["backlog"] = backlog
         return stats
 
+    async def _reconcile_batch(self, db: AsyncSession, rows, now: datetime) -> tuple[int, int]:
+        """探测一批 ASSUMED 页, 集合 UPDATE 回写。返回 (confirmed, auto_confirmed)。"""
+        results = await self._adapter.check_status_batch(
+            [(str(r.job_id), r.page_number) for r in rows],
+            concurrency=RECONCILE_CONCURRENCY,
+        )
+        confirmed_ids, auto_ids = [], []
+        for row, confirmed in zip(rows, results):
+            if confirmed is True:
+                confirmed_ids.append(row.id)
+            elif confirmed is None:
+                # I5 降级: 超 24h 自动确认
+                claimed_at = row.claimed_at or now
+                if claimed_at.tzinfo is None:
+                    claimed_at = claimed_at.replace(tzinfo=timezone.utc)
+                if (now - claimed_at).total_seconds() > ASSUMED_AUTO_CONFIRM_SEC:
+                    auto_ids.append(row.id)
+
+        ids = confirmed_ids + auto_ids
+        if ids:
+            await db.execute(
+                update(Page).where(Page.id.in_(ids))
+                .values(import_confirmation="imported_confirmed")
+                .execution_options(synchronize_session=False)
+            )
+        return len(confirmed_ids), len(auto_ids)
+
     async def _check_job_completion(self, db: AsyncSession) -> int:
         """检查活跃 Job 是否可以标记为 FULL_IMPORTED。"""
         result = await db.execute(
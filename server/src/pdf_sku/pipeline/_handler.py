@@ -2,6 +2,7 @@
 Pipeline 事件处理器。
 
 监听 EvaluationCompleted → 启动 Pipeline。
+监听 JobRequeued (孤儿重提) → 断点续跑 Pipeline。
 """
 from __future__ import annotations
 import asyncio
@@ -30,6 +31,7 @@ def init_handler(orchestrator, session_factory, task_manager: TaskManager | None
     _db_session_factory = session_factory
     _task_manager = task_manager or TaskManager()
     event_bus.subscribe("EvaluationCompleted", _on_evaluation_completed)
+    event_bus.subscribe("JobRequeued", _on_job_requeued)
     logger.info("pipeline_handler_registered")
 
 
@@ -46,6 +48,22 @@ async def _on_evaluation_completed(data: dict) -> None:
     asyncio.create_task(_run_pipeline(job_id, data))
 
 
+async def _on_job_requeued(data: dict) -> None:
+    """处理 JobRequeued → 续跑未完成页 (已完成页不重复调用 LLM)。"""
+    job_id = data.get("job_id", "")
+    route = data.get("route")
+    if not route or route == "HUMAN_ALL":
+        # 仅已评估并进入 AI 处理的 Job 可续跑; 未评估的孤儿由扫描器重新发布 JobCreated
+        logger.warning("requeue_not_resumable", job_id=job_id, route=route)
+        return
+    asyncio.create_task(_run_pipeline(job_id, {
+        "job_id": job_id,
+        "route": route,
+        "prescan": data.get("prescan") or {},
+        "resume": True,
+    }))
+
+
 async def _run_human_all(job_id: str, eval_data: dict) -> None:
     """针对 HUMAN_ALL 路由自动创建人工任务。"""
     if not _db_session_factory or not _task_manager:
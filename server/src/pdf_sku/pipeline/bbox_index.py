@@ -0,0 +1,111 @@
+"""
+bbox 空间索引 (NumPy, sort-and-sweep)。对齐: Pipeline 详设 §5.2 Phase 2
+
+瓦片拼贴页可能有数千个图片碎片, 两两比较 O(n²) 会阻塞事件循环。
+按 x0 排序后, 每个 bbox 只与 x 方向窗口内的后继比较 (searchsorted 定界,
+窗口内向量化判定), 复杂度 O(n log n + k), k 为候选对数。
+"""
+from __future__ import annotations
+from typing import Sequence
+
+import numpy as np
+
+
+def bbox_array(bboxes: Sequence[Sequence[float]]) -> tuple[np.ndarray, np.ndarray]:
+    """bbox 列表 → (n×4 float64 数组, 有效掩码)。长度不足 4 的 bbox 无效。"""
+    n = len(bboxes)
+    arr = np.zeros((n, 4), dtype=np.float64)
+    valid = np.zeros(n, dtype=bool)
+    for i, b in enumerate(bboxes):
+        if len(b) >= 4:
+            arr[i] = b[:4]
+            valid[i] = True
+    return arr, valid
+
+
+def _sweep(
+    arr: np.ndarray,
+    valid: np.ndarray,
+    reach: float,
+):
+    """按 x0 排序, 逐个产出 (i, 窗口内后继的原始下标数组)。窗口: x0_j < x1_i + reach。"""
+    idx = np.flatnonzero(valid)
+    if idx.size < 2:
+        return
+    order = idx[np.argsort(arr[idx, 0], kind="stable")]
+    x0_sorted = arr[order, 0]
+    ends = np.searchsorted(x0_sorted, arr[order, 2] + reach, side="left")
+    for pos in range(order.size - 1):
+        end = ends[pos]
+        if end > pos + 1:
+            yield order[pos], order[pos + 1:end]
+
+
+def _pairs(found: list[tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+    """(i, js) 列表 → 按 (min, max) 字典序排列的 k×2 下标对。"""
+    if not found:
+        return np.empty((0, 2), dtype=np.intp)
+    a = np.concatenate([np.full(js.size, i, dtype=np.intp) for i, js in found])
+    b = np.concatenate([js for _, js in found]).astype(np.intp)
+    pairs = np.stack([np.minimum(a, b), np.maximum(a, b)], axis=1)
+    return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+
+def overlap_pairs(bboxes: Sequence[Sequence[float]], min_ratio: float) -> np.ndarray:
+    """
+    重叠率 (overlap_area / min(area_i, area_j), 面积下限 1) > min_ratio 的下标对。
+
+    Returns:
+        k×2 数组, 每行 i < j, 按 (i, j) 升序
+    """
+    arr, valid = bbox_array(bboxes)
+    area = np.maximum(1.0, (arr[:, 2] - arr[:, 0]) * (arr[:, 3] - arr[:, 1]))
+    found = []
+    for i, js in _sweep(arr, valid, 0.0):
+        b = arr[js]
+        ow = np.minimum(arr[i, 2], b[:, 2]) - np.maximum(arr[i, 0], b[:, 0])
+        oh = np.minimum(arr[i, 3], b[:, 3]) - np.maximum(arr[i, 1], b[:, 1])
+        overlap = np.maximum(0.0, ow) * np.maximum(0.0, oh)
+        ratio = overlap / np.minimum(area[i], area[js])
+        hit = js[(overlap > 0) & (ratio > min_ratio)]
+        if hit.size:
+            found.append((i, hit))
+    return _pairs(found)
+
+
+def adjacent_pairs(bboxes: Sequence[Sequence[float]], gap: float) -> np.ndarray:
+    """水平与垂直方向间隔均 < gap (含重叠) 的下标对, 格式同 overlap_pairs。"""
+    arr, valid = bbox_array(bboxes)
+    found = []
+    for i, js in _sweep(arr, valid, gap):
+        b = arr[js]
+        h_adj = (arr[i, 0] < b[:, 2] + gap) & (b[:, 0] < arr[i, 2] + gap)
+        v_adj = (arr[i, 1] < b[:, 3] + gap) & (b[:, 1] < arr[i, 3] + gap)
+        hit = js[h_adj & v_adj]
+        if hit.size:
+            found.append((i, hit))
+    return _pairs(found)
+
+
+def connected_components(n: int, pairs: np.ndarray) -> list[list[int]]:
+    """Union-Find 聚类。返回各分量的成员下标 (升序), 分量按最小成员排序。"""
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs.tolist():
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            if ri < rj:
+                parent[rj] = ri
+            else:
+                parent[ri] = rj
+
+    groups: dict[int, list[int]] = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
@@ -0,0 +1,117 @@
+"""
+Job 断点续跑。对齐: Pipeline 详设 §5.1 [C5]
+
+根据 pages.status 与已落库的 SKU 行判定哪些页已完成:
+- 终态页 (AI_COMPLETED / BLANK / HUMAN_* / IMPORTED_* ...) 且落库 SKU 数与
+  Page.sku_count 一致 → 跳过
+- AI_FAILED / PENDING / AI_PROCESSING 等非终态页, 或 SKU 行不完整的页 → 重跑
+  (重跑前对全部待重跑页 pending_pages 调用 reset_pages, 清理残留的 SKU / Image / Binding)
+并按 extraction_method 估算被跳过页节省的 LLM 调用数。
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from pdf_sku.common.models import PDFJob, Page, SKU, Image, SKUImageBinding
+from pdf_sku.common.enums import PageStatus
+import structlog
+
+logger = structlog.get_logger()
+
+RESUME_TERMINAL_STATUSES = frozenset({
+    PageStatus.AI_COMPLETED.value,
+    PageStatus.BLANK.value,
+    PageStatus.SKIPPED.value,
+    PageStatus.HUMAN_QUEUED.value,
+    PageStatus.HUMAN_PROCESSING.value,
+    PageStatus.HUMAN_COMPLETED.value,
+    PageStatus.IMPORTED_CONFIRMED.value,
+    PageStatus.IMPORTED_ASSUMED.value,
+    PageStatus.IMPORT_FAILED.value,
+    PageStatus.DEAD_LETTER.value,
+})
+
+# 单页 LLM 调用估算: 分类 1 次 + 提取阶段
+_LLM_CALLS_BY_METHOD = {
+    "two_stage": 3,
+    "single_stage": 2,
+}
+_LLM_CALLS_DEFAULT = 1  # 仅分类 (规则提取 / D 类跳过)
+
+
+@dataclass
+class ResumePlan:
+    """续跑计划。"""
+    pending_pages: list[int] = field(default_factory=list)
+    completed_pages: list[int] = field(default_factory=list)
+    incomplete_pages: list[int] = field(default_factory=list)  # 终态但 SKU 行缺失
+    llm_calls_avoided: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "pending": len(self.pending_pages),
+            "completed": len(self.completed_pages),
+            "incomplete": len(self.incomplete_pages),
+            "llm_calls_avoided": self.llm_calls_avoided,
+        }
+
+
+def estimate_llm_calls(page: Page) -> int:
+    if page.status == PageStatus.BLANK.value:
+        return 0
+    return _LLM_CALLS_BY_METHOD.get(page.extraction_method or "", _LLM_CALLS_DEFAULT)
+
+
+async def build_resume_plan(
+    db: AsyncSession,
+    job: PDFJob,
+    blank_pages: list[int] | None = None,
+) -> ResumePlan:
+    """读取页面状态与已落库 SKU, 生成续跑计划 (只读)。"""
+    blank = set(blank_pages or [])
+    pages = {
+        p.page_number: p for p in (await db.execute(
+            select(Page).where(Page.job_id == job.job_id, Page.attempt_no == 1)
+        )).scalars().all()
+    }
+    persisted = dict((await db.execute(
+        select(SKU.page_number, func.count())
+        .where(SKU.job_id == job.job_id)
+        .group_by(SKU.page_number)
+    )).all())
+
+    plan = ResumePlan()
+    for page_no in range(1, job.total_pages + 1):
+        if page_no in blank:
+            continue
+        page = pages.get(page_no)
+        if page is None or page.status not in RESUME_TERMINAL_STATUSES:
+            plan.pending_pages.append(page_no)
+        elif persisted.get(page_no, 0) < (page.sku_count or 0):
+            plan.incomplete_pages.append(page_no)
+            plan.pending_pages.append(page_no)
+        else:
+            plan.completed_pages.append(page_no)
+            plan.llm_calls_avoided += estimate_llm_calls(page)
+    return plan
+
+
+async def reset_pages(db: AsyncSession, job_id, page_numbers: list[int]) -> None:
+    """清理待重跑页残留的 SKU / Image / Binding 行。"""
+    if not page_numbers:
+        return
+    sku_ids = (await db.execute(
+        select(SKU.sku_id).where(
+            SKU.job_id == job_id, SKU.page_number.in_(page_numbers))
+    )).scalars().all()
+    if sku_ids:
+        await db.execute(delete(SKUImageBinding).where(
+            SKUImageBinding.job_id == job_id,
+            SKUImageBinding.sku_id.in_(sku_ids),
+        ))
+    await db.execute(delete(SKU).where(
+        SKU.job_id == job_id, SKU.page_number.in_(page_numbers)))
+    await db.execute(delete(Image).where(
+        Image.job_id == job_id, Image.page_number.in_(page_numbers)))
@@ -43,6 +43,7 @@ class PageClassifier:
                 )
                 parsed = _parser.parse(resp.text, expected_type="object")
                 if parsed.success and isinstance(parsed.data, dict):
+                    await resp.commit_cache()
                     return ClassifyResult(
                         page_type=parsed.data.get("page_type", "B"),
                         layout_type=parsed.data.get("layout_type", "freeform"),
@@ -0,0 +1,157 @@
+"""
+多页批量 SKU 提取。对齐: Pipeline 详设 §5.2 Phase 6
+
+对文字少、无表格、图片少的简单页 (按 FeatureVector 判定), 将连续 N 页的截图
+打包为一次 VLM 请求, 输出按页号标注, 解析回每页的 SKUResult 列表。
+解析失败或缺页时该页回退到逐页两阶段/单阶段提取。
+
+计量: pdf_extract_{llm_calls,pages,tokens,skus}_total{mode=batch|page},
+calls/page = llm_calls / pages, tokens/SKU = tokens / skus。
+"""
+from __future__ import annotations
+from prometheus_client import Counter
+
+from pdf_sku.pipeline.ir import FeatureVector, ParsedPageIR, SKUResult
+from pdf_sku.pipeline.extractor.single_stage import SingleStageExtractor
+from pdf_sku.llm_adapter.parser.response_parser import ResponseParser
+from pdf_sku.llm_adapter.usage import LLMUsage, track_llm_usage
+import structlog
+
+logger = structlog.get_logger()
+_parser = ResponseParser()
+
+MODE_BATCH = "batch"
+MODE_PAGE = "page"
+BATCH_METHOD = "batch_single_stage"
+
+# 简单页判定阈值
+SIMPLE_MAX_TEXT_BLOCKS = 15
+SIMPLE_MAX_IMAGES = 2
+SIMPLE_MAX_TEXT_CHARS = 1500
+PAGE_TEXT_LIMIT = 800
+
+EXTRACT_LLM_CALLS = Counter(
+    "pdf_extract_llm_calls_total", "LLM calls spent on SKU extraction", ["mode"])
+EXTRACT_PAGES = Counter(
+    "pdf_extract_pages_total", "Pages covered by SKU extraction", ["mode"])
+EXTRACT_TOKENS = Counter(
+    "pdf_extract_tokens_total", "LLM tokens spent on SKU extraction", ["mode"])
+EXTRACT_SKUS = Counter(
+    "pdf_extract_skus_total", "SKUs produced by SKU extraction", ["mode"])
+
+BATCH_PROMPT = """You are given {n} PDF catalog pages as {n} images, in this order: {tags}.
+Extract ALL products and their SKU variants from EACH page separately.
+
+IMPORTANT rules for variant splitting:
+- ONLY split into multiple SKUs when the text explicitly lists multiple sizes/dimensions (e.g. "规格-1500/1800/2000mm" → 3 SKUs).
+- Material and color lines describe the ENTIRE product series, NOT individual variants. Put them in "common_attrs".
+- Do NOT create separate SKUs for different colors or materials.
+- Never mix products between pages. A page with no products gets an empty "products" list.
+
+For each product extract: product_name, model_number, price, material, color, size, weight, description.
+
+Page text content for reference:
+{page_texts}
+
+Respond with ONLY a JSON array, one entry per page:
+[{{
+  "page": 12,
+  "products": [{{
+    "product_name": "858B# Sofa",
+    "model_number": "858B",
+    "common_attrs": {{"material": "imported oak"}},
+    "skus": [{{"variant_label": "single seat", "size": "850*900*950mm"}}]
+  }}]
+}}]"""
+
+
+def is_simple_page(features: FeatureVector, raw: ParsedPageIR) -> bool:
+    """单产品/稀疏页: 无表格, 少量图片和文字块。"""
+    return (
+        features.table_count == 0
+        and 1 <= features.image_count <= SIMPLE_MAX_IMAGES
+        and 1 <= features.text_block_count <= SIMPLE_MAX_TEXT_BLOCKS
+        and len(raw.raw_text or "") <= SIMPLE_MAX_TEXT_CHARS
+    )
+
+
+def record_extract_usage(mode: str, pages: int, usage: LLMUsage, sku_count: int) -> None:
+    EXTRACT_LLM_CALLS.labels(mode=mode).inc(usage.calls)
+    EXTRACT_PAGES.labels(mode=mode).inc(pages)
+    EXTRACT_TOKENS.labels(mode=mode).inc(usage.total_tokens)
+    EXTRACT_SKUS.labels(mode=mode).inc(sku_count)
+
+
+class BatchExtractor:
+    def __init__(self, llm_service=None):
+        self._llm = llm_service
+
+    async def extract_pages(
+        self,
+        pages: list[tuple[ParsedPageIR, bytes]],
+    ) -> dict[int, list[SKUResult]]:
+        """
+        一次 VLM 调用提取多页 SKU。
+
+        Returns:
+            {page_no: skus}, 仅包含输出中成功解析的页; 调用/解析失败返回 {}
+        """
+        if not self._llm or len(pages) < 2:
+            return {}
+
+        page_nos = [raw.page_no for raw, _ in pages]
+        prompt = BATCH_PROMPT.format(
+            n=len(pages),
+            tags=", ".join(f"page {p}" for p in page_nos),
+            page_texts="\n".join(
+                f"[page {raw.page_no}]\n{(raw.raw_text or '')[:PAGE_TEXT_LIMIT]}"
+                for raw, _ in pages),
+        )
+
+        with track_llm_usage() as usage:
+            try:
+                resp = await self._llm.call_llm(
+                    operation="extract_sku_batch",
+                    prompt=prompt,
+                    images=[shot for _, shot in pages if shot] or None,
+                )
+            except Exception as e:
+                logger.warning("batch_extract_failed", pages=page_nos, error=str(e))
+                return {}
+
+        results = self._parse(resp.text, set(page_nos))
+        sku_count = sum(len(v) for v in results.values())
+        record_extract_usage(MODE_BATCH, len(results), usage, sku_count)
+        logger.info("batch_extract_done",
+                    pages=page_nos,
+                    parsed_pages=sorted(results),
+                    skus=sku_count,
+                    llm_calls=usage.calls,
+                    tokens=usage.total_tokens)
+        return results
+
+    @staticmethod
+    def _parse(text: str, expected: set[int]) -> dict[int, list[SKUResult]]:
+        parsed = _parser.parse(text, expected_type="array")
+        if not parsed.success or not isinstance(parsed.data, list):
+            return {}
+
+        results: dict[int, list[SKUResult]] = {}
+        for entry in parsed.data:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                page_no = int(entry.get("page"))
+            except (TypeError, ValueError):
+                continue
+            products = entry.get("products")
+            if page_no not in expected or page_no in results or not isinstance(products, list):
+                continue
+            skus: list[SKUResult] = []
+            for p_idx, item in enumerate(products):
+                if isinstance(item, dict):
+                    skus.extend(SingleStageExtractor._parse_product_item(item, p_idx))
+            for sku in skus:
+                sku.extraction_method = BATCH_METHOD
+            results[page_no] = skus
+        return results
@@ -63,6 +63,7 @@ class SingleStageExtractor:
             )
             parsed = _parser.parse(resp.text, expected_type="array")
             if parsed.success and isinstance(parsed.data, list):
+                await resp.commit_cache()
                 results = []
                 for p_idx, item in enumerate(parsed.data):
                     if not isinstance(item, dict):
@@ -102,6 +102,7 @@ class TwoStageExtractor:
             )
             parsed = _parser.parse(resp.text, expected_type="array")
             if parsed.success and isinstance(parsed.data, list):
+                await resp.commit_cache()
                 boundaries = []
                 for item in parsed.data:
                     bbox = item.get("bbox", [0, 0, 0, 0])
@@ -151,6 +152,7 @@ class TwoStageExtractor:
             )
             parsed = _parser.parse(resp.text, expected_type="array")
             if parsed.success and isinstance(parsed.data, list):
+                await resp.commit_cache()
                 results = []
                 for item in parsed.data:
                     bid = item.get("boundary_id", 0)
@@ -31,12 +31,27 @@ class TableData:
     is_continuation: bool = False
 
 
+@dataclass(frozen=True)
+class ImagePayloadRef:
+    """图片字节的外部句柄: spill 文件内的 (offset, length) 区间。"""
+    path: str
+    offset: int
+    length: int
+
+    def read(self) -> bytes:
+        import mmap
+        with open(self.path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return m[self.offset:self.offset + self.length]
+
+
 @dataclass
 class ImageInfo:
     """图片信息。"""
     image_id: str = ""
     bbox: tuple[float, float, float, float] = (0, 0, 0, 0)
     data: bytes = b""
+    data_ref: ImagePayloadRef | None = None  # data 外置时的延迟加载句柄
     width: int = 0
     height: int = 0
     short_edge: int = 0
@@ -47,6 +62,16 @@ class ImageInfo:
     quality_warning: str = ""
     search_eligible: bool = False
 
+    def has_data(self) -> bool:
+        return bool(self.data) or self.data_ref is not None
+
+    def load_data(self) -> bytes:
+        """返回图片字节, 外置时按需从 spill 文件读取。"""
+        if not self.data and self.data_ref is not None:
+            self.data = self.data_ref.read()
+            self.data_ref = None
+        return self.data
+
 
 @dataclass
 class PageMetadata:
@@ -184,10 +184,10 @@ def split_composite_image(
         return images
 
     # 需要图片数据来跑检测
-    if not big_img.data:
+    if not big_img.has_data():
         return images
 
-    figures = detect_figures_on_image(big_img.data)
+    figures = detect_figures_on_image(big_img.load_data())
     if len(figures) < 2:
         return images
 
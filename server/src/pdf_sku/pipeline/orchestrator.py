@@ -4,14 +4,17 @@ Orchestrator — Job 级处理编排。对齐: Pipeline 详设 §5.1
 职责:
 - 接收 EvaluationCompleted → 启动 Pipeline
 - ≤100 页串行, >100 页分片并行 (Semaphore 3)
-- 每页完成 → 增量持久化 + 事件发布
+- 分阶段流水线: 解析/渲染预取 → 有界队列 → LLM 阶段消费
+- LLM 阶段页面经全局调度器 (PageScheduler) 跨 Job 公平占用并发预算
+- 批量提取模式: 预取窗口内连续的简单页合并为一次 VLM 提取请求
+- resume 模式: 按页面状态 + 已落库 SKU 续跑，跳过已完成页
+- 每页完成 → 增量持久化 (批量 INSERT) + 事件发布
 - [C2] 终态以 import_status 为准 (INV-04)
 - [C4] gather 异常不吞
 - [C5] 导入成功后才保存 Checkpoint
 """
 from __future__ import annotations
 import asyncio
-import json
 import os
 from pathlib import Path
 from uuid import UUID
@@ -19,17 +22,43 @@ from uuid import UUID
 from sqlalchemy import select, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from pdf_sku.common.config_snapshot import config_snapshot
 from pdf_sku.common.models import PDFJob, Page
 from pdf_sku.common.enums import JobInternalStatus, PageStatus
 from pdf_sku.gateway.event_bus import event_bus
 from pdf_sku.gateway.user_status import update_job_status, refresh_job_page_stats
 from pdf_sku.pipeline.ir import PageResult
-from pdf_sku.pipeline.page_processor import PageProcessor
+from pdf_sku.pipeline.page_processor import PageProcessor, PreparedPage
+from pdf_sku.pipeline.persistence import persist_page
+from pdf_sku.pipeline.checkpoint import build_resume_plan, reset_pages
+from pdf_sku.pipeline.parser.doc_cache import request_eviction
+from pdf_sku.pipeline.parser.image_spill import discard_job_spills, discard_page_spill
+from pdf_sku.pipeline.scheduler import (
+    PageScheduler, PRIORITY_PAGE, PRIORITY_REPROCESS, PRIORITY_UPLOAD, page_scheduler,
+)
+from pdf_sku.llm_adapter.response_cache import bypass_llm_cache
 import structlog
+from prometheus_client import Gauge
 
 logger = structlog.get_logger()
 
 PIPELINE_CONCURRENCY_FALLBACK = int(os.environ.get("PIPELINE_CONCURRENCY", "5"))
+# 解析/渲染阶段并发 (通常与进程池 worker 数一致)
+PIPELINE_PARSE_CONCURRENCY = int(os.environ.get("PIPELINE_PARSE_CONCURRENCY", "2"))
+# 预取窗口: 已解析待 LLM 消费的页数上限
+PIPELINE_PREFETCH_WINDOW = int(os.environ.get("PIPELINE_PREFETCH_WINDOW", "4"))
+# 多页批量提取: 每次 VLM 请求最多打包的简单页数 (≤1 关闭)
+PIPELINE_BATCH_EXTRACT_SIZE = int(os.environ.get("PIPELINE_BATCH_EXTRACT_SIZE", "1"))
+
+STAGE_PARSE = "parse"
+STAGE_LLM = "llm"
+
+STAGE_QUEUE_DEPTH = Gauge(
+    "pdf_pipeline_stage_queue_depth",
+    "Pages waiting to enter a pipeline stage", ["stage"])
+STAGE_INFLIGHT = Gauge(
+    "pdf_pipeline_stage_inflight",
+    "Pages currently in a pipeline stage", ["stage"])
 
 # Redis key for pipeline concurrency rules
 CONCURRENCY_RULES_KEY = "pdf_sku:pipeline_concurrency_rules"
@@ -52,9 +81,7 @@ async def get_concurrency_for_pages(total_pages: int, redis=None, provider_name:
     rules = DEFAULT_CONCURRENCY_RULES
     if redis:
         try:
-            raw = await redis.get(CONCURRENCY_RULES_KEY)
-            if raw:
-                rules = json.loads(raw)
+            rules = await config_snapshot.get(redis, CONCURRENCY_RULES_KEY) or rules
         except Exception:
             logger.warning("concurrency_rules_read_failed, using defaults")
 
@@ -86,11 +113,13 @@ class Orchestrator:
         page_processor: PageProcessor,
         db_session_factory=None,
         redis=None,
+        scheduler: PageScheduler | None = None,
         **_kwargs,
     ) -> None:
         self._pp = page_processor
         self._db_factory = db_session_factory
         self._redis = redis
+        self._scheduler = scheduler or page_scheduler
 
     async def process_job(
         self,
@@ -104,12 +133,14 @@ class Orchestrator:
         Args:
             db: 数据库会话（仅用于初始状态更新）
             job: PDFJob ORM
-            evaluation: 评估结果 dict (route, prescan, ...)
+            evaluation: 评估结果 dict (route, prescan, priority, resume, ...)
         """
         job_id = str(job.job_id)
         job_uuid = job.job_id
         file_path = self._resolve_file_path(job)
-        blank_pages = evaluation.get("prescan", {}).get("blank_pages", [])
+        blank_pages = evaluation.get("prescan", {}).get("blank_pages")
+        if blank_pages is None:
+            blank_pages = list(job.blank_pages or [])
 
         logger.info("pipeline_start",
                      job_id=job_id,
@@ -135,13 +166,31 @@ class Orchestrator:
                     await final_db.commit()
                 return
 
-            await self._process_parallel(job, non_blank, file_path)
+            if evaluation.get("resume"):
+                non_blank = await self._plan_resume(db, job, blank_pages)
+
+            if non_blank:
+                fingerprints = dict((await db.execute(
+                    select(Page.page_number, Page.fingerprint).where(
+                        Page.job_id == job_uuid, Page.attempt_no == 1,
+                        Page.fingerprint.is_not(None))
+                )).all())
+                await self._process_parallel(
+                    job, non_blank, file_path,
+                    priority=evaluation.get("priority", PRIORITY_UPLOAD),
+                    fingerprints=fingerprints)
 
             # 终态判定 — 用新 session
             async with self._db_factory() as final_db:
                 result = await final_db.execute(
                     select(PDFJob).where(PDFJob.job_id == job_uuid))
                 fresh_job = result.scalar_one()
+                cache_stats = self._pp.page_cache_stats(job_id)
+                if cache_stats:
+                    trace = dict(fresh_job.processing_trace or {})
+                    trace["page_cache"] = cache_stats
+                    fresh_job.processing_trace = trace
+                    logger.info("pipeline_page_cache", job_id=job_id, **cache_stats)
                 await self._finalize_job(final_db, fresh_job)
                 await final_db.commit()
 
@@ -154,38 +203,226 @@ class Orchestrator:
                 await err_db.commit()
 
         self._pp.clear_job_cache(job_id)
+        logger.info("pipeline_queue_wait", job_id=job_id,
+                    **self._scheduler.forget_job(job_id))
+        # 通知进程池 worker 关闭该 Job 的文档句柄
+        request_eviction(file_path)
+        discard_job_spills(job_id)
+
+    async def _plan_resume(
+        self,
+        db: AsyncSession,
+        job: PDFJob,
+        blank_pages: list[int],
+    ) -> list[int]:
+        """断点续跑: 返回待处理页，并记录跳过页节省的 LLM 调用数。"""
+        plan = await build_resume_plan(db, job, blank_pages)
+        await reset_pages(db, job.job_id, plan.pending_pages)
+        trace = dict(job.processing_trace or {})
+        trace.setdefault("resumes", []).append(plan.to_dict())
+        job.processing_trace = trace
+        await db.commit()
+        logger.info("pipeline_resume", job_id=str(job.job_id), **plan.to_dict())
+        return plan.pending_pages
 
     async def _process_parallel(
         self,
         job: PDFJob,
         pages: list[int],
         file_path: str,
+        priority: str = PRIORITY_UPLOAD,
+        fingerprints: dict[int, str] | None = None,
     ) -> None:
-        """并行处理所有页面（Semaphore 控制并发，根据页数动态调整）。"""
+        """
+        分阶段并行处理所有页面。
+
+        解析/渲染 (进程池) 作为生产者，最多领先 LLM 阶段 prefetch_window 页;
+        LLM 阶段消费者数量由并发规则决定 (根据页数动态调整, 作为单 Job 上限),
+        每页还需从全局调度器获得槽位，跨 Job 按商户/Job 加权公平分配。
+        两阶段各自限流，LLM 调用期间进程池保持饱和。
+        Job 全量重处理 (PRIORITY_REPROCESS) 不读页级结果缓存与 LLM 响应缓存 (结果仍回写)。
+        """
+        job_id = str(job.job_id)
+        fingerprints = fingerprints or {}
+        bypass_cache = priority == PRIORITY_REPROCESS
         concurrency = await get_concurrency_for_pages(len(pages), self._redis)
+        parse_concurrency = max(1, PIPELINE_PARSE_CONCURRENCY)
+        window = max(1, PIPELINE_PREFETCH_WINDOW)
+        batch_size = min(PIPELINE_BATCH_EXTRACT_SIZE, window)
         logger.info("pipeline_concurrency",
-                     job_id=str(job.job_id),
+                     job_id=job_id,
                      total_pages=len(pages),
-                     concurrency=concurrency)
-        semaphore = asyncio.Semaphore(concurrency)
-
-        async def process_one(page_no: int):
-            async with semaphore:
-                async with self._db_factory() as page_db:
-                    result = await self._process_single_page(
-                        page_db, job, page_no, file_path)
-                    await self._on_page_done(page_db, job, page_no, result)
-                    await page_db.commit()
-
-        results = await asyncio.gather(
-            *[process_one(p) for p in pages],
-            return_exceptions=True,
-        )
+                     concurrency=concurrency,
+                     parse_concurrency=parse_concurrency,
+                     prefetch_window=window,
+                     batch_extract_size=batch_size)
+
+        ready: asyncio.Queue[tuple[int, PreparedPage | None] | None] = (
+            asyncio.Queue(maxsize=window))
+        parse_sem = asyncio.Semaphore(parse_concurrency)
+        window_sem = asyncio.Semaphore(window)
+        parse_queue = STAGE_QUEUE_DEPTH.labels(stage=STAGE_PARSE)
+        llm_queue = STAGE_QUEUE_DEPTH.labels(stage=STAGE_LLM)
+        parse_inflight = STAGE_INFLIGHT.labels(stage=STAGE_PARSE)
+        llm_inflight = STAGE_INFLIGHT.labels(stage=STAGE_LLM)
+
+        async def prepare_one(page_no: int) -> None:
+            # 预取窗口槽位: 解析前占用, 消费者取走该页时归还,
+            # 解析中 + 已就绪未消费的页合计不超过 window
+            await window_sem.acquire()
+            started = False
+            try:
+                async with parse_sem:
+                    started = True
+                    parse_queue.dec()
+                    parse_inflight.inc()
+                    try:
+                        prepared = await self._prepare_single_page(
+                            job, page_no, file_path, fingerprints.get(page_no, ""),
+                            bypass_cache)
+                    finally:
+                        parse_inflight.dec()
+            except BaseException:
+                window_sem.release()
+                raise
+            finally:
+                if not started:
+                    parse_queue.dec()
+            await ready.put((page_no, prepared))
+            llm_queue.inc()
+
+        async def produce() -> None:
+            parse_queue.inc(len(pages))
+            try:
+                await asyncio.gather(*[prepare_one(p) for p in pages])
+            finally:
+                for _ in range(concurrency):
+                    await ready.put(None)
+
+        def take_ready(limit: int) -> list[tuple[int, PreparedPage | None]]:
+            """非阻塞取出已就绪页 (遇到结束哨兵则放回)。"""
+            taken: list[tuple[int, PreparedPage | None]] = []
+            while len(taken) < limit:
+                try:
+                    nxt = ready.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if nxt is None:
+                    ready.put_nowait(None)
+                    break
+                llm_queue.dec()
+                window_sem.release()
+                taken.append(nxt)
+            return taken
+
+        async def consume() -> None:
+            while True:
+                item = await ready.get()
+                if item is None:
+                    return
+                llm_queue.dec()
+                window_sem.release()
+                items = [item]
+                if batch_size > 1 and self._pp.batchable(item[1]):
+                    items += take_ready(batch_size - 1)
+                    await self._extract_batches(job, items, priority)
+                for page_no, prepared in items:
+                    try:
+                        async with self._scheduler.slot(
+                                job_id, job.merchant_id or "", priority):
+                            llm_inflight.inc()
+                            try:
+                                await self._run_page(
+                                    job, page_no, file_path, prepared,
+                                    fingerprints.get(page_no, ""), bypass_cache)
+                            finally:
+                                llm_inflight.dec()
+                    except Exception as e:
+                        logger.error("page_parallel_failed",
+                                     page_no=page_no, error=str(e))
+
+        if bypass_cache:
+            with bypass_llm_cache():
+                await asyncio.gather(produce(), *[consume() for _ in range(concurrency)])
+        else:
+            await asyncio.gather(produce(), *[consume() for _ in range(concurrency)])
 
-        for i, r in enumerate(results):
-            if isinstance(r, Exception):
-                logger.error("page_parallel_failed",
-                             page_no=pages[i], error=str(r))
+    async def _extract_batches(
+        self,
+        job: PDFJob,
+        items: list[tuple[int, PreparedPage | None]],
+        priority: str,
+    ) -> None:
+        """连续简单页按页号分组, 每组一次批量 VLM 提取 (占用一个调度槽位)。"""
+        simple = sorted(
+            ((p, prepared) for p, prepared in items if self._pp.batchable(prepared)),
+            key=lambda x: x[0])
+        runs: list[list[PreparedPage]] = []
+        last = None
+        for page_no, prepared in simple:
+            if last is not None and page_no == last + 1:
+                runs[-1].append(prepared)
+            else:
+                runs.append([prepared])
+            last = page_no
+
+        for run in runs:
+            if len(run) < 2:
+                continue
+            try:
+                async with self._scheduler.slot(
+                        str(job.job_id), job.merchant_id or "", priority):
+                    await self._pp.extract_batch(run)
+            except Exception as e:
+                logger.warning("batch_extract_error",
+                               job_id=str(job.job_id),
+                               pages=[p.raw.page_no for p in run], error=str(e))
+
+    async def reprocess_page(self, job: PDFJob, page_no: int) -> PageResult:
+        """单页重处理 (同步请求): 以最高优先级占用全局槽位。"""
+        file_path = self._resolve_file_path(job)
+        async with self._scheduler.slot(
+                str(job.job_id), job.merchant_id or "", PRIORITY_PAGE):
+            return await self._run_page(job, page_no, file_path)
+
+    async def _run_page(
+        self,
+        job: PDFJob,
+        page_no: int,
+        file_path: str,
+        prepared: PreparedPage | None = None,
+        fingerprint: str = "",
+        bypass_cache: bool = False,
+    ) -> PageResult:
+        """LLM 阶段: 单页处理 + 落库 (独立 session)。"""
+        async with self._db_factory() as page_db:
+            result = await self._process_single_page(
+                page_db, job, page_no, file_path,
+                prepared=prepared, fingerprint=fingerprint, bypass_cache=bypass_cache)
+            await self._on_page_done(page_db, job, page_no, result)
+            await page_db.commit()
+        return result
+
+    async def _prepare_single_page(
+        self,
+        job: PDFJob,
+        page_no: int,
+        file_path: str,
+        fingerprint: str = "",
+        bypass_cache: bool = False,
+    ) -> PreparedPage | None:
+        """预取阶段: 解析 + 渲染 (页级缓存命中则跳过)。失败返回 None，由 LLM 阶段就地重试解析。"""
+        try:
+            return await self._pp.prepare_page(
+                str(job.job_id), file_path, page_no,
+                page_fingerprint=fingerprint,
+                file_hash=job.file_hash or "",
+                frozen_config_version=job.frozen_config_version,
+                bypass_cache=bypass_cache)
+        except Exception as e:
+            logger.warning("page_prepare_failed",
+                           job_id=str(job.job_id), page_no=page_no, error=str(e))
+            return None
 
     async def _process_single_page(
         self,
@@ -193,6 +430,9 @@ class Orchestrator:
         job: PDFJob,
         page_no: int,
         file_path: str,
+        prepared: PreparedPage | None = None,
+        fingerprint: str = "",
+        bypass_cache: bool = False,
     ) -> PageResult:
         """单页处理 + 异常降级。"""
         try:
@@ -209,6 +449,9 @@ class Orchestrator:
                 file_hash=job.file_hash or "",
                 category=job.category,
                 frozen_config_version=job.frozen_config_version,
+                prepared=prepared,
+                page_fingerprint=fingerprint,
+                bypass_cache=bypass_cache,
             )
             return result
 
@@ -258,8 +501,11 @@ class Orchestrator:
         )
 
         # 持久化 SKU + Image + Binding
-        if result.skus:
-            await self._persist_skus(db, job.job_id, page_no, result)
+        try:
+            if result.skus:
+                await self._persist_skus(db, job.job_id, page_no, result)
+        finally:
+            discard_page_spill(str(job.job_id), page_no)
 
         # 发布事件
         await event_bus.publish("PageCompleted", {
@@ -277,66 +523,8 @@ class Orchestrator:
         page_no: int,
         result: PageResult,
     ) -> None:
-        """持久化 SKU/Image/Binding 到 DB。"""
-        from pdf_sku.common.models import SKU, Image, SKUImageBinding
-
-        job_dir = Path(os.environ.get("JOB_DATA_DIR", "/data/jobs")) / str(job_id)
-        img_dir = job_dir / "images"
-        img_dir.mkdir(parents=True, exist_ok=True)
-
-        for idx, sku in enumerate(result.skus, start=1):
-            if sku.validity == "valid":
-                bbox = [int(v) for v in sku.source_bbox] if sku.source_bbox else None
-                db.add(SKU(
-                    sku_id=sku.sku_id or f"SKU-{page_no}-{idx}",
-                    job_id=job_id,
-                    page_number=page_no,
-                    attributes=sku.attributes,
-                    validity=sku.validity,
-                    source_bbox=bbox,
-                    attribute_source="AI_EXTRACTED",
-                    status="EXTRACTED",
-                    product_id=sku.product_id or None,
-                    variant_label=sku.variant_label or None,
-                ))
-
-        for idx, img in enumerate(result.images, start=1):
-            if img.search_eligible:
-                image_id = img.image_id or f"{str(job_id)[:8]}-{page_no}-{idx}"
-                file_rel = f"images/{image_id}.jpg"
-                file_abs = job_dir / file_rel
-                if img.data:
-                    file_abs.write_bytes(img.data)
-
-                bbox = [int(v) for v in img.bbox] if img.bbox else None
-                resolution = [int(img.width), int(img.height)] if img.width and img.height else None
-                db.add(Image(
-                    image_id=image_id,
-                    job_id=job_id,
-                    page_number=page_no,
-                    role=img.role or "unknown",
-                    bbox=bbox,
-                    extracted_path=file_rel,
-                    format="jpg",
-                    resolution=resolution,
-                    short_edge=img.short_edge,
-                    image_hash=img.image_hash,
-                    is_duplicate=img.is_duplicate,
-                    search_eligible=img.search_eligible,
-                    is_fragmented=img.is_fragmented,
-                ))
-
-        for binding in result.bindings:
-            if binding.image_id:
-                db.add(SKUImageBinding(
-                    sku_id=binding.sku_id,
-                    image_id=binding.image_id,
-                    job_id=job_id,
-                    binding_method=binding.method,
-                    binding_confidence=binding.confidence,
-                    is_ambiguous=binding.is_ambiguous,
-                    rank=binding.rank,
-                ))
+        """持久化 SKU/Image/Binding 到 DB (批量 INSERT, 见 pipeline.persistence)。"""
+        await persist_page(db, job_id, page_no, result)
 
     async def _finalize_job(
         self,
@@ -0,0 +1,190 @@
+"""
+页级结果缓存 (内容寻址)。对齐: Pipeline 详设 §5.2
+
+缓存键: page_cache:{page_fingerprint}:{frozen_config_version}:{model}
+- page_fingerprint 由 Prescanner 计算 (内容流 + 图片 xref 原始流摘要)
+- 值: 序列化的 PageResult (SKU / 绑定 / 图片元数据 + 已落盘图片文件路径)
+
+命中后按新 Job 的 file_hash 前缀与页号重写 SKU / product / image ID,
+图片字节通过 ImagePayloadRef 指向源 Job 的图片文件, 由 _persist_skus 按需读取。
+源图片文件已删除 (Job 被删) 视为未命中。
+"""
+from __future__ import annotations
+import dataclasses
+import os
+from pathlib import Path
+
+import orjson
+import structlog
+from prometheus_client import Counter
+
+from pdf_sku.pipeline.ir import (
+    BindingCandidate, BindingResult, ImageInfo, ImagePayloadRef, PageResult,
+    SKUResult, ValidationIssue, ValidationResult,
+)
+
+logger = structlog.get_logger()
+
+CACHE_TTL = 86400 * 30  # 30 天
+CACHEABLE_STATUSES = ("AI_COMPLETED", "SKIPPED")
+
+PAGE_CACHE_LOOKUPS = Counter(
+    "pdf_page_cache_lookups_total", "Page result cache lookups", ["result"])
+
+
+def sku_id_prefix(file_hash: str, page_no: int) -> str:
+    """与 SKUIdGenerator.assign_ids 一致的 ID 前缀。"""
+    return f"{(file_hash or 'unknown')[:8]}_{page_no:03d}_"
+
+
+def image_file_path(job_id: str, image_id: str) -> Path:
+    """与 Orchestrator._persist_skus 一致的图片落盘路径。"""
+    job_dir = Path(os.environ.get("JOB_DATA_DIR", "/data/jobs")) / str(job_id)
+    return job_dir / "images" / f"{image_id}.jpg"
+
+
+def _swap(value: str | None, old: str, new: str) -> str | None:
+    if value and value.startswith(old):
+        return new + value[len(old):]
+    return value
+
+
+def serialize_result(result: PageResult, job_id: str, page_no: int, id_prefix: str) -> dict:
+    images = []
+    for img in result.images:
+        d = {f.name: getattr(img, f.name) for f in dataclasses.fields(img)
+             if f.name not in ("data", "data_ref")}
+        # 仅有 SKU 的页会落盘 search_eligible 图片
+        if img.search_eligible and result.skus:
+            d["source_path"] = str(image_file_path(job_id, img.image_id))
+        images.append(d)
+    return {
+        "page_no": page_no,
+        "id_prefix": id_prefix,
+        "status": result.status,
+        "page_type": result.page_type,
+        "needs_review": result.needs_review,
+        "skus": [dataclasses.asdict(s) for s in result.skus],
+        "images": images,
+        "bindings": [dataclasses.asdict(b) for b in result.bindings],
+        "validation": dataclasses.asdict(result.validation) if result.validation else None,
+        "classification_confidence": result.classification_confidence,
+        "extraction_method": result.extraction_method,
+        "llm_model_used": result.llm_model_used,
+        "page_confidence": result.page_confidence,
+        "fallback_reason": result.fallback_reason,
+    }
+
+
+def restore_result(entry: dict, page_no: int, id_prefix: str) -> PageResult | None:
+    """反序列化并重写 ID; 源图片文件缺失返回 None。"""
+    old_sku, new_sku = entry["id_prefix"], id_prefix
+    old_img, new_img = f"p{entry['page_no']}_", f"p{page_no}_"
+
+    images = []
+    for d in entry["images"]:
+        d = dict(d)
+        source = d.pop("source_path", None)
+        img = ImageInfo(**{**d, "bbox": tuple(d["bbox"])})
+        img.image_id = _swap(img.image_id, old_img, new_img)
+        if source:
+            try:
+                size = os.path.getsize(source)
+            except OSError:
+                return None
+            img.data_ref = ImagePayloadRef(path=source, offset=0, length=size)
+        images.append(img)
+
+    skus = []
+    for d in entry["skus"]:
+        sku = SKUResult(**{**d, "source_bbox": tuple(d["source_bbox"])})
+        sku.sku_id = _swap(sku.sku_id, old_sku, new_sku)
+        sku.product_id = _swap(sku.product_id, old_sku, new_sku)
+        skus.append(sku)
+
+    bindings = []
+    for d in entry["bindings"]:
+        b = BindingResult(**{**d, "candidates": [
+            BindingCandidate(**{**c, "image_id": _swap(c["image_id"], old_img, new_img)})
+            for c in d.get("candidates", [])]})
+        b.sku_id = _swap(b.sku_id, old_sku, new_sku)
+        b.image_id = _swap(b.image_id, old_img, new_img)
+        bindings.append(b)
+
+    validation = None
+    if entry.get("validation"):
+        v = entry["validation"]
+        validation = ValidationResult(
+            issues=[ValidationIssue(**i) for i in v.get("issues", [])],
+            has_errors=v.get("has_errors", False),
+            has_warnings=v.get("has_warnings", False),
+        )
+
+    return PageResult(
+        status=entry["status"],
+        page_type=entry.get("page_type"),
+        needs_review=entry.get("needs_review", False),
+        skus=skus,
+        images=images,
+        bindings=bindings,
+        validation=validation,
+        classification_confidence=entry.get("classification_confidence", 0.0),
+        extraction_method=entry.get("extraction_method"),
+        llm_model_used=entry.get("llm_model_used"),
+        page_confidence=entry.get("page_confidence", 0.0),
+        fallback_reason="page_cache_hit",
+    )
+
+
+class PageResultCache:
+    """Redis 页级结果缓存 + 按 Job 命中统计。"""
+
+    def __init__(self, redis, ttl: int = CACHE_TTL) -> None:
+        self._redis = redis
+        self._ttl = ttl
+        self._job_stats: dict[str, dict[str, int]] = {}
+
+    @staticmethod
+    def key(fingerprint: str, config_version: str | None, model: str) -> str:
+        return f"page_cache:{fingerprint}:{config_version or 'default'}:{model}"
+
+    async def get(
+        self, job_id: str, fingerprint: str, config_version: str | None,
+        model: str, page_no: int, id_prefix: str,
+    ) -> PageResult | None:
+        result = None
+        try:
+            raw = await self._redis.get(self.key(fingerprint, config_version, model))
+            if raw:
+                result = restore_result(orjson.loads(raw), page_no, id_prefix)
+        except Exception as e:
+            logger.warning("page_cache_read_failed", error=str(e))
+        self._record(job_id, result is not None)
+        return result
+
+    async def put(
+        self, job_id: str, fingerprint: str, config_version: str | None,
+        model: str, page_no: int, id_prefix: str, result: PageResult,
+    ) -> None:
+        if result.status not in CACHEABLE_STATUSES:
+            return
+        try:
+            entry = serialize_result(result, job_id, page_no, id_prefix)
+            await self._redis.set(
+                self.key(fingerprint, config_version, model),
+                orjson.dumps(entry), ex=self._ttl)
+        except Exception as e:
+            logger.warning("page_cache_write_failed", error=str(e))
+
+    def _record(self, job_id: str, hit: bool) -> None:
+        PAGE_CACHE_LOOKUPS.labels(result="hit" if hit else "miss").inc()
+        st = self._job_stats.setdefault(job_id, {"hits": 0, "misses": 0})
+        st["hits" if hit else "misses"] += 1
+
+    def job_stats(self, job_id: str) -> dict:
+        st = self._job_stats.get(job_id, {"hits": 0, "misses": 0})
+        total = st["hits"] + st["misses"]
+        return {**st, "hit_rate": round(st["hits"] / total, 4) if total else 0.0}
+
+    def clear_job(self, job_id: str) -> None:
+        self._job_stats.pop(job_id, None)
@@ -16,45 +16,90 @@ import asyncio
 import math
 import hashlib
 from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 
 from pdf_sku.pipeline.ir import (
     ParsedPageIR, FeatureVector, ClassifyResult, PageResult,
     SKUResult, ImageInfo, BindingResult, ValidationResult,
 )
 from pdf_sku.pipeline.parser.adapter import PDFExtractor
+from pdf_sku.pipeline.parser.doc_cache import get_doc_cache
+from pdf_sku.pipeline.parser.raster import (
+    RASTER_PNG, RASTER_SHM, SharedRaster, export_pixmap,
+)
+from pdf_sku.pipeline.parser.image_spill import (
+    TRANSPORT_SPILL, spill_images, spill_path,
+)
+from pdf_sku.settings import settings
 from pdf_sku.pipeline.parser.feature_extractor import FeatureExtractor
 from pdf_sku.pipeline.classifier.page_classifier import PageClassifier
 from pdf_sku.pipeline.extractor.two_stage import TwoStageExtractor
 from pdf_sku.pipeline.extractor.single_stage import SingleStageExtractor
+from pdf_sku.pipeline.extractor.batch_extractor import (
+    BATCH_METHOD, MODE_PAGE, BatchExtractor, is_simple_page, record_extract_usage,
+)
 from pdf_sku.pipeline.extractor.consistency_validator import ConsistencyValidator
 from pdf_sku.pipeline.binder.binder import SKUImageBinder
 from pdf_sku.pipeline.exporter.exporter import SKUIdGenerator, SKUExporter
 from pdf_sku.pipeline.cross_page_merger import CrossPageMerger
+from pdf_sku.pipeline.page_cache import PageResultCache, sku_id_prefix
+from pdf_sku.pipeline.raster_store import get_raster_store
+from pdf_sku.pipeline.bbox_index import (
+    adjacent_pairs, connected_components, overlap_pairs,
+)
+from pdf_sku.llm_adapter.response_cache import bypass_llm_cache
+from pdf_sku.llm_adapter.usage import track_llm_usage
 import structlog
 
 logger = structlog.get_logger()
 
 MAX_LLM_CALLS_PER_PAGE = 6  # [C13]
-
-
-def _extract_page_sync(file_path: str, page_no: int) -> ParsedPageIR:
-    """在进程池中执行 PDF 解析。"""
-    extractor = PDFExtractor()
-    return extractor.extract(file_path, page_no)
-
-
-def _render_page_sync(file_path: str, page_no: int, dpi: int = 150) -> bytes:
-    """在进程池中渲染截图。"""
+IMAGE_OFFLOAD_THRESHOLD = 64  # 图片数达到此值时 Phase 2a/2b 在线程中执行
+
+
+def _extract_and_render_sync(
+    file_path: str,
+    page_no: int,
+    dpi: int = 150,
+    raster: str = RASTER_PNG,
+    image_spill_path: str | None = None,
+    render: bool = True,
+) -> tuple[ParsedPageIR, bytes | SharedRaster]:
+    """
+    在进程池中一次完成解析 + 截图渲染 (单次往返, 共用缓存文档句柄)。
+
+    raster="shm" 时截图以原始 RGB 写入共享内存, 返回 SharedRaster 句柄。
+    image_spill_path 非空时图片字节写入该文件, IR 仅携带句柄。
+    render=False 时仅解析 (截图已在 RasterStore 中)。
+    渲染失败不影响解析结果, 截图返回 b""。
+    """
     import fitz
-    doc = fitz.open(file_path)
+    ir = PDFExtractor().extract(file_path, page_no)
+    if image_spill_path:
+        spill_images(ir.images, image_spill_path)
+    if not render:
+        return ir, b""
     try:
+        doc = get_doc_cache().open_fitz(file_path)
         page = doc[page_no - 1]
         zoom = dpi / 72
-        mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat)
-        return pix.tobytes("png")
-    finally:
-        doc.close()
+        if raster == RASTER_SHM:
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            return ir, export_pixmap(pix)
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+        return ir, pix.tobytes("png")
+    except Exception as e:
+        logger.debug("render_in_extract_failed", page=page_no, error=str(e))
+        return ir, b""
+
+
+@dataclass
+class PreparedPage:
+    """Phase 1 产物 (解析 IR + 截图), 供预取阶段提前生成。页级缓存命中时仅含 cached。"""
+    raw: ParsedPageIR | None = None
+    screenshot: bytes = b""
+    cached: PageResult | None = None
+    batch_skus: list[SKUResult] | None = None  # 多页批量提取结果, Phase 6 直接采用
 
 
 class PageProcessor:
@@ -65,21 +110,86 @@ class PageProcessor:
         llm_service=None,
         process_pool: ProcessPoolExecutor | None = None,
         config_provider=None,
+        page_cache: PageResultCache | None = None,
     ) -> None:
         self._llm = llm_service
         self._pool = process_pool
         self._config = config_provider
+        self._page_cache = page_cache
+        self._raster_transport = settings.page_raster_transport
+        self._image_transport = settings.image_payload_transport
         self._extractor = PDFExtractor()
         self._feat = FeatureExtractor()
         self._classifier = PageClassifier(llm_service)
         self._two_stage = TwoStageExtractor(llm_service)
         self._single_stage = SingleStageExtractor(llm_service)
+        self._batch = BatchExtractor(llm_service)
         self._validator = ConsistencyValidator()
         self._binder = SKUImageBinder()
         self._id_gen = SKUIdGenerator()
         self._exporter = SKUExporter()
         self._xpage = CrossPageMerger()
 
+    async def prepare_page(
+        self,
+        job_id: str,
+        file_path: str,
+        page_no: int,
+        page_fingerprint: str = "",
+        file_hash: str = "",
+        frozen_config_version: str | None = None,
+        bypass_cache: bool = False,
+    ) -> PreparedPage:
+        """
+        Phase 1: PDF 解析 + 截图渲染 (CPU 阶段, 不调用 LLM)。
+
+        页级结果缓存命中时跳过渲染与 LLM, 直接返回缓存结果; 仍解析一次 (不渲染),
+        供下一页跨页表格检测使用。bypass_cache=True (Job 全量重处理) 时不读缓存。
+        """
+        if self._page_cache and page_fingerprint and not bypass_cache:
+            cached = await self._page_cache.get(
+                job_id, page_fingerprint, frozen_config_version, self._model_key(),
+                page_no, sku_id_prefix(file_hash, page_no))
+            if cached is not None:
+                logger.info("page_cache_hit", job_id=job_id, page=page_no)
+                return PreparedPage(
+                    raw=await self._parse_only(file_path, page_no), cached=cached)
+        if not self._pool:
+            return PreparedPage(raw=self._extractor.extract(file_path, page_no))
+        loop = asyncio.get_event_loop()
+        image_spill = (spill_path(job_id, page_no)
+                       if self._image_transport == TRANSPORT_SPILL else None)
+        parsed: list[ParsedPageIR] = []
+
+        async def render() -> bytes:
+            # 截图未落盘: 解析与渲染仍在同一次进程池往返中完成
+            raw, rendered = await loop.run_in_executor(
+                self._pool, _extract_and_render_sync, file_path, page_no,
+                150, self._raster_transport, image_spill)
+            parsed.append(raw)
+            return await self._materialize_screenshot(rendered)
+
+        screenshot = await get_raster_store().get(job_id, page_no, render, caller="pipeline")
+        if not parsed:
+            raw, _ = await loop.run_in_executor(
+                self._pool, _extract_and_render_sync, file_path, page_no,
+                150, self._raster_transport, image_spill, False)
+            parsed.append(raw)
+        return PreparedPage(raw=parsed[0], screenshot=screenshot)
+
+    async def _parse_only(self, file_path: str, page_no: int) -> ParsedPageIR | None:
+        """仅解析 (缓存命中页的跨页上下文); 失败返回 None, 不影响命中结果。"""
+        try:
+            if not self._pool:
+                return self._extractor.extract(file_path, page_no)
+            raw, _ = await asyncio.get_event_loop().run_in_executor(
+                self._pool, _extract_and_render_sync, file_path, page_no,
+                150, self._raster_transport, None, False)
+            return raw
+        except Exception as e:
+            logger.debug("page_cache_hit_parse_failed", page=page_no, error=str(e))
+            return None
+
     async def process_page(
         self,
         job_id: str,
@@ -88,28 +198,38 @@ class PageProcessor:
         file_hash: str = "",
         category: str | None = None,
         frozen_config_version: str | None = None,
+        prepared: PreparedPage | None = None,
+        page_fingerprint: str = "",
+        bypass_cache: bool = False,
     ) -> PageResult:
         """
         单页处理入口。
 
+        Args:
+            prepared: 预取阶段已完成的 Phase 1 结果; 为空则就地解析
+            page_fingerprint: 页面内容指纹; 非空时启用页级结果缓存
+            bypass_cache: 不读页级结果缓存 (结果仍回写)
+
         Returns:
             PageResult: 包含 SKU、图片、绑定、校验结果
         """
-        loop = asyncio.get_event_loop()
         llm_calls_used = 0
         extraction_method = None
         fallback_reason = None
 
         try:
-            # ═══ Phase 1: PDF 解析 ═══
-            if self._pool:
-                raw = await loop.run_in_executor(
-                    self._pool, _extract_page_sync, file_path, page_no)
-            else:
-                raw = self._extractor.extract(file_path, page_no)
-
-            # 缓存到 CrossPageMerger
-            await self._xpage.cache_page(job_id, page_no, raw)
+            # ═══ Phase 1: PDF 解析 (+ Phase 5 截图同批渲染) ═══
+            if prepared is None:
+                prepared = await self.prepare_page(
+                    job_id, file_path, page_no,
+                    page_fingerprint, file_hash, frozen_config_version, bypass_cache)
+            raw, screenshot = prepared.raw, prepared.screenshot
+
+            # 缓存到 CrossPageMerger (缓存命中页同样登记, 供下一页续表检测)
+            if raw is not None:
+                await self._xpage.cache_page(job_id, page_no, raw)
+            if prepared.cached is not None:
+                return prepared.cached
 
             # ═══ Phase 2: 图片预处理 ═══
             RENDER_DPI = 150
@@ -128,11 +248,13 @@ class PageProcessor:
                 if img.data:
                     img.image_hash = hashlib.md5(img.data[:2048]).hexdigest()[:12]
 
-            # ═══ Phase 2a: 图片去重 ═══
-            raw.images = self._dedup_images(raw.images)
-
-            # ═══ Phase 2b: 瓦片碎片聚类合并 ═══
-            raw.images = self._merge_tile_fragments(raw.images, page_no)
+            # ═══ Phase 2a: 图片去重 + Phase 2b: 瓦片碎片聚类合并 ═══
+            # 碎片多的瓦片页移出事件循环
+            if len(raw.images) >= IMAGE_OFFLOAD_THRESHOLD:
+                raw.images = await asyncio.to_thread(
+                    self._dedup_and_merge_images, raw.images, page_no)
+            else:
+                raw.images = self._dedup_and_merge_images(raw.images, page_no)
 
             # ═══ Phase 2c: 合成大图布局检测 ═══
             raw.images = self._split_fullpage_composites(
@@ -147,13 +269,6 @@ class PageProcessor:
                 raw.tables = self._xpage.merge(continuation.source_tables, raw.tables)
 
             # ═══ Phase 5: 页面分类 ═══
-            screenshot = b""
-            if self._pool:
-                try:
-                    screenshot = await loop.run_in_executor(
-                        self._pool, _render_page_sync, file_path, page_no)
-                except Exception:
-                    pass
             cls_result = await self._classifier.classify(
                 screenshot=screenshot,
                 features=features,
@@ -163,14 +278,24 @@ class PageProcessor:
 
             # D 类 → 跳过
             if page_type == "D" and cls_result.confidence >= 0.85:
-                return PageResult(
+                result = PageResult(
                     status="SKIPPED", page_type="D",
                     classification_confidence=cls_result.confidence,
                     page_confidence=cls_result.confidence)
-
-            # ═══ Phase 6: SKU 提取 ═══
-            skus = await self._extract_skus_with_fallback(
-                raw, page_type, screenshot, features, llm_calls_used)
+                await self._cache_result(
+                    job_id, page_no, page_fingerprint, file_hash,
+                    frozen_config_version, result)
+                return result
+
+            # ═══ Phase 6: SKU 提取 (多页批量结果优先) ═══
+            if prepared.batch_skus and page_type in ("B", "C"):
+                skus = prepared.batch_skus
+            else:
+                with track_llm_usage() as usage:
+                    skus = await self._extract_skus_with_fallback(
+                        raw, page_type, screenshot, features, llm_calls_used)
+                if usage.calls:
+                    record_extract_usage(MODE_PAGE, 1, usage, len(skus))
             extraction_method = skus[0].extraction_method if skus else None
 
             # enforce validity → filter invalid → deduplicate
@@ -190,8 +315,10 @@ class PageProcessor:
                 )
             )
             if should_retry:
-                retry_skus = await self._extract_skus_with_fallback(
-                    raw, page_type, screenshot, features, llm_calls_used=4)
+                # 重试需要不同的输出: 跳过 LLM 响应缓存
+                with bypass_llm_cache():
+                    retry_skus = await self._extract_skus_with_fallback(
+                        raw, page_type, screenshot, features, llm_calls_used=4)
                 retry_skus = self._validator.enforce_sku_validity(
                     retry_skus, None, text_block_count=features.text_block_count)
                 retry_skus = [s for s in retry_skus if s.validity == "valid"]
@@ -265,7 +392,7 @@ class PageProcessor:
             )
             needs_review = page_confidence < 0.6
 
-            return PageResult(
+            result = PageResult(
                 status="AI_COMPLETED",
                 page_type=page_type,
                 needs_review=needs_review,
@@ -279,6 +406,10 @@ class PageProcessor:
                 fallback_reason=fallback_reason,
                 page_confidence=page_confidence,
             )
+            await self._cache_result(
+                job_id, page_no, page_fingerprint, file_hash,
+                frozen_config_version, result)
+            return result
 
         except Exception as e:
             logger.exception("page_processing_error",
@@ -289,6 +420,26 @@ class PageProcessor:
                 needs_review=True,
             )
 
+    def batchable(self, prepared: PreparedPage | None) -> bool:
+        """是否可参与多页批量提取 (有截图的简单页)。"""
+        if (prepared is None or prepared.raw is None
+                or prepared.cached is not None or not prepared.screenshot):
+            return False
+        return is_simple_page(self._feat.extract(prepared.raw), prepared.raw)
+
+    async def extract_batch(self, pages: list[PreparedPage]) -> int:
+        """
+        多页批量 SKU 提取: 结果写入各页 PreparedPage.batch_skus。
+
+        Returns:
+            成功解析的页数 (其余页在 process_page 中逐页提取)
+        """
+        results = await self._batch.extract_pages(
+            [(p.raw, p.screenshot) for p in pages])
+        for p in pages:
+            p.batch_skus = results.get(p.raw.page_no)
+        return len(results)
+
     async def _extract_skus_with_fallback(
         self,
         raw: ParsedPageIR,
@@ -564,7 +715,7 @@ Respond with ONLY a JSON array of [sku_index, image_index] pairs:
         """从页面截图裁剪 composite 图片区域，填充 img.data。"""
         composites = [img for img in images
                       if ("_composite_" in img.image_id or "_region_" in img.image_id)
-                      and not img.data]
+                      and not img.has_data()]
         if not composites:
             return
         try:
@@ -631,7 +782,7 @@ Respond with ONLY a JSON array of [sku_index, image_index] pairs:
         # 方法降级惩罚
         if fallback_reason == "retry_improved":
             c_page *= 0.9
-        if extraction_method == "single_stage":
+        if extraction_method in ("single_stage", BATCH_METHOD):
             c_page *= 0.95
 
         # 校验错误惩罚
@@ -656,6 +807,11 @@ Respond with ONLY a JSON array of [sku_index, image_index] pairs:
         a2 = max(1, (bbox2[2] - bbox2[0]) * (bbox2[3] - bbox2[1]))
         return overlap / min(a1, a2)
 
+    @staticmethod
+    def _dedup_and_merge_images(images: list[ImageInfo], page_no: int) -> list[ImageInfo]:
+        images = PageProcessor._dedup_images(images)
+        return PageProcessor._merge_tile_fragments(images, page_no)
+
     @staticmethod
     def _dedup_images(images: list[ImageInfo]) -> list[ImageInfo]:
         """图片去重: 哈希去重 + 重叠去重 + 小图过滤。"""
@@ -681,21 +837,20 @@ Respond with ONLY a JSON array of [sku_index, image_index] pairs:
                 dup.search_eligible = False
 
         # 3. 重叠去重: bbox 重叠率 > 70% → 保留高分辨率的
+        # 候选对由 sweep 索引给出, 按 (i, j) 顺序贪心淘汰 (与两两扫描结果一致)
         active = [img for img in images if not img.is_duplicate and img.search_eligible]
-        for i in range(len(active)):
-            if active[i].is_duplicate:
+        current_i, skip_i = -1, False
+        for i, j in overlap_pairs([img.bbox for img in active], 0.7).tolist():
+            if i != current_i:
+                # 外层 i 开始比较前已被淘汰 → 跳过其全部候选
+                current_i, skip_i = i, active[i].is_duplicate
+            if skip_i or active[j].is_duplicate:
                 continue
-            for j in range(i + 1, len(active)):
-                if active[j].is_duplicate:
-                    continue
-                ratio = PageProcessor._bbox_overlap_ratio(
-                    active[i].bbox, active[j].bbox)
-                if ratio > 0.7:
-                    area_i = active[i].width * active[i].height
-                    area_j = active[j].width * active[j].height
-                    loser = active[j] if area_i >= area_j else active[i]
-                    loser.is_duplicate = True
-                    loser.search_eligible = False
+            area_i = active[i].width * active[i].height
+            area_j = active[j].width * active[j].height
+            loser = active[j] if area_i >= area_j else active[i]
+            loser.is_duplicate = True
+            loser.search_eligible = False
 
         deduped = sum(1 for img in images if img.is_duplicate)
         if deduped > 0:
@@ -707,7 +862,7 @@ Respond with ONLY a JSON array of [sku_index, image_index] pairs:
         """检测并合并瓦片碎片为虚拟复合图片。
 
         判定条件: 页面图片数 > 30 且多数图片 short_edge < 200 (原生)。
-        使用 Union-Find 将相邻碎片 (间隔 < 5pt) 聚类,
+        使用 sweep 索引 + Union-Find 将相邻碎片 (间隔 < 5pt) 聚类,
         每个聚类生成一个虚拟 ImageInfo, 原碎片标记 is_fragmented。
         """
         if len(images) < 30:
@@ -734,50 +889,14 @@ Respond with ONLY a JSON array of [sku_index, image_index] pairs:
         if not is_tile_page:
             return images
 
-        # Union-Find
-        n = len(images)
-        parent = list(range(n))
-        rank = [0] * n
-
-        def find(i: int) -> int:
-            while parent[i] != i:
-                parent[i] = parent[parent[i]]
-                i = parent[i]
-            return i
-
-        def union(i: int, j: int) -> None:
-            ri, rj = find(i), find(j)
-            if ri == rj:
-                return
-            if rank[ri] < rank[rj]:
-                ri, rj = rj, ri
-            parent[rj] = ri
-            if rank[ri] == rank[rj]:
-                rank[ri] += 1
-
+        # 相邻碎片 (间隔 < 5pt) 聚类: sweep 索引求相邻对 + Union-Find
         GAP = 5  # PDF points
-        for i in range(n):
-            bi = images[i].bbox
-            if len(bi) < 4:
-                continue
-            for j in range(i + 1, n):
-                bj = images[j].bbox
-                if len(bj) < 4:
-                    continue
-                h_adj = bi[0] < bj[2] + GAP and bj[0] < bi[2] + GAP
-                v_adj = bi[1] < bj[3] + GAP and bj[1] < bi[3] + GAP
-                if h_adj and v_adj:
-                    union(i, j)
-
-        # 按聚类分组
-        from collections import defaultdict
-        clusters: dict[int, list[int]] = defaultdict(list)
-        for i in range(n):
-            clusters[find(i)].append(i)
+        clusters = connected_components(
+            len(images), adjacent_pairs([img.bbox for img in images], GAP))
 
         merged: list[ImageInfo] = []
         composite_idx = 0
-        for members in clusters.values():
+        for members in clusters:
             if len(members) == 1:
                 # 瓦片页中的独立碎片: 标记为碎片，不参与绑定
                 img = images[members[0]]
@@ -841,5 +960,46 @@ Respond with ONLY a JSON array of [sku_index, image_index] pairs:
             logger.debug("phase2c_skip", reason=str(exc))
             return images
 
+    def _model_key(self) -> str:
+        return self._llm.current_model_name if self._llm else "rules"
+
+    async def _cache_result(
+        self,
+        job_id: str,
+        page_no: int,
+        page_fingerprint: str,
+        file_hash: str,
+        frozen_config_version: str | None,
+        result: PageResult,
+    ) -> None:
+        if not (self._page_cache and page_fingerprint):
+            return
+        await self._page_cache.put(
+            job_id, page_fingerprint, frozen_config_version, self._model_key(),
+            page_no, sku_id_prefix(file_hash, page_no), result)
+
+    def page_cache_stats(self, job_id: str) -> dict | None:
+        return self._page_cache.job_stats(job_id) if self._page_cache else None
+
     def clear_job_cache(self, job_id: str) -> None:
         self._xpage.clear_job(job_id)
+        if self._page_cache:
+            self._page_cache.clear_job(job_id)
+
+    @staticmethod
+    async def _materialize_screenshot(rendered: bytes | SharedRaster) -> bytes:
+        """
+        共享内存栅格 → PNG bytes (线程中编码), 并释放共享段。
+
+        截图需落盘 (RasterStore) 并作为 VLM 输入, 下游只接受编码后的图片,
+        因此 shm 模式仍有一次 PNG 编码, 仅省去跨进程 pickle 的拷贝与 worker 侧编码。
+        """
+        if not isinstance(rendered, SharedRaster):
+            return rendered
+        try:
+            return await asyncio.to_thread(rendered.to_png)
+        except Exception as e:
+            logger.debug("shared_raster_decode_failed", error=str(e))
+            return b""
+        finally:
+            rendered.release()
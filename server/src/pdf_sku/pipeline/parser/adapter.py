@@ -3,6 +3,7 @@ PDF 解析器 (多库兜底)。对齐: Pipeline 详设 §5.3
 
 策略: pdfplumber → PyMuPDF → OCR-lite (fitz getText)
 PaddleOCR 为重依赖，Round 3 预留接口但不强制 import。
+文档句柄由 doc_cache 按 worker 复用，此处不关闭文档。
 """
 from __future__ import annotations
 import hashlib
@@ -11,6 +12,7 @@ from pathlib import Path
 from pdf_sku.pipeline.ir import (
     ParsedPageIR, TextBlock, TableData, ImageInfo, PageMetadata,
 )
+from pdf_sku.pipeline.parser.doc_cache import get_doc_cache
 import structlog
 
 logger = structlog.get_logger()
@@ -47,16 +49,19 @@ class PDFExtractor:
         return result
 
     def _extract_pdfplumber(self, path: str, page_no: int) -> ParsedPageIR:
-        import pdfplumber
-        with pdfplumber.open(path) as pdf:
-            if page_no < 1 or page_no > len(pdf.pages):
-                return ParsedPageIR(page_no=page_no)
-            page = pdf.pages[page_no - 1]
+        pdf = get_doc_cache().open_plumber(path)
+        if page_no < 1 or page_no > len(pdf.pages):
+            return ParsedPageIR(page_no=page_no)
+        page = pdf.pages[page_no - 1]
+        try:
             raw_text = page.extract_text() or ""
             text_blocks = self._plumber_text_blocks(page)
             tables = self._plumber_tables(page)
             images = self._plumber_images(page, path, page_no)
             area = max(1.0, float(page.width) * float(page.height))
+        finally:
+            # 文档常驻缓存，单页解析缓存需及时释放
+            page.close()
 
         # pdfplumber 不提取图片字节，用 PyMuPDF 补充
         if images:
@@ -75,93 +80,86 @@ class PDFExtractor:
 
     def _extract_pymupdf(self, path: str, page_no: int) -> ParsedPageIR:
         import fitz
-        doc = fitz.open(path)
-        try:
-            if page_no < 1 or page_no > doc.page_count:
-                return ParsedPageIR(page_no=page_no)
-            page = doc[page_no - 1]
-            raw_text = page.get_text("text") or ""
-
-            # Text blocks
-            blocks = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)["blocks"]
-            text_blocks = []
-            for b in blocks:
-                if b.get("type") == 0:  # text block
-                    for line in b.get("lines", []):
-                        for span in line.get("spans", []):
-                            text_blocks.append(TextBlock(
-                                content=span.get("text", ""),
-                                bbox=(span["bbox"][0], span["bbox"][1],
-                                      span["bbox"][2], span["bbox"][3]),
-                                font_size=span.get("size", 0),
-                                font_name=span.get("font", ""),
-                                is_bold="Bold" in span.get("font", ""),
-                            ))
-
-            # Images
-            images = []
-            for i, img_info in enumerate(page.get_images(full=True)):
-                xref = img_info[0]
+        doc = get_doc_cache().open_fitz(path)
+        if page_no < 1 or page_no > doc.page_count:
+            return ParsedPageIR(page_no=page_no)
+        page = doc[page_no - 1]
+        raw_text = page.get_text("text") or ""
+
+        # Text blocks
+        blocks = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)["blocks"]
+        text_blocks = []
+        for b in blocks:
+            if b.get("type") == 0:  # text block
+                for line in b.get("lines", []):
+                    for span in line.get("spans", []):
+                        text_blocks.append(TextBlock(
+                            content=span.get("text", ""),
+                            bbox=(span["bbox"][0], span["bbox"][1],
+                                  span["bbox"][2], span["bbox"][3]),
+                            font_size=span.get("size", 0),
+                            font_name=span.get("font", ""),
+                            is_bold="Bold" in span.get("font", ""),
+                        ))
+
+        # Images
+        images = []
+        for i, img_info in enumerate(page.get_images(full=True)):
+            xref = img_info[0]
+            try:
+                pix = fitz.Pixmap(doc, xref)
+                img_data = self._pixmap_to_png(fitz, pix)
+                short_edge = min(pix.width, pix.height)
+                img_hash = hashlib.md5(img_data[:1024]).hexdigest()[:12] if img_data else ""
+                # 获取图片在页面上的位置 (PDF points)
+                img_bbox = (0, 0, 0, 0)
                 try:
-                    pix = fitz.Pixmap(doc, xref)
-                    img_data = self._pixmap_to_png(fitz, pix)
-                    short_edge = min(pix.width, pix.height)
-                    img_hash = hashlib.md5(img_data[:1024]).hexdigest()[:12] if img_data else ""
-                    # 获取图片在页面上的位置 (PDF points)
-                    img_bbox = (0, 0, 0, 0)
-                    try:
-                        rects = page.get_image_rects(xref)
-                        if rects:
-                            r = rects[0]
-                            img_bbox = (r.x0, r.y0, r.x1, r.y1)
-                    except Exception:
-                        pass
-                    images.append(ImageInfo(
-                        image_id=f"p{page_no}_img{i}",
-                        bbox=img_bbox,
-                        data=img_data,
-                        width=pix.width,
-                        height=pix.height,
-                        short_edge=short_edge,
-                        image_hash=img_hash,
-                        search_eligible=short_edge >= 200,
-                    ))
+                    rects = page.get_image_rects(xref)
+                    if rects:
+                        r = rects[0]
+                        img_bbox = (r.x0, r.y0, r.x1, r.y1)
                 except Exception:
                     pass
+                images.append(ImageInfo(
+                    image_id=f"p{page_no}_img{i}",
+                    bbox=img_bbox,
+                    data=img_data,
+                    width=pix.width,
+                    height=pix.height,
+                    short_edge=short_edge,
+                    image_hash=img_hash,
+                    search_eligible=short_edge >= 200,
+                ))
+            except Exception:
+                pass
 
-            rect = page.rect
-            area = max(1.0, rect.width * rect.height)
-            return ParsedPageIR(
-                page_no=page_no,
-                text_blocks=text_blocks,
-                tables=[],
-                images=images,
-                raw_text=raw_text,
-                metadata=PageMetadata(page_width=rect.width, page_height=rect.height),
-                reading_order=list(range(len(text_blocks))),
-                text_coverage=len(raw_text) / area,
-            )
-        finally:
-            doc.close()
+        rect = page.rect
+        area = max(1.0, rect.width * rect.height)
+        return ParsedPageIR(
+            page_no=page_no,
+            text_blocks=text_blocks,
+            tables=[],
+            images=images,
+            raw_text=raw_text,
+            metadata=PageMetadata(page_width=rect.width, page_height=rect.height),
+            reading_order=list(range(len(text_blocks))),
+            text_coverage=len(raw_text) / area,
+        )
 
     def _extract_pymupdf_ocr(self, path: str, page_no: int) -> ParsedPageIR:
         """最后兜底: 用 PyMuPDF 渲染后提取文字。"""
-        import fitz
-        doc = fitz.open(path)
-        try:
-            page = doc[page_no - 1]
-            raw_text = page.get_text("text") or ""
-            rect = page.rect
-            area = max(1.0, rect.width * rect.height)
-            return ParsedPageIR(
-                page_no=page_no,
-                text_blocks=[TextBlock(content=raw_text, bbox=(0, 0, rect.width, rect.height))],
-                raw_text=raw_text,
-                metadata=PageMetadata(page_width=rect.width, page_height=rect.height),
-                text_coverage=len(raw_text) / area,
-            )
-        finally:
-            doc.close()
+        doc = get_doc_cache().open_fitz(path)
+        page = doc[page_no - 1]
+        raw_text = page.get_text("text") or ""
+        rect = page.rect
+        area = max(1.0, rect.width * rect.height)
+        return ParsedPageIR(
+            page_no=page_no,
+            text_blocks=[TextBlock(content=raw_text, bbox=(0, 0, rect.width, rect.height))],
+            raw_text=raw_text,
+            metadata=PageMetadata(page_width=rect.width, page_height=rect.height),
+            text_coverage=len(raw_text) / area,
+        )
 
     @staticmethod
     def _pixmap_to_png(fitz, pix) -> bytes:
@@ -177,28 +175,25 @@ class PDFExtractor:
         """用 PyMuPDF 为 pdfplumber 提取的图片补充像素数据。"""
         try:
             import fitz
-            doc = fitz.open(path)
-            try:
-                page = doc[page_no - 1]
-                fitz_images = page.get_images(full=True)
-                for i, img_info in enumerate(fitz_images):
-                    if i >= len(images):
-                        break
-                    xref = img_info[0]
-                    try:
-                        pix = fitz.Pixmap(doc, xref)
-                        img_data = PDFExtractor._pixmap_to_png(fitz, pix)
-                        if img_data:
-                            images[i].data = img_data
-                            images[i].width = pix.width
-                            images[i].height = pix.height
-                            images[i].short_edge = min(pix.width, pix.height)
-                            images[i].search_eligible = images[i].short_edge >= 200
-                            images[i].image_hash = hashlib.md5(img_data[:1024]).hexdigest()[:12]
-                    except Exception:
-                        pass
-            finally:
-                doc.close()
+            doc = get_doc_cache().open_fitz(path)
+            page = doc[page_no - 1]
+            fitz_images = page.get_images(full=True)
+            for i, img_info in enumerate(fitz_images):
+                if i >= len(images):
+                    break
+                xref = img_info[0]
+                try:
+                    pix = fitz.Pixmap(doc, xref)
+                    img_data = PDFExtractor._pixmap_to_png(fitz, pix)
+                    if img_data:
+                        images[i].data = img_data
+                        images[i].width = pix.width
+                        images[i].height = pix.height
+                        images[i].short_edge = min(pix.width, pix.height)
+                        images[i].search_eligible = images[i].short_edge >= 200
+                        images[i].image_hash = hashlib.md5(img_data[:1024]).hexdigest()[:12]
+                except Exception:
+                    pass
         except Exception as e:
             logger.debug("fill_image_data_failed", page=page_no, error=str(e))
 
@@ -0,0 +1,225 @@
+"""
+进程池 Worker 级 PDF 文档句柄缓存。对齐: Pipeline 详设 §5.3
+
+每个 ProcessPoolExecutor worker 持有一个有界 LRU:
+  key = (backend, file_path, mtime_ns) → 已打开的 fitz.Document / pdfplumber.PDF
+同一 Job 的逐页解析 / 渲染复用同一句柄，不再每页重读 xref 表。
+
+跨进程共享 (DocCacheSharedState, 通过 pool initializer 注入):
+- hits / misses / evictions 计数 → 主进程 /metrics 采集
+- 驱逐环形缓冲: 主进程 request_eviction(path) 写入路径摘要,
+  各 worker 下次访问缓存时关闭对应句柄
+"""
+from __future__ import annotations
+import ctypes
+import hashlib
+import multiprocessing
+import os
+from collections import OrderedDict
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger()
+
+DOC_CACHE_SIZE = int(os.environ.get("PDF_DOC_CACHE_SIZE", "4"))
+EVICTION_RING_SIZE = 64
+
+BACKEND_FITZ = "fitz"
+BACKEND_PLUMBER = "pdfplumber"
+
+
+def _path_digest(file_path: str) -> int:
+    """路径 → 64 位摘要 (写入共享环形缓冲)。"""
+    raw = hashlib.blake2b(os.path.abspath(file_path).encode(), digest_size=8).digest()
+    return int.from_bytes(raw, "little")
+
+
+class DocCacheSharedState:
+    """主进程创建、随 initargs 传入 worker 的共享计数与驱逐队列。"""
+
+    def __init__(self, ring_size: int = EVICTION_RING_SIZE) -> None:
+        self.hits = multiprocessing.Value(ctypes.c_ulonglong, 0)
+        self.misses = multiprocessing.Value(ctypes.c_ulonglong, 0)
+        self.evictions = multiprocessing.Value(ctypes.c_ulonglong, 0)
+        self.generation = multiprocessing.Value(ctypes.c_ulonglong, 0)
+        self.ring = multiprocessing.Array(ctypes.c_ulonglong, ring_size, lock=False)
+        self.ring_size = ring_size
+
+    def publish_eviction(self, file_path: str) -> None:
+        digest = _path_digest(file_path)
+        with self.generation.get_lock():
+            gen = self.generation.value
+            self.ring[gen % self.ring_size] = digest
+            self.generation.value = gen + 1
+
+    @staticmethod
+    def incr(counter, n: int = 1) -> None:
+        with counter.get_lock():
+            counter.value += n
+
+
+class DocumentCache:
+    """单进程内的有界 LRU 文档句柄缓存。"""
+
+    def __init__(self, max_size: int = DOC_CACHE_SIZE) -> None:
+        self._max_size = max(1, max_size)
+        self._docs: OrderedDict[tuple[str, str, int], Any] = OrderedDict()
+        self._shared: DocCacheSharedState | None = None
+        self._seen_generation = 0
+        self._local = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def attach(self, shared: DocCacheSharedState | None) -> None:
+        self._shared = shared
+        self._seen_generation = shared.generation.value if shared else 0
+
+    def open_fitz(self, file_path: str):
+        return self._get(BACKEND_FITZ, file_path)
+
+    def open_plumber(self, file_path: str):
+        return self._get(BACKEND_PLUMBER, file_path)
+
+    def _get(self, backend: str, file_path: str):
+        self._apply_pending_evictions()
+        mtime_ns = os.stat(file_path).st_mtime_ns
+        key = (backend, file_path, mtime_ns)
+        doc = self._docs.get(key)
+        if doc is not None:
+            self._docs.move_to_end(key)
+            self._count("hits")
+            return doc
+
+        self._count("misses")
+        # 同路径旧 mtime 的句柄已失效
+        for stale in [k for k in self._docs if k[0] == backend and k[1] == file_path]:
+            self._close(stale)
+        doc = self._open(backend, file_path)
+        self._docs[key] = doc
+        while len(self._docs) > self._max_size:
+            self._close(next(iter(self._docs)))
+        return doc
+
+    @staticmethod
+    def _open(backend: str, file_path: str):
+        if backend == BACKEND_FITZ:
+            import fitz
+            return fitz.open(file_path)
+        import pdfplumber
+        return pdfplumber.open(file_path)
+
+    def evict(self, file_path: str) -> int:
+        """关闭并移除 file_path 的所有句柄。返回关闭数。"""
+        keys = [k for k in self._docs if k[1] == file_path]
+        for k in keys:
+            self._close(k)
+        return len(keys)
+
+    def clear(self) -> None:
+        for k in list(self._docs):
+            self._close(k)
+
+    def _close(self, key: tuple[str, str, int]) -> None:
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        try:
+            doc.close()
+        except Exception:
+            pass
+        self._count("evictions")
+
+    def _apply_pending_evictions(self) -> None:
+        shared = self._shared
+        if shared is None:
+            return
+        gen = shared.generation.value
+        if gen == self._seen_generation:
+            return
+        if gen - self._seen_generation > shared.ring_size:
+            # 环形缓冲已覆盖，无法确定哪些路径被驱逐 → 全部关闭
+            self.clear()
+        else:
+            digests = {shared.ring[g % shared.ring_size]
+                       for g in range(self._seen_generation, gen)}
+            for path in {k[1] for k in self._docs}:
+                if _path_digest(path) in digests:
+                    self.evict(path)
+        self._seen_generation = gen
+
+    def _count(self, name: str) -> None:
+        if self._shared is not None:
+            DocCacheSharedState.incr(getattr(self._shared, name))
+        else:
+            self._local[name] += 1
+
+    def stats(self) -> dict:
+        if self._shared is not None:
+            return {
+                "hits": self._shared.hits.value,
+                "misses": self._shared.misses.value,
+                "evictions": self._shared.evictions.value,
+                "open_docs": len(self._docs),
+            }
+        return {**self._local, "open_docs": len(self._docs)}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+
+# 进程内单例 (主进程与每个 worker 各一份)
+_cache = DocumentCache()
+_shared_state: DocCacheSharedState | None = None
+
+
+def get_doc_cache() -> DocumentCache:
+    return _cache
+
+
+def shared_state() -> DocCacheSharedState:
+    """主进程: 获取 (或创建) 共享状态，并挂到本进程缓存上。"""
+    global _shared_state
+    if _shared_state is None:
+        _shared_state = DocCacheSharedState()
+        _cache.attach(_shared_state)
+    return _shared_state
+
+
+def init_worker(shared: DocCacheSharedState | None) -> None:
+    """ProcessPoolExecutor initializer: worker 启动时挂载共享状态。"""
+    global _shared_state
+    _shared_state = shared
+    _cache.clear()
+    _cache.attach(shared)
+
+
+def request_eviction(file_path: str) -> None:
+    """主进程: 驱逐本进程句柄，并通知所有 worker 驱逐。"""
+    _cache.evict(file_path)
+    if _shared_state is not None:
+        _shared_state.publish_eviction(file_path)
+    logger.debug("doc_cache_eviction_requested", file_path=file_path)
+
+
+class _DocCacheCollector:
+    """Prometheus 自定义 collector: 抓取时读取共享计数。"""
+
+    def collect(self):
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+        s = _cache.stats()
+        yield CounterMetricFamily(
+            "pdf_doc_cache_hits", "PDF document handle cache hits", value=s["hits"])
+        yield CounterMetricFamily(
+            "pdf_doc_cache_misses", "PDF document handle cache misses", value=s["misses"])
+        yield CounterMetricFamily(
+            "pdf_doc_cache_evictions", "PDF document handles closed", value=s["evictions"])
+        yield GaugeMetricFamily(
+            "pdf_doc_cache_open_docs", "Open document handles in the API process",
+            value=s["open_docs"])
+
+
+def register_metrics() -> None:
+    from prometheus_client import REGISTRY
+    try:
+        REGISTRY.register(_DocCacheCollector())
+    except ValueError:
+        pass  # 已注册
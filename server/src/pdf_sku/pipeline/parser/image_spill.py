@@ -0,0 +1,61 @@
+"""
+图片字节外置 (spill 文件)。对齐: Pipeline 详设 §5.3
+
+瓦片页单页可含数百张图片, 随 ParsedPageIR pickle 回事件循环代价高。
+开启 IMAGE_PAYLOAD_TRANSPORT=spill 后, 进程池 worker 将图片字节顺序写入
+  JOB_DATA_DIR/<job_id>/spill/page-<N>.bin
+ImageInfo 仅携带 ImagePayloadRef(path, offset, length),
+由 Orchestrator._persist_skus 落盘时经 mmap 按需读取。
+"""
+from __future__ import annotations
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+from pdf_sku.pipeline.ir import ImageInfo, ImagePayloadRef
+
+TRANSPORT_INLINE = "inline"
+TRANSPORT_SPILL = "spill"
+
+
+def _job_dir(job_id: str) -> Path:
+    return Path(os.environ.get("JOB_DATA_DIR", "/data/jobs")) / str(job_id)
+
+
+def spill_path(job_id: str, page_no: int) -> str:
+    return str(_job_dir(job_id) / "spill" / f"page-{page_no}.bin")
+
+
+def spill_images(images: list[ImageInfo], path: str) -> int:
+    """
+    worker 侧: 将图片字节写入 spill 文件并替换为句柄。
+
+    image_hash 在此按 Phase 2 口径 (md5 前 2048 字节) 预先计算。
+    Returns: 写入字节数
+    """
+    pending = [img for img in images if img.data]
+    if not pending:
+        return 0
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    offset = 0
+    with open(path, "wb") as f:
+        for img in pending:
+            data = img.data
+            f.write(data)
+            img.image_hash = hashlib.md5(data[:2048]).hexdigest()[:12]
+            img.data_ref = ImagePayloadRef(path=path, offset=offset, length=len(data))
+            img.data = b""
+            offset += len(data)
+    return offset
+
+
+def discard_page_spill(job_id: str, page_no: int) -> None:
+    try:
+        os.unlink(spill_path(job_id, page_no))
+    except FileNotFoundError:
+        pass
+
+
+def discard_job_spills(job_id: str) -> None:
+    shutil.rmtree(_job_dir(job_id) / "spill", ignore_errors=True)
@@ -0,0 +1,83 @@
+"""
+页面栅格跨进程传输。对齐: Pipeline 详设 §5.3
+
+进程池 worker 渲染截图后有两种返回方式:
+- png: PNG 编码 bytes (默认, 随返回值 pickle)
+- shm: 原始 RGB 像素写入 multiprocessing.shared_memory, 仅回传 SharedRaster 句柄,
+  由事件循环侧按需解码 (to_png / to_pil) 后 release()
+
+shm 并非全程零拷贝: 截图落盘与 VLM 调用都需要编码后的图片, 消费方仍在线程中
+做一次 PNG 编码; 收益在于 PNG 编码移出 worker 且不再 pickle 整张截图。
+"""
+from __future__ import annotations
+import io
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+RASTER_PNG = "png"
+RASTER_SHM = "shm"
+
+
+@dataclass(frozen=True)
+class SharedRaster:
+    """共享内存中的原始 RGB 栅格句柄 (可 pickle)。"""
+    shm_name: str
+    width: int
+    height: int
+    stride: int
+    channels: int = 3
+
+    @property
+    def nbytes(self) -> int:
+        return self.stride * self.height
+
+    def read(self) -> bytes:
+        shm = shared_memory.SharedMemory(name=self.shm_name)
+        try:
+            return bytes(shm.buf[:self.nbytes])
+        finally:
+            shm.close()
+
+    def to_pil(self):
+        from PIL import Image
+        mode = "RGBA" if self.channels == 4 else "RGB"
+        return Image.frombytes(
+            mode, (self.width, self.height), self.read(), "raw", mode, self.stride)
+
+    def to_png(self) -> bytes:
+        buf = io.BytesIO()
+        self.to_pil().save(buf, format="PNG")
+        return buf.getvalue()
+
+    def release(self) -> None:
+        """释放共享内存段 (消费方调用, 仅一次)。"""
+        try:
+            shm = shared_memory.SharedMemory(name=self.shm_name)
+        except FileNotFoundError:
+            return
+        shm.close()
+        shm.unlink()
+
+
+def export_pixmap(pix) -> SharedRaster:
+    """worker 侧: 将 fitz.Pixmap 像素拷入新的共享内存段。"""
+    samples = pix.samples_mv if hasattr(pix, "samples_mv") else pix.samples
+    size = max(1, len(samples))
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        shm.buf[:len(samples)] = samples
+        _untrack(shm)
+        return SharedRaster(
+            shm_name=shm.name, width=pix.width, height=pix.height,
+            stride=pix.stride, channels=pix.n)
+    finally:
+        shm.close()
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    """生命周期交给消费方: 避免 worker 退出时 resource_tracker 提前 unlink。"""
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")  # noqa: SLF001
+    except Exception:
+        pass
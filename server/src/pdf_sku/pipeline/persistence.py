@@ -0,0 +1,153 @@
+"""
+页级结果批量持久化。对齐: Pipeline 详设 §5.1 (每页完成 → 增量持久化)
+
+一页的 SKU / Image / Binding 各一次多行 INSERT (executemany → insertmanyvalues,
+asyncpg 下合并为批量 VALUES), 不再逐行 db.add + flush。
+图片文件 (含 spill 读取) 在线程池中有界并发写盘, 不阻塞事件循环。
+
+计量: pdf_persist_page_seconds (每页耗时), pdf_persist_rows_total{table} (行数),
+rows/sec = rate(rows_total) / rate(page_seconds_sum)。
+"""
+from __future__ import annotations
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from pdf_sku.common.models import SKU, Image, SKUImageBinding
+from pdf_sku.pipeline.ir import ImageInfo, PageResult
+import structlog
+
+logger = structlog.get_logger()
+
+IMAGE_WRITE_CONCURRENCY = int(os.environ.get("IMAGE_WRITE_CONCURRENCY", "8"))
+
+PERSIST_PAGE_SECONDS = Histogram(
+    "pdf_persist_page_seconds", "Time spent persisting one page's SKUs/images/bindings",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5))
+PERSIST_ROWS = Counter(
+    "pdf_persist_rows_total", "Rows inserted by page persistence", ["table"])
+
+
+@dataclass
+class PersistStats:
+    skus: int = 0
+    images: int = 0
+    bindings: int = 0
+    files: int = 0
+    elapsed_ms: int = 0
+
+    @property
+    def rows(self) -> int:
+        return self.skus + self.images + self.bindings
+
+
+def job_data_dir(job_id) -> Path:
+    return Path(os.environ.get("JOB_DATA_DIR", "/data/jobs")) / str(job_id)
+
+
+async def persist_page(
+    db: AsyncSession,
+    job_id,
+    page_no: int,
+    result: PageResult,
+) -> PersistStats:
+    """持久化单页 SKU/Image/Binding 到 DB, 图片文件写入 {JOB_DATA_DIR}/{job_id}/images/。"""
+    t0 = time.perf_counter()
+    job_dir = job_data_dir(job_id)
+
+    sku_rows = []
+    for idx, sku in enumerate(result.skus, start=1):
+        if sku.validity == "valid":
+            sku_rows.append({
+                "sku_id": sku.sku_id or f"SKU-{page_no}-{idx}",
+                "job_id": job_id,
+                "page_number": page_no,
+                "attributes": sku.attributes,
+                "validity": sku.validity,
+                "source_bbox": [int(v) for v in sku.source_bbox] if sku.source_bbox else None,
+                "attribute_source": "AI_EXTRACTED",
+                "status": "EXTRACTED",
+                "product_id": sku.product_id or None,
+                "variant_label": sku.variant_label or None,
+            })
+
+    image_rows = []
+    files: list[tuple[Path, ImageInfo]] = []
+    for idx, img in enumerate(result.images, start=1):
+        if img.search_eligible:
+            image_id = img.image_id or f"{str(job_id)[:8]}-{page_no}-{idx}"
+            file_rel = f"images/{image_id}.jpg"
+            files.append((job_dir / file_rel, img))
+            image_rows.append({
+                "image_id": image_id,
+                "job_id": job_id,
+                "page_number": page_no,
+                "role": img.role or "unknown",
+                "bbox": [int(v) for v in img.bbox] if img.bbox else None,
+                "extracted_path": file_rel,
+                "format": "jpg",
+                "resolution": ([int(img.width), int(img.height)]
+                               if img.width and img.height else None),
+                "short_edge": img.short_edge,
+                "image_hash": img.image_hash,
+                "is_duplicate": img.is_duplicate,
+                "search_eligible": img.search_eligible,
+                "is_fragmented": img.is_fragmented,
+            })
+
+    binding_rows = [
+        {
+            "sku_id": b.sku_id,
+            "image_id": b.image_id,
+            "job_id": job_id,
+            "binding_method": b.method,
+            "binding_confidence": b.confidence,
+            "is_ambiguous": b.is_ambiguous,
+            "rank": b.rank,
+        }
+        for b in result.bindings if b.image_id
+    ]
+
+    written = await write_image_files(files)
+
+    for model, rows in ((SKU, sku_rows), (Image, image_rows), (SKUImageBinding, binding_rows)):
+        if rows:
+            await db.execute(insert(model), rows)
+            PERSIST_ROWS.labels(table=model.__tablename__).inc(len(rows))
+
+    elapsed = time.perf_counter() - t0
+    PERSIST_PAGE_SECONDS.observe(elapsed)
+    stats = PersistStats(len(sku_rows), len(image_rows), len(binding_rows),
+                         written, int(elapsed * 1000))
+    logger.debug("page_persisted", job_id=str(job_id), page_no=page_no,
+                 rows=stats.rows, files=written, elapsed_ms=stats.elapsed_ms,
+                 rows_per_sec=round(stats.rows / elapsed) if elapsed > 0 else None)
+    return stats
+
+
+async def write_image_files(files: list[tuple[Path, ImageInfo]]) -> int:
+    """线程池中有界并发写图片文件 (load_data 可能读 spill 文件, 同在线程中执行)。"""
+    if not files:
+        return 0
+    files[0][0].parent.mkdir(parents=True, exist_ok=True)
+    sem = asyncio.Semaphore(IMAGE_WRITE_CONCURRENCY)
+
+    async def one(path: Path, img: ImageInfo) -> bool:
+        async with sem:
+            return await asyncio.to_thread(_write_one, path, img)
+
+    return sum(await asyncio.gather(*(one(p, img) for p, img in files)))
+
+
+def _write_one(path: Path, img: ImageInfo) -> bool:
+    data = img.load_data()
+    if not data:
+        return False
+    path.write_bytes(data)
+    return True
@@ -0,0 +1,232 @@
+"""
+页面截图存储 (渲染一次, 多处复用)。对齐: Pipeline 详设 §5.2
+
+同一页 150 DPI 截图此前被评估采样、Pipeline Phase 1、截图 API、OCR 区域识别
+各渲染一次。统一落盘到
+  JOB_DATA_DIR/<job_id>/screenshots/page-<N>.png
+任一阶段先渲染即写入 (临时文件 + link, 先写者胜出, 读者不会看到半截文件),
+其余调用方直接读取。
+
+进程内 single-flight: 同一页的并发请求只触发一次渲染, 其余等待同一结果。
+跨进程 / 跨 worker 仅靠落盘文件去重 (可能重复渲染, 但结果一致)。
+"""
+from __future__ import annotations
+import asyncio
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import structlog
+from prometheus_client import Counter, Histogram
+
+logger = structlog.get_logger()
+
+SCREENSHOT_DPI = 150
+RENDER_EMA_ALPHA = 0.2  # 单页渲染耗时滑动平均, 用于估算命中节省的渲染秒数
+
+RASTER_LOOKUPS = Counter(
+    "pdf_raster_store_lookups_total", "Page raster lookups", ["caller", "result"])
+RASTER_RENDER_SECONDS = Histogram(
+    "pdf_raster_render_seconds", "Per-page screenshot render duration", ["caller"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10))
+RASTER_SECONDS_SAVED = Counter(
+    "pdf_raster_render_seconds_saved_total",
+    "Estimated render seconds saved by raster store hits", ["caller"])
+
+RenderOne = Callable[[], Awaitable[bytes]]
+RenderBatch = Callable[[list[int]], Awaitable[list[bytes]]]
+
+
+def screenshot_path(job_id: str, page_no: int) -> Path:
+    job_dir = Path(os.environ.get("JOB_DATA_DIR", "/data/jobs")) / str(job_id)
+    return job_dir / "screenshots" / f"page-{page_no}.png"
+
+
+def render_page_png(file_path: str, page_no: int, dpi: int = SCREENSHOT_DPI) -> bytes:
+    """同步渲染单页 PNG (线程 / 进程池中执行)。页码越界抛 IndexError。"""
+    import fitz
+    doc = fitz.open(file_path)
+    try:
+        if page_no < 1 or page_no > doc.page_count:
+            raise IndexError(f"Page {page_no} is out of range")
+        zoom = dpi / 72
+        return doc[page_no - 1].get_pixmap(matrix=fitz.Matrix(zoom, zoom)).tobytes("png")
+    finally:
+        doc.close()
+
+
+class RasterStore:
+    """截图读写 + 进程内 single-flight。"""
+
+    def __init__(self) -> None:
+        self._inflight: dict[tuple[str, int], asyncio.Future[bytes]] = {}
+        self._avg_render = 0.0
+
+    def cached_path(self, job_id: str, page_no: int, caller: str) -> Path | None:
+        """已落盘则返回路径 (计为命中), 否则 None。"""
+        path = screenshot_path(job_id, page_no)
+        if path.exists():
+            self._record_hit(caller)
+            return path
+        return None
+
+    async def get(self, job_id: str, page_no: int, render: RenderOne, caller: str) -> bytes:
+        """读取截图; 未落盘时经 single-flight 调用 render 并写入。"""
+        key = (str(job_id), page_no)
+        data = await asyncio.to_thread(_read_or_none, screenshot_path(*key))
+        if data:
+            self._record_hit(caller)
+            return data
+        while key in self._inflight:
+            data = await self._wait(key, caller)
+            if data is not None:
+                return data
+
+        fut = self._claim(key)
+        try:
+            t0 = time.perf_counter()
+            data = await render()
+            self._record_render(caller, time.perf_counter() - t0, 1)
+            if data:
+                await self._write(key, data)
+        except BaseException as e:
+            self._fail(fut, e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        fut.set_result(data)
+        return data
+
+    async def get_many(
+        self,
+        job_id: str,
+        pages: list[int],
+        render_batch: RenderBatch,
+        caller: str,
+    ) -> list[bytes]:
+        """
+        批量读取; 缺失页合并为一次 render_batch 调用。
+
+        Returns: 与 pages 对齐的 PNG bytes, 渲染失败的页为 b""
+        """
+        job_id = str(job_id)
+        results: dict[int, bytes] = {}
+        waiting: list[int] = []
+        missing: list[int] = []
+        for page_no in pages:
+            data = await asyncio.to_thread(_read_or_none, screenshot_path(job_id, page_no))
+            if data:
+                self._record_hit(caller)
+                results[page_no] = data
+            elif (job_id, page_no) in self._inflight:
+                waiting.append(page_no)
+            else:
+                missing.append(page_no)
+
+        if missing:
+            futs = {p: self._claim((job_id, p)) for p in missing}
+            try:
+                t0 = time.perf_counter()
+                rendered = await render_batch(missing)
+                self._record_render(caller, time.perf_counter() - t0, len(missing))
+                for page_no, data in zip(missing, rendered):
+                    if data:
+                        await self._write((job_id, page_no), data)
+                    results[page_no] = data
+            except BaseException as e:
+                for fut in futs.values():
+                    self._fail(fut, e)
+                raise
+            finally:
+                for page_no in missing:
+                    self._inflight.pop((job_id, page_no), None)
+            for page_no, fut in futs.items():
+                fut.set_result(results.get(page_no, b""))
+
+        for page_no in waiting:
+            key = (job_id, page_no)
+            try:
+                results[page_no] = await self._wait(key, caller) or b""
+            except Exception:
+                results[page_no] = b""
+        return [results.get(p, b"") for p in pages]
+
+    # ─── 内部 ───
+
+    def _claim(self, key: tuple[str, int]) -> asyncio.Future[bytes]:
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        return fut
+
+    async def _wait(self, key: tuple[str, int], caller: str) -> bytes | None:
+        """等待他人渲染; 渲染方被取消时返回 None (由调用方接手)。"""
+        fut = self._inflight[key]
+        try:
+            data = await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            if fut.cancelled():
+                return None
+            raise
+        RASTER_LOOKUPS.labels(caller=caller, result="wait").inc()
+        RASTER_SECONDS_SAVED.labels(caller=caller).inc(self._avg_render)
+        return data
+
+    @staticmethod
+    def _fail(fut: asyncio.Future, e: BaseException) -> None:
+        if isinstance(e, asyncio.CancelledError):
+            fut.cancel()
+        else:
+            fut.set_exception(e)
+            fut.exception()  # 无等待者时不报 "never retrieved"
+
+    async def _write(self, key: tuple[str, int], data: bytes) -> None:
+        try:
+            await asyncio.to_thread(_write_once, screenshot_path(*key), data)
+        except OSError as e:
+            logger.warning("raster_store_write_failed", job_id=key[0], page=key[1],
+                           error=str(e))
+
+    def _record_hit(self, caller: str) -> None:
+        RASTER_LOOKUPS.labels(caller=caller, result="hit").inc()
+        RASTER_SECONDS_SAVED.labels(caller=caller).inc(self._avg_render)
+
+    def _record_render(self, caller: str, elapsed: float, pages: int) -> None:
+        per_page = elapsed / max(pages, 1)
+        RASTER_LOOKUPS.labels(caller=caller, result="render").inc(pages)
+        for _ in range(pages):
+            RASTER_RENDER_SECONDS.labels(caller=caller).observe(per_page)
+        self._avg_render = (per_page if self._avg_render == 0.0 else
+                            RENDER_EMA_ALPHA * per_page + (1 - RENDER_EMA_ALPHA) * self._avg_render)
+
+
+def _read_or_none(path: Path) -> bytes | None:
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _write_once(path: Path, data: bytes) -> None:
+    """临时文件 + link: 目标已存在 (他人先写) 时放弃本次写入。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_bytes(data)
+    try:
+        os.link(tmp, path)
+    except FileExistsError:
+        pass
+    except OSError:
+        # 文件系统不支持硬链接: 退化为原子替换
+        os.replace(tmp, path)
+        return
+    tmp.unlink(missing_ok=True)
+
+
+# 进程内单例
+_store = RasterStore()
+
+
+def get_raster_store() -> RasterStore:
+    return _store
@@ -0,0 +1,247 @@
+"""
+全局页面调度器 (跨 Job 公平共享)。对齐: Pipeline 详设 §5.1
+
+进程内所有 Job 的 LLM 阶段页面共享一个全局并发预算:
+- 优先级类 (严格优先): reprocess-page > 新上传 > 整单重处理
+- 同一优先级内两级加权公平队列: 先在商户间、再在商户的 Job 间
+  按虚拟时间 (已服务页数 / 权重) 最小者出队; 重新激活的流虚拟时间对齐到
+  当前虚拟时钟, 空闲期间不积累额度
+- 每页排队等待时间 → Histogram (按优先级) + 按 Job 汇总 (job_wait_stats)
+"""
+from __future__ import annotations
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+import structlog
+from prometheus_client import Gauge, Histogram
+
+logger = structlog.get_logger()
+
+PIPELINE_GLOBAL_CONCURRENCY = int(os.environ.get("PIPELINE_GLOBAL_CONCURRENCY", "8"))
+
+PRIORITY_PAGE = "reprocess_page"
+PRIORITY_UPLOAD = "upload"
+PRIORITY_REPROCESS = "reprocess"
+PRIORITY_ORDER = (PRIORITY_PAGE, PRIORITY_UPLOAD, PRIORITY_REPROCESS)
+
+QUEUE_WAIT_SECONDS = Histogram(
+    "pdf_scheduler_queue_wait_seconds",
+    "Time a page waits for a global pipeline slot", ["priority"],
+    buckets=(0.01, 0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600))
+SLOTS_IN_USE = Gauge(
+    "pdf_scheduler_slots_in_use", "Global pipeline slots in use")
+PAGES_WAITING = Gauge(
+    "pdf_scheduler_pages_waiting", "Pages waiting for a global slot", ["priority"])
+
+
+@dataclass
+class _Waiter:
+    job_id: str
+    merchant_id: str
+    priority: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _Flow:
+    """公平队列中的一个流 (商户或 Job)。"""
+    weight: float = 1.0
+    vtime: float = 0.0
+
+
+@dataclass
+class JobWaitStats:
+    pages: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "pages": self.pages,
+            "total_wait_s": round(self.total_wait, 3),
+            "avg_wait_s": round(self.total_wait / self.pages, 3) if self.pages else 0.0,
+            "max_wait_s": round(self.max_wait, 3),
+        }
+
+
+class PageScheduler:
+    """全局页面并发预算 + 加权公平排队。"""
+
+    def __init__(self, capacity: int = PIPELINE_GLOBAL_CONCURRENCY) -> None:
+        self._capacity = max(1, capacity)
+        self._in_use = 0
+        # priority → merchant → job → deque[_Waiter]
+        self._queues: dict[str, dict[str, dict[str, deque[_Waiter]]]] = {
+            p: {} for p in PRIORITY_ORDER}
+        self._merchant_flows: dict[tuple[str, str], _Flow] = {}
+        self._job_flows: dict[tuple[str, str, str], _Flow] = {}
+        self._merchant_clock: dict[str, float] = {}
+        self._job_clock: dict[tuple[str, str], float] = {}
+        self._merchant_weights: dict[str, float] = {}
+        self._job_weights: dict[str, float] = {}
+        self._stats: dict[str, JobWaitStats] = {}
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def set_capacity(self, capacity: int) -> None:
+        self._capacity = max(1, capacity)
+        self._dispatch()
+
+    def set_merchant_weight(self, merchant_id: str, weight: float) -> None:
+        self._merchant_weights[merchant_id] = max(0.01, weight)
+
+    def set_job_weight(self, job_id: str, weight: float) -> None:
+        self._job_weights[job_id] = max(0.01, weight)
+
+    def waiting(self, priority: str | None = None) -> int:
+        prios = [priority] if priority else PRIORITY_ORDER
+        return sum(len(q) for p in prios
+                   for jobs in self._queues[p].values() for q in jobs.values())
+
+    @asynccontextmanager
+    async def slot(self, job_id: str, merchant_id: str = "",
+                   priority: str = PRIORITY_UPLOAD):
+        """占用一个全局页面槽位 (async with)。"""
+        await self.acquire(job_id, merchant_id, priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, job_id: str, merchant_id: str = "",
+                      priority: str = PRIORITY_UPLOAD) -> None:
+        if priority not in self._queues:
+            priority = PRIORITY_UPLOAD
+        if self._in_use < self._capacity and not self.waiting():
+            self._grant(job_id, priority, 0.0)
+            return
+
+        waiter = _Waiter(job_id=job_id, merchant_id=merchant_id or "",
+                         priority=priority,
+                         future=asyncio.get_running_loop().create_future())
+        self._enqueue(waiter)
+        PAGES_WAITING.labels(priority=priority).inc()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 已被授予槽位但调用方取消 → 归还
+                self.release()
+            elif self._remove(waiter):
+                PAGES_WAITING.labels(priority=priority).dec()
+            raise
+
+    def release(self) -> None:
+        self._in_use = max(0, self._in_use - 1)
+        SLOTS_IN_USE.set(self._in_use)
+        self._dispatch()
+
+    def job_wait_stats(self, job_id: str) -> dict:
+        return self._stats.get(job_id, JobWaitStats()).to_dict()
+
+    def forget_job(self, job_id: str) -> dict:
+        """Job 结束: 返回并清理其等待统计与权重。"""
+        self._job_weights.pop(job_id, None)
+        for key in [k for k in self._job_flows if k[2] == job_id]:
+            del self._job_flows[key]
+        return self._stats.pop(job_id, JobWaitStats()).to_dict()
+
+    # ─── internals ───
+
+    def _grant(self, job_id: str, priority: str, wait: float) -> None:
+        self._in_use += 1
+        SLOTS_IN_USE.set(self._in_use)
+        QUEUE_WAIT_SECONDS.labels(priority=priority).observe(wait)
+        st = self._stats.setdefault(job_id, JobWaitStats())
+        st.pages += 1
+        st.total_wait += wait
+        st.max_wait = max(st.max_wait, wait)
+
+    def _enqueue(self, w: _Waiter) -> None:
+        merchants = self._queues[w.priority]
+        if w.merchant_id not in merchants:
+            merchants[w.merchant_id] = {}
+            self._activate(self._merchant_flows, (w.priority, w.merchant_id),
+                           self._merchant_clock.get(w.priority, 0.0),
+                           self._merchant_weights.get(w.merchant_id, 1.0))
+        jobs = merchants[w.merchant_id]
+        if w.job_id not in jobs:
+            jobs[w.job_id] = deque()
+            self._activate(self._job_flows, (w.priority, w.merchant_id, w.job_id),
+                           self._job_clock.get((w.priority, w.merchant_id), 0.0),
+                           self._job_weights.get(w.job_id, 1.0))
+        jobs[w.job_id].append(w)
+
+    @staticmethod
+    def _activate(flows: dict, key: tuple, clock: float, weight: float) -> None:
+        """流 (重新) 激活: 虚拟时间不低于当前虚拟时钟。"""
+        flow = flows.setdefault(key, _Flow())
+        flow.weight = weight
+        flow.vtime = max(flow.vtime, clock)
+
+    def _remove(self, w: _Waiter) -> bool:
+        jobs = self._queues[w.priority].get(w.merchant_id)
+        if not jobs or w.job_id not in jobs:
+            return False
+        try:
+            jobs[w.job_id].remove(w)
+        except ValueError:
+            return False
+        self._prune(w.priority, w.merchant_id, w.job_id)
+        return True
+
+    def _prune(self, priority: str, merchant_id: str, job_id: str) -> None:
+        merchants = self._queues[priority]
+        jobs = merchants[merchant_id]
+        if not jobs[job_id]:
+            del jobs[job_id]
+        if not jobs:
+            del merchants[merchant_id]
+
+    def _pick(self) -> _Waiter | None:
+        for priority in PRIORITY_ORDER:
+            merchants = self._queues[priority]
+            if not merchants:
+                continue
+            merchant_id = min(
+                merchants, key=lambda m: self._merchant_flows[(priority, m)].vtime)
+            jobs = merchants[merchant_id]
+            job_id = min(
+                jobs, key=lambda j: self._job_flows[(priority, merchant_id, j)].vtime)
+            mflow = self._merchant_flows[(priority, merchant_id)]
+            jflow = self._job_flows[(priority, merchant_id, job_id)]
+            self._merchant_clock[priority] = mflow.vtime
+            self._job_clock[(priority, merchant_id)] = jflow.vtime
+            mflow.vtime += 1.0 / mflow.weight
+            jflow.vtime += 1.0 / jflow.weight
+            waiter = jobs[job_id].popleft()
+            self._prune(priority, merchant_id, job_id)
+            return waiter
+        return None
+
+    def _dispatch(self) -> None:
+        while self._in_use < self._capacity:
+            waiter = self._pick()
+            if waiter is None:
+                return
+            PAGES_WAITING.labels(priority=waiter.priority).dec()
+            if waiter.future.done():
+                continue
+            self._grant(waiter.job_id, waiter.priority,
+                        time.monotonic() - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+
+# 全局单例
+page_scheduler = PageScheduler()
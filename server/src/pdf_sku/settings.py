@@ -54,14 +54,34 @@ class Settings(BaseSettings):
     default_llm_client: str = ""  # 留空则自动选择: gemini > qwen > openrouter
     llm_daily_budget_usd: float = 50.0
     llm_timeout_seconds: int = 60
+    llm_response_cache_enabled: bool = False  # 响应缓存 (按操作 TTL, 见 llm_adapter.response_cache)
+    llm_response_cache_lru_size: int = 512
+    # 操作 → TTL (秒), 未列出的操作不缓存; 环境变量以 JSON 覆盖
+    llm_response_cache_ttls: dict[str, int] = {
+        "evaluate_document": 86400 * 7,
+        "evaluate_page": 86400 * 7,
+        "classify_page": 86400 * 3,
+        "identify_boundaries": 86400,
+        "extract_sku_attrs": 86400,
+        "extract_sku_single": 86400,
+    }
 
     # === Collaboration ===
     wecom_webhook_url: str = ""
     dingtalk_webhook_url: str = ""
 
+    # === Events ===
+    event_bus_backend: str = "memory"  # memory | redis_stream (持久化事件, 见 gateway.event_stream)
+    event_bus_queue_size: int = 0  # >0 时每个订阅者独立有界队列, publish 入队即返回
+    event_bus_overflow: str = "block"  # block | drop_oldest | drop_newest (仅 lossy 订阅者, 如 SSE)
+
     # === Output ===
     downstream_import_url: str = ""
     downstream_check_url: str = ""
+    downstream_bulk_import_url: str = ""  # 配置后按批提交 (见 output.import_adapter)
+    downstream_bulk_size: int = 50
+    downstream_bulk_check_url: str = ""  # 对账批量状态查询
+    downstream_http2: bool = True
 
     # === Langfuse ===
     langfuse_public_key: str = ""
@@ -73,6 +93,11 @@ class Settings(BaseSettings):
     layout_detect_enabled: bool = True
     layout_detect_confidence: float = 0.25
 
+    # === Pipeline ===
+    page_raster_transport: str = "png"  # png | shm (原始 RGB 经共享内存回传)
+    image_payload_transport: str = "inline"  # inline | spill (图片字节外置到 JOB_DATA_DIR)
+    eval_adaptive_sampling: bool = False  # 评估 C_doc 置信区间落入单一路由带即停止采样
+
     # === Paths ===
     tus_upload_dir: str = "/data/tus-uploads"
     job_data_dir: str = "/data/jobs"
@@ -1,21 +1,38 @@
 """本地文件存储（开发环境）。对齐: 接口契约 §2.9 StorageProvider"""
+import asyncio
 import os
+import shutil
+
 import aiofiles
 
+from pdf_sku.storage.metrics import timed
+
 class LocalStorageProvider:
     def __init__(self, base_dir: str = "/tmp/pdf-sku-storage"):
         self.base_dir = base_dir; os.makedirs(base_dir, exist_ok=True)
 
+    async def ensure_bucket(self) -> None:
+        os.makedirs(self.base_dir, exist_ok=True)
+
     async def save_file(self, path: str, data: bytes) -> str:
         full = os.path.join(self.base_dir, path)
-        os.makedirs(os.path.dirname(full), exist_ok=True)
-        async with aiofiles.open(full, "wb") as f:
-            await f.write(data)
+        with timed("local", "save_file"):
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            async with aiofiles.open(full, "wb") as f:
+                await f.write(data)
+        return full
+
+    async def save_file_from_path(self, object_name: str, file_path: str) -> str:
+        full = os.path.join(self.base_dir, object_name)
+        with timed("local", "save_file_from_path"):
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            await asyncio.to_thread(shutil.copyfile, file_path, full)
         return full
 
     async def read_file(self, path: str) -> bytes:
-        async with aiofiles.open(os.path.join(self.base_dir, path), "rb") as f:
-            return await f.read()
+        with timed("local", "read_file"):
+            async with aiofiles.open(os.path.join(self.base_dir, path), "rb") as f:
+                return await f.read()
 
     async def delete_file(self, path: str) -> bool:
         try: os.remove(os.path.join(self.base_dir, path)); return True
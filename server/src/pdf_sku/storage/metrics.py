@@ -0,0 +1,23 @@
+"""存储操作计量 (各 StorageProvider 共用)。"""
+from __future__ import annotations
+import contextlib
+import time
+from typing import Iterator
+
+from prometheus_client import Histogram
+
+STORAGE_OP_SECONDS = Histogram(
+    "pdf_storage_op_seconds", "Object storage operation latency",
+    ["provider", "operation"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+
+@contextlib.contextmanager
+def timed(provider: str, operation: str) -> Iterator[None]:
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        STORAGE_OP_SECONDS.labels(provider=provider, operation=operation).observe(
+            time.perf_counter() - t0)
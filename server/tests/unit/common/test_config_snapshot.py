@@ -0,0 +1,143 @@
+"""配置快照测试: 未订阅直读 / 订阅后命中 / 发布变更跨进程失效。"""
+import asyncio
+import json
+
+import pytest
+
+from pdf_sku.common.config_snapshot import CONFIG_CHANNEL, ConfigSnapshot
+from pdf_sku.llm_adapter import provider_config
+from pdf_sku.llm_adapter.provider_config import (
+    LLMProviderEntry, get_provider_entries, set_provider_entries,
+)
+
+
+class FakeRedis:
+    """最小 Redis: get/set + pub/sub, 记录 GET 次数。"""
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.gets = 0
+        self.subscribers: list[asyncio.Queue] = []
+
+    async def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+    async def set(self, key, value):
+        self.data[key] = value
+
+    async def publish(self, channel, message):
+        for q in self.subscribers:
+            q.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(self.subscribers)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    def __init__(self, redis: FakeRedis):
+        self._redis = redis
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        assert channel == CONFIG_CHANNEL
+        self._redis.subscribers.append(self._queue)
+
+    async def listen(self):
+        while True:
+            yield await self._queue.get()
+
+    async def aclose(self):
+        if self._queue in self._redis.subscribers:
+            self._redis.subscribers.remove(self._queue)
+
+
+async def _start(snapshot: ConfigSnapshot, redis: FakeRedis) -> asyncio.Task:
+    task = asyncio.create_task(snapshot.run(redis))
+    while not redis.subscribers:
+        await asyncio.sleep(0)
+    return task
+
+
+async def _stop(task: asyncio.Task) -> None:
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_bypass_without_subscription():
+    redis, snap = FakeRedis(), ConfigSnapshot()
+    redis.data["k"] = json.dumps({"a": 1})
+    assert await snap.get(redis, "k") == {"a": 1}
+    assert await snap.get(redis, "k") == {"a": 1}
+    assert redis.gets == 2
+
+
+@pytest.mark.asyncio
+async def test_hit_after_first_read_including_missing_key():
+    redis, snap = FakeRedis(), ConfigSnapshot()
+    redis.data["k"] = json.dumps([1, 2])
+    task = await _start(snap, redis)
+    try:
+        for _ in range(3):
+            assert await snap.get(redis, "k") == [1, 2]
+            assert await snap.get(redis, "absent") is None
+        assert redis.gets == 2
+    finally:
+        await _stop(task)
+    # 订阅结束后回到直读
+    await snap.get(redis, "k")
+    assert redis.gets == 3
+
+
+@pytest.mark.asyncio
+async def test_publish_invalidates_other_process():
+    redis = FakeRedis()
+    writer, reader = ConfigSnapshot(), ConfigSnapshot()
+    task = await _start(reader, redis)
+    try:
+        redis.data["k"] = json.dumps(1)
+        assert await reader.get(redis, "k") == 1
+        redis.data["k"] = json.dumps(2)
+        assert await reader.get(redis, "k") == 1  # 未通知前读快照
+        await writer.publish_change(redis, "k")
+        await asyncio.sleep(0)
+        assert await reader.get(redis, "k") == 2
+    finally:
+        await _stop(task)
+
+
+@pytest.mark.asyncio
+async def test_max_age_forces_reload():
+    redis, snap = FakeRedis(), ConfigSnapshot(max_age=0)
+    task = await _start(snap, redis)
+    try:
+        await snap.get(redis, "k")
+        await snap.get(redis, "k")
+        assert redis.gets == 2
+    finally:
+        await _stop(task)
+
+
+@pytest.mark.asyncio
+async def test_provider_entries_served_from_snapshot(monkeypatch):
+    redis, snap = FakeRedis(), ConfigSnapshot()
+    monkeypatch.setattr(provider_config, "config_snapshot", snap)
+    task = await _start(snap, redis)
+    try:
+        await set_provider_entries(redis, [LLMProviderEntry(
+            name="a", provider_type="gemini", access_mode="direct")])
+        await asyncio.sleep(0)
+        assert [e.name for e in await get_provider_entries(redis)] == ["a"]
+        gets = redis.gets
+        await get_provider_entries(redis)
+        assert redis.gets == gets
+
+        await set_provider_entries(redis, [LLMProviderEntry(
+            name="b", provider_type="qwen", access_mode="direct")])
+        await asyncio.sleep(0)
+        assert [e.name for e in await get_provider_entries(redis)] == ["b"]
+    finally:
+        await _stop(task)
@@ -0,0 +1,33 @@
+"""序贯采样提前停止判定测试。"""
+import uuid
+from types import SimpleNamespace
+
+from pdf_sku.evaluator.router import EvaluatorService
+from pdf_sku.evaluator.scorer import DEFAULT_WEIGHTS, PageScore
+
+THRESHOLDS = {"A": 0.85, "B": 0.45}
+
+
+def _check():
+    svc = EvaluatorService(llm_service=None, cache=None, config_provider=None,
+                           adaptive_sampling=True)
+    job = SimpleNamespace(job_id=uuid.uuid4())
+    return svc._early_stop_check(job, None, THRESHOLDS, 0.0, 0.08)
+
+
+def _pages(values):
+    return [PageScore(page_no=i, overall=v, dimensions={d: v for d in DEFAULT_WEIGHTS})
+            for i, v in enumerate(values, 1)]
+
+
+def test_clear_cut_document_stops():
+    stop = _check()
+    assert not stop(_pages([0.95] * 6))  # 未达最少页数
+    assert stop(_pages([0.94, 0.95, 0.96] * 3))
+    assert stop(_pages([0.2, 0.25, 0.3] * 3))
+
+
+def test_borderline_or_noisy_document_continues():
+    stop = _check()
+    assert not stop(_pages([0.84, 0.86, 0.85] * 3))  # 区间跨 A
+    assert not stop(_pages([0.9, 0.9, 0.9, 0.9, 0.9, 0.9, 0.9, 0.9, 0.3]))
@@ -50,3 +50,12 @@ def test_boundary_B():
     d = RouteDecider()
     route, _ = d.decide(0.45, {"A": 0.85, "B": 0.45})
     assert route == "HYBRID"  # >= B
+
+
+def test_settled_route_requires_interval_within_one_band():
+    d = RouteDecider()
+    th = {"A": 0.85, "B": 0.45}
+    assert d.settled_route(0.88, 0.95, th) == "AUTO"
+    assert d.settled_route(0.50, 0.80, th) == "HYBRID"
+    assert d.settled_route(0.80, 0.90, th) is None
+    assert d.settled_route(0.10, 0.44, th) == "HUMAN_ALL"
@@ -71,3 +71,11 @@ def test_feature_weighted_sample(sampler):
 def test_single_page(sampler):
     result = sampler.select_pages(1, blank_pages=[])
     assert result == [1]
+
+
+def test_sequential_order_spreads_prefix(sampler):
+    pages = list(range(1, 41))
+    order = sampler.sequential_order(pages)
+    assert sorted(order) == pages
+    # 前 4 页覆盖文档四个区段
+    assert sorted((p - 1) // 10 for p in order[:4]) == [0, 1, 2, 3]
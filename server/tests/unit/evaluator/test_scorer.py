@@ -61,3 +61,24 @@ def test_c_doc_custom_weights(scorer):
                "layout_structure": 0.0, "table_regularity": 0.0, "sku_density": 0.0}
     c_doc = scorer.compute_c_doc(dims, weights)
     assert c_doc == pytest.approx(1.0, abs=0.01)
+
+
+def test_c_doc_interval_narrows_with_consistent_pages(scorer):
+    dims = {d: 0.9 for d in DEFAULT_WEIGHTS}
+    few = [PageScore(page_no=i, dimensions=dims) for i in range(1, 2)]
+    assert scorer.c_doc_interval(few) == pytest.approx((0.9, 0.0, 1.0))
+
+    pages = [PageScore(page_no=i, dimensions={d: 0.88 + 0.01 * (i % 3) for d in DEFAULT_WEIGHTS})
+             for i in range(1, 10)]
+    c_doc, low, high = scorer.c_doc_interval(pages, prescan_penalty=0.02)
+    assert c_doc == pytest.approx(scorer.compute_c_doc(scorer.aggregate(pages), prescan_penalty=0.02))
+    assert low < c_doc < high
+    assert high - low < 0.02
+
+
+def test_c_doc_interval_skips_fallback_pages(scorer):
+    pages = [PageScore(page_no=i, dimensions={d: 0.9 for d in DEFAULT_WEIGHTS}) for i in (1, 2)]
+    fallback = PageScore(page_no=3, overall=0.5)
+    assert scorer.c_doc_interval(pages + [fallback])[0] == pytest.approx(
+        scorer.compute_c_doc(scorer.aggregate(pages + [fallback])))
+    assert scorer.c_doc_interval([fallback]) == (0.0, 0.0, 1.0)
@@ -0,0 +1,51 @@
+"""评估截图流测试: 有界预渲染 / 剔除空截图 / 渲染异常传递。"""
+import asyncio
+
+import pytest
+
+from pdf_sku.common.rss import PeakRSS
+from pdf_sku.evaluator import router as eval_router
+from pdf_sku.evaluator.router import _ScreenshotStream
+
+
+@pytest.mark.asyncio
+async def test_render_ahead_is_bounded(monkeypatch):
+    monkeypatch.setattr(eval_router, "EVAL_RENDER_AHEAD", 1)
+    rendered = []
+
+    async def render(pages):
+        rendered.append(pages)
+        return [b"png" if p != 5 else b"" for p in pages]
+
+    stream = _ScreenshotStream(render, list(range(1, 13)))
+    it = aiter(stream)
+    first = await anext(it)
+    for _ in range(10):
+        await asyncio.sleep(0)
+    # 已交出 1 组, 队列 1 组, 生产方至多再渲染 1 组等待入队
+    assert len(rendered) <= 3
+    rest = [item async for item in it]
+
+    assert first == ([1, 2, 3], [b"png"] * 3)
+    assert rest[0][0] == [4, 6]  # 空截图页被剔除
+    assert stream.groups == 4
+    assert stream.rendered == 11
+
+
+@pytest.mark.asyncio
+async def test_render_error_propagates_to_consumer():
+    async def render(pages):
+        raise RuntimeError("pool broken")
+
+    with pytest.raises(RuntimeError):
+        [item async for item in _ScreenshotStream(render, [1, 2, 3])]
+
+
+@pytest.mark.asyncio
+async def test_peak_rss_tracks_growth():
+    async with PeakRSS(interval=0.01) as rss:
+        blob = b"x" * (32 * 2**20)
+        await asyncio.sleep(0.05)
+    assert rss.peak >= rss.baseline > 0
+    assert rss.growth >= 16 * 2**20
+    del blob
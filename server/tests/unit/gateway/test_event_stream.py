@@ -0,0 +1,159 @@
+"""Redis Streams 事件后端测试: 消费组投递 / ack / 重投 / 死信。"""
+import asyncio
+
+import pytest
+
+from pdf_sku.gateway import event_stream as es
+from pdf_sku.gateway.event_bus import EventBus
+from pdf_sku.gateway.event_stream import DEAD_LETTER_STREAM, RedisStreamBackend, stream_key
+
+
+class StreamRedis:
+    """最小 Redis Streams 实现 (单消费组, 闲置时间以调用次数近似为 0)。"""
+
+    def __init__(self):
+        self.streams: dict[str, list[tuple[str, dict]]] = {}
+        self.delivered: dict[str, int] = {}  # 下一条未投递下标
+        self.pending: dict[str, dict[str, list]] = {}  # stream → id → [fields, times]
+        self.seq = 0
+
+    async def xadd(self, stream, fields, maxlen=None, approximate=True):
+        self.seq += 1
+        msg_id = f"{self.seq}-0"
+        self.streams.setdefault(stream, []).append((msg_id, dict(fields)))
+        return msg_id
+
+    async def xgroup_create(self, stream, group, id="0", mkstream=False):
+        self.streams.setdefault(stream, [])
+        self.delivered.setdefault(stream, 0)
+        self.pending.setdefault(stream, {})
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        out = []
+        for stream in streams:
+            start = self.delivered[stream]
+            batch = self.streams[stream][start:start + (count or 10)]
+            self.delivered[stream] = start + len(batch)
+            for msg_id, fields in batch:
+                self.pending[stream][msg_id] = [fields, 1]
+            if batch:
+                out.append((stream, batch))
+        await asyncio.sleep(0)  # 模拟 BLOCK: 让出事件循环
+        return out
+
+    async def xack(self, stream, group, msg_id):
+        return 1 if self.pending[stream].pop(msg_id, None) else 0
+
+    async def xautoclaim(self, stream, group, consumer, min_idle_time, start_id="0-0", count=None):
+        seq = lambda msg_id: int(msg_id.split("-")[0])  # noqa: E731
+        ids = sorted((i for i in self.pending[stream] if seq(i) >= seq(start_id)), key=seq)
+        msgs = []
+        for msg_id in ids[:count]:
+            entry = self.pending[stream][msg_id]
+            entry[1] += 1
+            msgs.append((msg_id, entry[0]))
+        return [ids[count] if len(ids) > count else "0-0", msgs, []]
+
+    async def xpending_range(self, stream, group, min, max, count):
+        entry = self.pending[stream].get(min)
+        return [{"message_id": min, "times_delivered": entry[1]}] if entry else []
+
+    async def xpending(self, stream, group):
+        return {"pending": len(self.pending[stream])}
+
+    async def xinfo_groups(self, stream):
+        return [{"name": group_name, "lag": len(self.streams[stream]) - self.delivered[stream]}
+                for group_name in [es.EVENT_STREAM_GROUP]]
+
+
+@pytest.mark.asyncio
+async def test_durable_events_go_through_stream():
+    redis = StreamRedis()
+    bus = EventBus()
+    received, local = [], []
+
+    async def on_page(data):
+        received.append(data["page_no"])
+
+    async def on_sse(data):
+        local.append(data)
+
+    bus.subscribe("PageCompleted", on_page)
+    bus.subscribe("PageStatusChanged", on_sse)
+    backend = RedisStreamBackend(redis, consumer="w1")
+    bus.use_backend(backend)
+
+    await bus.publish("PageCompleted", {"job_id": "j", "page_no": 1})
+    await bus.publish("PageStatusChanged", {"job_id": "j"})
+    assert received == []  # 发布方不再同步执行持久化事件的订阅者
+    assert len(local) == 1  # 非持久化事件仍进程内分发
+    assert len(redis.streams[stream_key("PageCompleted")]) == 1
+
+    task = asyncio.create_task(backend.run(bus))
+    for _ in range(20):
+        await asyncio.sleep(0)
+        if received:
+            break
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    assert received == [1]
+    assert redis.pending[stream_key("PageCompleted")] == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_handler_retried_then_dead_lettered(monkeypatch):
+    monkeypatch.setattr(es, "MAX_DELIVERIES", 3)
+    redis = StreamRedis()
+    bus = EventBus()
+    calls = []
+
+    async def flaky(data):
+        calls.append(data["n"])
+        raise RuntimeError("downstream unavailable")
+
+    bus.subscribe("TaskCompleted", flaky)
+    backend = RedisStreamBackend(redis, consumer="w1")
+    stream = stream_key("TaskCompleted")
+    await backend._ensure_group(stream)
+    await backend.append("TaskCompleted", {"n": 7})
+
+    resp = await redis.xreadgroup("g", "w1", {stream: ">"})
+    msg_id, fields = resp[0][1][0]
+    assert not await backend._handle(bus, "TaskCompleted", msg_id, fields)
+    assert msg_id in redis.pending[stream]  # 未 ack, 等待重投
+
+    await backend._reclaim(bus, "TaskCompleted")  # 第 2 次投递
+    await backend._reclaim(bus, "TaskCompleted")  # 第 3 次投递
+    assert msg_id in redis.pending[stream]
+    await backend._reclaim(bus, "TaskCompleted")  # 超限 → 死信
+    assert redis.pending[stream] == {}
+    assert redis.streams[DEAD_LETTER_STREAM][0][1]["event_type"] == "TaskCompleted"
+    assert calls == [7, 7, 7]
+
+
+@pytest.mark.asyncio
+async def test_reclaim_follows_cursor_across_passes(monkeypatch):
+    monkeypatch.setattr(es, "READ_COUNT", 4)
+    monkeypatch.setattr(es, "RECLAIM_MAX_PAGES", 2)
+    redis = StreamRedis()
+    bus = EventBus()
+    calls = []
+
+    async def failing(data):
+        calls.append(data["n"])
+        raise RuntimeError("downstream unavailable")
+
+    bus.subscribe("TaskCompleted", failing)
+    backend = RedisStreamBackend(redis, consumer="w1")
+    stream = stream_key("TaskCompleted")
+    await backend._ensure_group(stream)
+    for n in range(12):
+        await backend.append("TaskCompleted", {"n": n})
+    await redis.xreadgroup("g", "w1", {stream: ">"}, count=12)
+
+    await backend._reclaim(bus, "TaskCompleted")  # 前 2 批
+    assert calls == list(range(8))
+    await backend._reclaim(bus, "TaskCompleted")  # 从游标继续, 扫完后回绕
+    assert calls == list(range(12))
+    await backend._reclaim(bus, "TaskCompleted")
+    assert calls[12:] == list(range(8))
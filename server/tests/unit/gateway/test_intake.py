@@ -0,0 +1,48 @@
+"""Intake 单次遍历测试: 校验 + 安全检查 + hash + 预筛一次返回。"""
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+import pytest
+
+from pdf_sku.gateway.intake import run_intake
+from pdf_sku.gateway.prescanner import Prescanner
+
+
+@pytest.fixture
+def mixed_pdf(tmp_path) -> str:
+    p = tmp_path / "mixed.pdf"
+    doc = fitz.open()
+    doc.new_page()  # 空白页
+    for i in range(2):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Catalog page {i}\nSKU-00{i} Chair $19.99\n" * 3)
+    doc.save(str(p))
+    doc.close()
+    return str(p)
+
+
+def test_intake_single_pass(mixed_pdf):
+    result = run_intake(mixed_pdf)
+    assert result.validation.valid and result.validation.page_count == 3
+    assert result.security.safe
+    with open(mixed_pdf, "rb") as f:
+        assert result.file_hash == hashlib.sha256(f.read()).hexdigest()
+    assert result.prescan.blank_pages == [1]
+    assert set(result.prescan.page_fingerprints) == {2, 3}
+    assert result.prescan.raw_metrics == Prescanner().scan_file(mixed_pdf).raw_metrics
+
+
+def test_intake_rejects_non_pdf(tmp_path):
+    p = tmp_path / "x.pdf"
+    p.write_bytes(b"not a pdf at all")
+    result = run_intake(str(p))
+    assert not result.validation.valid
+    assert result.validation.errors[0].code == "INVALID_MIME"
+    assert result.security is None and result.prescan is None
+
+
+def test_intake_in_process_pool(mixed_pdf):
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        result = pool.submit(run_intake, mixed_pdf).result(timeout=60)
+    assert result.prescan.raw_metrics["total_pages"] == 3
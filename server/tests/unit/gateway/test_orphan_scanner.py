@@ -0,0 +1,65 @@
+"""孤儿重提测试: 按来源状态选择重新评估 / 断点续跑, 事件在提交后发布。"""
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from pdf_sku.common.models import PDFJob, StateTransition
+from pdf_sku.gateway import orphan_scanner as scanner_mod
+from pdf_sku.gateway.orphan_scanner import OrphanScanner
+
+
+class FakeRedis:
+    async def scan(self, cursor=0, match=None, count=None):
+        return 0, ["worker:heartbeat:w2"]
+
+    async def set(self, key, value, ex=None):
+        return True
+
+
+async def _orphan(factory, origin: str) -> str:
+    jid = uuid4()
+    async with factory() as db:
+        async with db.begin():
+            db.add(PDFJob(job_id=jid, merchant_id="m", source_file="t.pdf",
+                          file_hash=f"h{jid.hex[:8]}", total_pages=2, route="AI_ONLY",
+                          status="ORPHANED", user_status="PROCESSING", worker_id="w1"))
+            db.add(StateTransition(entity_type="job", entity_id=str(jid),
+                                   from_status=origin, to_status="ORPHANED",
+                                   trigger="heartbeat_scan"))
+    return str(jid)
+
+
+@pytest.fixture
+def published(engine, monkeypatch):
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    events: list[tuple[str, dict, str]] = []
+
+    async def publish(name, payload):
+        # 记录发布时其他会话可见的 Job 状态 (验证已提交)
+        async with factory() as db:
+            status = (await db.execute(select(PDFJob.status).where(
+                PDFJob.job_id == payload["job_id"]))).scalar_one()
+        events.append((name, payload, status))
+
+    monkeypatch.setattr(scanner_mod.event_bus, "publish", publish)
+    return factory, events
+
+
+@pytest.mark.asyncio
+async def test_evaluating_orphan_is_reevaluated(published):
+    factory, events = published
+    jid = await _orphan(factory, "EVALUATING")
+    await OrphanScanner(factory, FakeRedis())._auto_requeue(jid, set())
+    assert [(name, status) for name, _, status in events] == [("JobCreated", "UPLOADED")]
+
+
+@pytest.mark.asyncio
+async def test_processing_orphan_resumes_after_commit(published):
+    factory, events = published
+    jid = await _orphan(factory, "PROCESSING")
+    await OrphanScanner(factory, FakeRedis())._auto_requeue(jid, set())
+    [(name, payload, status)] = events
+    assert (name, status) == ("JobRequeued", "PROCESSING")
+    assert payload["resume"] and payload["route"] == "AI_ONLY"
@@ -46,3 +46,12 @@ async def test_penalties(prescanner, blank_pdf):
 async def test_raw_metrics_keys(prescanner, text_pdf):
     result = await prescanner.scan(text_pdf)
     assert {"total_pages", "blank_page_count", "blank_rate", "ocr_rate", "image_count"}.issubset(result.raw_metrics.keys())
+
+@pytest.mark.asyncio
+async def test_page_fingerprints(prescanner, text_pdf, blank_pdf):
+    result = await prescanner.scan(text_pdf)
+    again = await prescanner.scan(text_pdf)
+    assert set(result.page_fingerprints) == {1, 2}
+    assert result.page_fingerprints[1] != result.page_fingerprints[2]
+    assert result.page_fingerprints == again.page_fingerprints
+    assert (await prescanner.scan(blank_pdf)).page_fingerprints == {}
@@ -0,0 +1,157 @@
+"""SSE 推送测试: 页面事件合并 / Last-Event-ID 续传 / 终态关闭 / 跨 worker 广播。"""
+import asyncio
+
+import orjson
+import pytest
+
+from pdf_sku.gateway.event_bus import EventBus
+from pdf_sku.gateway.sse_manager import SSEManager
+
+
+class PubSubRedis:
+    """最小 Redis: Stream (xadd/xrange) + pub/sub (psubscribe 前缀匹配)。"""
+
+    def __init__(self):
+        self.streams: dict[str, list[tuple[str, dict]]] = {}
+        self.subscribers: list[asyncio.Queue] = []
+        self.seq = 0
+
+    async def xadd(self, stream, fields, maxlen=None, approximate=True):
+        self.seq += 1
+        msg_id = f"{self.seq}-0"
+        entries = self.streams.setdefault(stream, [])
+        entries.append((msg_id, dict(fields)))
+        if maxlen:
+            del entries[:-maxlen]
+        return msg_id
+
+    async def xrange(self, stream, min="-", max="+"):
+        after = tuple(int(x) for x in min.lstrip("(").split("-"))
+        return [(i, f) for i, f in self.streams.get(stream, [])
+                if tuple(int(x) for x in i.split("-")) > after]
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def publish(self, channel, message):
+        for q in self.subscribers:
+            q.put_nowait({"type": "pmessage", "channel": channel, "data": message})
+        return len(self.subscribers)
+
+    def pubsub(self):
+        return _PubSub(self)
+
+
+class _PubSub:
+    def __init__(self, redis):
+        self._redis = redis
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def psubscribe(self, pattern):
+        self._redis.subscribers.append(self._queue)
+
+    async def listen(self):
+        while True:
+            yield await self._queue.get()
+
+    async def aclose(self):
+        self._redis.subscribers.remove(self._queue)
+
+
+async def _collect(gen, n):
+    frames = []
+    async for sse in gen:
+        if sse.event == "heartbeat":
+            continue
+        frames.append(sse)
+        if len(frames) == n:
+            break
+    return frames
+
+
+async def _settle(rounds=5):
+    for _ in range(rounds):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_page_events_coalesced_into_one_frame():
+    bus = EventBus()
+    mgr = SSEManager(bus=bus, coalesce_interval=0.01)
+    reader = asyncio.create_task(_collect(mgr.subscribe_job("j1"), 1))
+    await _settle()
+
+    for page_no in (1, 2, 3, 2):
+        await bus.publish("PageStatusChanged",
+                          {"job_id": "j1", "page_no": page_no, "status": "AI_PROCESSING"})
+    frames = await asyncio.wait_for(reader, 1)
+
+    assert frames[0].event == "pages_batch_update"
+    data = orjson.loads(frames[0].data)
+    assert data["count"] == 3
+    assert [p["page_no"] for p in data["pages"]] == [1, 2, 3]
+    assert "_event_type" not in data["pages"][0]
+
+
+@pytest.mark.asyncio
+async def test_job_event_flushes_pages_and_closes_on_terminal():
+    bus = EventBus()
+    mgr = SSEManager(bus=bus, coalesce_interval=60)
+    reader = asyncio.create_task(_collect(mgr.subscribe_job("j1"), 10))
+    await _settle()
+
+    await bus.publish("PageStatusChanged", {"job_id": "j1", "page_no": 1, "status": "DONE"})
+    await bus.publish("JobStatusChanged", {"job_id": "j1", "status": "FULL_IMPORTED"})
+    frames = await asyncio.wait_for(reader, 1)
+
+    # 页面帧先于 Job 帧 (无需等合并间隔), 终态帧后流结束
+    assert [f.event for f in frames] == ["pages_batch_update", "job_completed", "job_completed"]
+    assert mgr.active_connections == 0
+
+
+@pytest.mark.asyncio
+async def test_resume_from_last_event_id():
+    bus = EventBus()
+    mgr = SSEManager(bus=bus)
+    for i in range(3):
+        await bus.publish("HumanNeeded", {"job_id": "j1", "task": i})
+
+    reader = asyncio.create_task(_collect(mgr.subscribe_job("j1", last_event_id="1"), 3))
+    await _settle()
+    await bus.publish("HumanNeeded", {"job_id": "j1", "task": 3})
+    frames = await asyncio.wait_for(reader, 1)
+
+    assert [orjson.loads(f.data)["task"] for f in frames] == [1, 2, 3]
+    assert [f.id for f in frames] == ["2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_frames_fan_out_across_workers_via_redis():
+    redis = PubSubRedis()
+    producer = SSEManager(redis=redis, bus=EventBus())
+    bus = EventBus()
+    consumer = SSEManager(redis=redis, bus=bus)  # 连接所在 worker, 事件不经其本地总线
+    runner = asyncio.create_task(consumer.run())
+    await _settle()
+
+    await producer._bus.publish("HumanNeeded", {"job_id": "j1", "task": 0})
+    reader = asyncio.create_task(_collect(consumer.subscribe_job("j1", last_event_id="0-0"), 2))
+    await _settle()
+    await producer._bus.publish("JobFailed", {"job_id": "j1", "status": "EVAL_FAILED"})
+    frames = await asyncio.wait_for(reader, 1)
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+    assert [f.event for f in frames] == ["human_needed", "job_failed"]
+    assert frames[0].id == "1-0"  # 补发自环形缓冲
+    assert redis.subscribers == []
+
+
+@pytest.mark.asyncio
+async def test_malformed_last_event_id_skips_replay():
+    redis = PubSubRedis()
+    mgr = SSEManager(redis=redis, bus=EventBus())
+    redis.streams["sse:ring:j1"] = [("1-0", {"event": "heartbeat", "data": "{}"})]
+    for bad in ("abc", "1-0) OR", "12", "-1-0"):
+        assert await mgr._replay("j1", bad) == []
+    assert [f["id"] for f in await mgr._replay("j1", "0-0")] == ["1-0"]
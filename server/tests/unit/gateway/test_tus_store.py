@@ -0,0 +1,213 @@
+"""TUS 上传测试: 增量 SHA-256 (含跨 worker 补算) / 首分片 PDF magic 校验 / 流式写入。"""
+import base64
+import hashlib
+
+import pytest
+
+from pdf_sku.gateway import tus_store as tus_mod
+from pdf_sku.gateway.tus_handler import (
+    ChecksumFailedError, InvalidUploadTypeError, TusHandler, UploadTooLargeError,
+)
+from pdf_sku.gateway.tus_store import TusStore
+
+
+class HashRedis:
+    """最小 Redis 哈希实现 (decode_responses=True 语义)。"""
+
+    def __init__(self):
+        self.h: dict[str, dict[str, str]] = {}
+
+    async def hset(self, key, field=None, value=None, mapping=None):
+        d = self.h.setdefault(key, {})
+        if mapping:
+            d.update({k: str(v) for k, v in mapping.items()})
+        if field is not None:
+            d[field] = str(value)
+
+    async def hget(self, key, field):
+        return self.h.get(key, {}).get(field)
+
+    async def hgetall(self, key):
+        return dict(self.h.get(key, {}))
+
+    async def expire(self, key, ttl):
+        return True
+
+    async def delete(self, key):
+        self.h.pop(key, None)
+
+
+@pytest.fixture
+def redis(tmp_path, monkeypatch):
+    monkeypatch.setattr(tus_mod, "TUS_UPLOAD_DIR", tmp_path)
+    return HashRedis()
+
+
+@pytest.mark.asyncio
+async def test_incremental_hash_across_workers(redis):
+    data = b"%PDF-1.7\n" + bytes(range(256)) * 4000
+    worker_a, worker_b = TusStore(redis), TusStore(redis)
+    handler_a, handler_b = TusHandler(worker_a), TusHandler(worker_b)
+    upload_id = await handler_a.handle_creation(len(data), {"filename": "a.pdf"})
+
+    cut = len(data) // 3
+    await handler_a.handle_patch(upload_id, 0, data[:cut])
+    # 第二个分片落到另一个 worker: 从磁盘补算前缀
+    await handler_b.handle_patch(upload_id, cut, data[cut:2 * cut])
+    offset, done = await handler_b.handle_patch(upload_id, 2 * cut, data[2 * cut:])
+
+    assert done and offset == len(data)
+    meta = await worker_b.get_metadata(upload_id)
+    assert meta["status"] == "complete"
+    assert meta["file_hash"] == hashlib.sha256(data).hexdigest()
+    assert upload_id not in worker_b._hashers
+
+
+@pytest.mark.asyncio
+async def test_first_chunk_magic_rejected(redis):
+    store = TusStore(redis)
+    handler = TusHandler(store)
+    upload_id = await handler.handle_creation(100, {"filename": "fake.pdf"})
+    with pytest.raises(InvalidUploadTypeError):
+        await handler.handle_patch(upload_id, 0, b"PK\x03\x04 zip pretending")
+    with pytest.raises(FileNotFoundError):
+        await store.get_offset(upload_id)
+
+
+@pytest.mark.asyncio
+async def test_cleanup_evicts_abandoned_hashers(redis):
+    data = b"%PDF-1.7\n" + b"x" * 3000
+    worker_a, worker_b = TusStore(redis), TusStore(redis)
+    handler_a, handler_b = TusHandler(worker_a), TusHandler(worker_b)
+    moved = await handler_a.handle_creation(len(data), {"filename": "a.pdf"})
+    await handler_a.handle_patch(moved, 0, data[:1000])
+    idle = await handler_a.handle_creation(len(data), {"filename": "b.pdf"})
+    await handler_a.handle_patch(idle, 0, data[:1000])
+    gone = await handler_a.handle_creation(len(data), {"filename": "c.pdf"})
+    await handler_a.handle_patch(gone, 0, data[:1000])
+
+    # moved 由 worker_b 续传完成; gone 已被其他 worker 删除
+    await handler_b.handle_patch(moved, 1000, data[1000:])
+    await worker_b.delete(gone)
+    assert set(worker_a._hashers) == {moved, idle, gone}
+
+    await worker_a.cleanup_expired()
+    assert set(worker_a._hashers) == {idle}
+
+
+def test_magic_prefix_of_tiny_chunk():
+    assert TusHandler._has_pdf_magic(b"%PD")
+    assert not TusHandler._has_pdf_magic(b"GIF")
+
+
+async def _stream(data: bytes, piece: int, fail_after: int | None = None):
+    for i in range(0, len(data), piece):
+        if fail_after is not None and i >= fail_after:
+            raise ConnectionResetError("client disconnected")
+        yield data[i:i + piece]
+
+
+@pytest.mark.asyncio
+async def test_streamed_patch_batches_offset_flush(redis, monkeypatch):
+    monkeypatch.setattr(tus_mod, "WRITE_BATCH_BYTES", 4096)
+    monkeypatch.setattr(tus_mod, "OFFSET_FLUSH_BYTES", 16384)
+    data = b"%PDF-1.7\n" + bytes(range(256)) * 400
+    store = TusStore(redis)
+    upload_id = await TusHandler(store).handle_creation(len(data), {"filename": "a.pdf"})
+    # 预分配到声明长度
+    assert store.get_file_path(upload_id).stat().st_size == len(data)
+
+    writes = []
+    orig = store._flush_offset
+
+    async def spy(key, offset):
+        writes.append(offset)
+        await orig(key, offset)
+    store._flush_offset = spy
+
+    offset, done = await TusHandler(store).handle_patch(upload_id, 0, _stream(data, 1000))
+    assert done and offset == len(data)
+    assert len(writes) < len(data) // 1000  # offset 批量回写, 非逐片
+    assert writes[-1] == len(data)
+    assert store.get_file_path(upload_id).read_bytes() == data
+    assert (await store.get_metadata(upload_id))["file_hash"] == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_keeps_written_offset(redis, monkeypatch):
+    monkeypatch.setattr(tus_mod, "WRITE_BATCH_BYTES", 2048)
+    data = b"%PDF-1.7\n" + bytes(range(256)) * 40
+    store = TusStore(redis)
+    handler = TusHandler(store)
+    upload_id = await handler.handle_creation(len(data), {"filename": "a.pdf"})
+
+    with pytest.raises(ConnectionResetError):
+        await handler.handle_patch(upload_id, 0, _stream(data, 1024, fail_after=5120))
+    resumed = await store.get_offset(upload_id)
+    assert resumed == 5120
+
+    offset, done = await handler.handle_patch(upload_id, resumed, data[resumed:])
+    assert done
+    assert (await store.get_metadata(upload_id))["file_hash"] == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_checksum_mismatch_rolls_back(redis):
+    data = b"%PDF-1.7\n" + b"x" * 5000
+    store = TusStore(redis)
+    handler = TusHandler(store)
+    upload_id = await handler.handle_creation(len(data), {"filename": "a.pdf"})
+
+    bad = "sha1 " + base64.b64encode(hashlib.sha1(b"other").digest()).decode()
+    with pytest.raises(ChecksumFailedError):
+        await handler.handle_patch(upload_id, 0, _stream(data, 700), bad)
+    assert await store.get_offset(upload_id) == 0
+
+    good = "sha1 " + base64.b64encode(hashlib.sha1(data).digest()).decode()
+    offset, done = await handler.handle_patch(upload_id, 0, _stream(data, 700), good)
+    assert done and offset == len(data)
+
+
+@pytest.mark.asyncio
+async def test_disconnect_with_checksum_discards_chunk(redis, monkeypatch):
+    monkeypatch.setattr(tus_mod, "WRITE_BATCH_BYTES", 2048)
+    monkeypatch.setattr(tus_mod, "OFFSET_FLUSH_BYTES", 2048)
+    data = b"%PDF-1.7\n" + bytes(range(256)) * 40
+    store = TusStore(redis)
+    handler = TusHandler(store)
+    upload_id = await handler.handle_creation(len(data), {"filename": "a.pdf"})
+
+    good = "sha1 " + base64.b64encode(hashlib.sha1(data).digest()).decode()
+    with pytest.raises(ConnectionResetError):
+        await handler.handle_patch(upload_id, 0, _stream(data, 1024, fail_after=5120), good)
+    assert await store.get_offset(upload_id) == 0  # 未校验的部分数据不计入 offset
+
+    offset, done = await handler.handle_patch(upload_id, 0, _stream(data, 1024), good)
+    assert done and offset == len(data)
+    assert (await store.get_metadata(upload_id))["file_hash"] == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_preallocation_capped(redis, monkeypatch):
+    monkeypatch.setattr(tus_mod, "PREALLOCATE_MAX_BYTES", 1024)
+    store = TusStore(redis)
+    upload_id = await TusHandler(store).handle_creation(1 << 30, {"filename": "big.pdf"})
+    assert store.get_file_path(upload_id).stat().st_size <= 1024
+
+
+@pytest.mark.asyncio
+async def test_streamed_magic_and_length_guards(redis):
+    store = TusStore(redis)
+    handler = TusHandler(store)
+    upload_id = await handler.handle_creation(100, {"filename": "a.pdf"})
+    with pytest.raises(UploadTooLargeError):
+        await handler.handle_patch(upload_id, 0, _stream(b"%PDF-" + b"0" * 200, 50))
+    assert await store.get_offset(upload_id) == 0  # 超长分片整体回退
+    offset, done = await handler.handle_patch(upload_id, 0, b"%PDF-" + b"0" * 95)
+    assert done and offset == 100
+
+    upload_id = await handler.handle_creation(100, {"filename": "b.pdf"})
+    with pytest.raises(InvalidUploadTypeError):
+        await handler.handle_patch(upload_id, 0, _stream(b"%PDX-not a pdf", 2))
+    with pytest.raises(FileNotFoundError):
+        await store.get_offset(upload_id)
@@ -0,0 +1,98 @@
+"""文档评估并发分批 / 序贯提前停止测试。"""
+import asyncio
+import json
+
+import pytest
+
+from pdf_sku.llm_adapter.client.base import LLMResponse
+from pdf_sku.llm_adapter.service import LLMService
+
+
+class _Prompt:
+    def get_prompt(self, name, variables=None):
+        return name
+
+
+class _Parser:
+    def parse_eval_scores(self, content):
+        return json.loads(content)
+
+
+def _service(score=0.9, delay=0.01):
+    svc = LLMService(prompt_engine=_Prompt(), parser=_Parser(), circuit_breaker=None)
+    calls = {"n": 0, "active": 0, "peak": 0}
+
+    async def fake_call(operation, prompt, images=None, **_):
+        calls["n"] += 1
+        calls["active"] += 1
+        calls["peak"] = max(calls["peak"], calls["active"])
+        await asyncio.sleep(delay)
+        calls["active"] -= 1
+        return LLMResponse(content=json.dumps([{"overall": score}] * len(images)))
+
+    svc._call_llm = fake_call
+    return svc, calls
+
+
+@pytest.mark.asyncio
+async def test_batches_dispatched_concurrently_in_order():
+    svc, calls = _service()
+    pages = list(range(1, 41))
+    scores = await svc.evaluate_document([b"x"] * 40, sample_pages=pages, concurrency=4)
+    assert [s.page_no for s in scores] == pages
+    assert calls["n"] == 14
+    assert calls["peak"] == 4
+
+
+@pytest.mark.asyncio
+async def test_stop_when_skips_remaining_batches():
+    svc, calls = _service()
+    seen = []
+
+    def stop_when(scores):
+        seen.append(len(scores))
+        return len(scores) >= 12
+
+    scores = await svc.evaluate_document([b"x"] * 40, stop_when=stop_when, concurrency=2)
+    assert seen[-1] >= 12 and all(n < 12 for n in seen[:-1])
+    # 停止后不再派发, 已发出的 (至多 concurrency 批) 照常完成
+    assert 4 <= calls["n"] <= 6
+    assert len(scores) == calls["n"] * 3
+
+
+@pytest.mark.asyncio
+async def test_stream_pulls_batches_only_when_a_slot_frees():
+    svc, calls = _service(delay=0.02)
+    pulled = []
+
+    async def batches():
+        for i in range(5):
+            pulled.append(i)
+            yield [i * 3 + 1, i * 3 + 2, i * 3 + 3], [b"x"] * 3
+
+    async def watch():
+        while calls["n"] < 1:
+            await asyncio.sleep(0)
+        return list(pulled)
+
+    watcher = asyncio.create_task(watch())
+    scores = await svc.evaluate_stream(batches(), concurrency=1, planned_pages=15)
+    assert await watcher == [0]  # 首批在途时未预先拉取后续截图
+    assert [s.page_no for s in scores] == list(range(1, 16))
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_cancels_in_flight_calls():
+    svc = LLMService(prompt_engine=_Prompt(), parser=_Parser(), circuit_breaker=None)
+    started = []
+
+    async def flaky(operation, prompt, images=None, **_):
+        started.append(1)
+        if len(started) == 1:
+            raise RuntimeError("provider down")
+        await asyncio.sleep(10)
+
+    svc._call_llm = flaky
+    with pytest.raises(RuntimeError):
+        await asyncio.wait_for(
+            svc.evaluate_document([b"x"] * 9, concurrency=3), timeout=1)
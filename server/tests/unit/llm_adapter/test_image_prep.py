@@ -0,0 +1,110 @@
+"""VLM 图片载荷准备测试: 缩放 / 重编码 / 缓存 / MIME 识别。"""
+import io
+import json
+
+import httpx
+import pytest
+from PIL import Image
+
+from pdf_sku.llm_adapter.client.base import ImagePayload, encode_image
+from pdf_sku.llm_adapter.client.openai_compat import OpenAICompatClient
+from pdf_sku.llm_adapter.image_prep import ImagePreparer, ImageProfile, encode_for_profile
+from pdf_sku.llm_adapter.provider_config import LLMProviderConfig
+
+
+def _png(w=2480, h=1754):
+    # 近似扫描页: 噪声底纹 (PNG 难以压缩)
+    im = Image.effect_noise((w, h), 40).convert("RGB")
+    buf = io.BytesIO()
+    im.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_downscale_and_reencode_to_jpeg():
+    png = _png()
+    out = encode_for_profile(png, ImageProfile(max_edge=1024, fmt="jpeg", quality=80))
+    assert out.mime == "image/jpeg"
+    assert Image.open(io.BytesIO(out.data)).size == (1024, 724)
+    assert len(out.data) < len(png)
+
+
+def test_original_format_keeps_bytes_and_fixes_mime():
+    png = _png(100, 50)
+    out = encode_for_profile(png, ImageProfile())
+    assert out == ImagePayload(png, "image/png")
+    assert encode_image(png)[0] == "image/png"  # 未经准备的原始 bytes 也按文件头标注
+
+
+def test_profile_from_config_clamps_values():
+    cfg = LLMProviderConfig(image_max_edge=-5, image_format="tiff", image_quality=300)
+    assert ImageProfile.from_config(cfg) == ImageProfile(max_edge=0, fmt="original", quality=100)
+
+
+@pytest.mark.asyncio
+async def test_encoded_payload_cached_per_profile():
+    prep = ImagePreparer()
+    png = _png(800, 600)
+    small = ImageProfile(max_edge=400, fmt="jpeg")
+    first = await prep.prepare([png], small, "gemini")
+    again = await prep.prepare([png], small, "gemini")
+    assert first[0] is again[0]
+    other = await prep.prepare([png], ImageProfile(max_edge=200, fmt="jpeg"), "qwen")
+    assert Image.open(io.BytesIO(other[0].data)).size == (200, 150)
+
+
+@pytest.mark.asyncio
+async def test_openai_compat_sends_prepared_mime():
+    sent = {}
+
+    def handler(request):
+        sent["body"] = request.content
+        return httpx.Response(200, json={"choices": [{"message": {"content": "{}"}}]})
+
+    client = OpenAICompatClient(api_key="k", api_base="http://llm", model="gemini-2.5-flash")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    await client.complete("p", images=[ImagePayload(b"\x89PNG\r\n\x1a\nxx", "image/png")])
+    assert b"data:image/png;base64," in sent["body"]
+
+
+class _BoxClient:
+    """按收到图片的像素尺寸回答 bbox (模拟 VLM 以输入分辨率定位)。"""
+    provider = "qwen"
+    model_id = "qwen-vl"
+
+    def __init__(self, box):
+        self.box = box  # 原图像素坐标
+        self.sizes = []
+
+    async def complete(self, prompt, images=None, **_):
+        from pdf_sku.llm_adapter.client.base import LLMResponse
+        img = images[0]
+        w, h = Image.open(io.BytesIO(img.data)).size
+        self.sizes.append((w, h))
+        s = w / 1240
+        return LLMResponse(content=json.dumps([{
+            "boundary_id": 1, "bbox": [round(v * s) for v in self.box],
+            "text_content": "Chair", "confidence": 0.9}]))
+
+
+@pytest.mark.asyncio
+async def test_boundary_bbox_round_trips_under_downscale(monkeypatch):
+    from pdf_sku.llm_adapter import service as service_mod
+    from pdf_sku.llm_adapter.resilience.circuit_breaker import CircuitBreaker
+    from pdf_sku.llm_adapter.service import LLMService
+    from pdf_sku.pipeline.extractor.two_stage import TwoStageExtractor
+
+    box = [100, 900, 600, 1600]
+    client = _BoxClient(box)
+    monkeypatch.setattr(service_mod, "get_client", lambda name: client)
+    svc = LLMService(prompt_engine=None, parser=None, circuit_breaker=CircuitBreaker(),
+                     default_client_name="qwen")
+    screenshot = _png(1240, 1754)  # A4 @150 DPI, 长边超过 qwen 默认 1344
+
+    boundaries = await TwoStageExtractor(svc).identify_boundaries([], None, screenshot)
+    assert client.sizes == [(1240, 1754)]
+    assert list(boundaries[0].bbox) == box
+
+    # 不返回坐标的操作仍按 provider 配置缩放, 并记录缩放比例
+    payload = (await svc._images.prepare(
+        [screenshot], ImageProfile(max_edge=1344, fmt="jpeg"), "qwen"))[0]
+    assert payload.scale == pytest.approx(1344 / 1754)
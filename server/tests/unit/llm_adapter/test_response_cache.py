@@ -0,0 +1,183 @@
+"""LLM 响应缓存测试: 两级命中 / 按操作 opt-in / bypass / 预算统计。"""
+import pytest
+
+from pdf_sku.llm_adapter import service as service_mod
+from pdf_sku.llm_adapter.client.base import LLMResponse
+from pdf_sku.llm_adapter.response_cache import LLMResponseCache, bypass_llm_cache
+from pdf_sku.llm_adapter.resilience.circuit_breaker import CircuitBreaker
+from pdf_sku.llm_adapter.service import LLMService
+
+
+class DictRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+
+class FakeClient:
+    provider = "gemini"
+    model_id = "gemini-test"
+
+    def __init__(self):
+        self.calls = 0
+
+    complete_text = ""
+
+    async def complete(self, **_):
+        self.calls += 1
+        return LLMResponse(content=self.complete_text or f'{{"n": {self.calls}}}', model=self.model_id,
+                           usage={"input_tokens": 1000, "output_tokens": 100})
+
+
+class FakeBudget:
+    def __init__(self):
+        self.lookups = []
+
+    async def check(self, operation):
+        return None
+
+    async def record_usage(self, cost):
+        return cost
+
+    async def record_cache_lookup(self, hit, saved_usd=0.0):
+        self.lookups.append((hit, saved_usd))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    c = FakeClient()
+    monkeypatch.setattr(service_mod, "get_client", lambda name: c)
+    return c
+
+
+def _service(cache, budget=None):
+    return LLMService(prompt_engine=None, parser=None, circuit_breaker=CircuitBreaker(),
+                      budget_guard=budget, response_cache=cache)
+
+
+@pytest.mark.asyncio
+async def test_hit_skips_provider(client):
+    budget = FakeBudget()
+    svc = _service(LLMResponseCache(DictRedis()), budget)
+    first = await svc.call_llm("classify_page", "p", images=[b"img"])
+    await first.commit_cache()
+    second = await svc.call_llm("classify_page", "p", images=[b"img"])
+    assert client.calls == 1
+    assert second.cached and second.content == first.content
+    # 图片不同 → 未命中
+    await svc.call_llm("classify_page", "p", images=[b"img2"])
+    assert client.calls == 2
+    assert [hit for hit, _ in budget.lookups] == [False, True, False]
+    assert budget.lookups[1][1] > 0
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_shared_across_processes(client):
+    redis = DictRedis()
+    await (await _service(LLMResponseCache(redis)).call_llm("evaluate_page", "p")).commit_cache()
+    resp = await _service(LLMResponseCache(redis)).call_llm("evaluate_page", "p")
+    assert client.calls == 1 and resp.cached
+
+
+@pytest.mark.asyncio
+async def test_uncached_operation_and_bypass(client):
+    svc = _service(LLMResponseCache(DictRedis()))
+    await (await svc.call_llm("custom_op", "p")).commit_cache()
+    await svc.call_llm("custom_op", "p")
+    assert client.calls == 2
+
+    await (await svc.call_llm("extract_sku_single", "p")).commit_cache()
+    with bypass_llm_cache():
+        fresh = await svc.call_llm("extract_sku_single", "p")
+    await fresh.commit_cache()
+    assert client.calls == 4 and not fresh.cached
+    # bypass 的结果回写, 后续读到最新响应
+    again = await svc.call_llm("extract_sku_single", "p", bypass_cache=False)
+    assert again.content == fresh.content and client.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_ttl():
+    cache = LLMResponseCache(None, max_entries=2, ttls={"op": 60, "short": -1})
+    for k in ("a", "b", "c"):
+        await cache.put(k, "op", LLMResponse(content=k))
+    assert await cache.get("a", "op") is None
+    assert (await cache.get("c", "op")).content == "c"
+    await cache.put("s", "short", LLMResponse(content="s"))
+    assert await cache.get("s", "short") is None
+
+
+@pytest.mark.asyncio
+async def test_uncommitted_response_not_cached(client):
+    svc = _service(LLMResponseCache(DictRedis()))
+    bad = await svc.call_llm("classify_page", "p")  # 调用方解析失败, 未提交
+    assert bad.pending_cache is not None
+    resp = await svc.call_llm("classify_page", "p")
+    assert client.calls == 2 and not resp.cached
+
+
+@pytest.mark.asyncio
+async def test_eval_batch_commits_only_parsed_scores(client):
+    from pdf_sku.llm_adapter.parser.response_parser import ResponseParser
+
+    svc = LLMService(prompt_engine=None, parser=ResponseParser(),
+                     circuit_breaker=CircuitBreaker(), response_cache=LLMResponseCache(DictRedis()))
+    client.complete_text = "not json"
+    await svc._evaluate_batch("p", 0, [b"img"], [1], total=1)
+    await svc._evaluate_batch("p", 0, [b"img"], [1], total=1)
+    assert client.calls == 2  # 无法解析的回复未缓存, 重试会重新调用
+
+
+class PipelineRedis:
+    """记录 pipeline 往返次数的最小 Redis (hash 计数)。"""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, float]] = {}
+        self.round_trips = 0
+
+    def pipeline(self):
+        return _Pipe(self)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def get(self, key):
+        return None
+
+
+class _Pipe:
+    def __init__(self, redis):
+        self._redis = redis
+        self._ops = []
+
+    def hincrby(self, key, field, n):
+        self._ops.append((key, field, n))
+
+    hincrbyfloat = hincrby
+
+    def expire(self, key, seconds):
+        pass
+
+    async def execute(self):
+        self._redis.round_trips += 1
+        for key, field, n in self._ops:
+            h = self._redis.hashes.setdefault(key, {})
+            h[field] = h.get(field, 0) + n
+
+
+@pytest.mark.asyncio
+async def test_budget_cache_lookup_single_round_trip():
+    from pdf_sku.llm_adapter.resilience.budget_guard import BudgetGuard
+
+    redis = PipelineRedis()
+    guard = BudgetGuard(redis, daily_budget_usd=10)
+    await guard.record_cache_lookup(False)
+    await guard.record_cache_lookup(True, 0.5)
+    assert redis.round_trips == 2
+    status = await guard.get_status()
+    assert (status["cache_hits"], status["cache_misses"], status["cache_saved_usd"]) == (1, 1, 0.5)
@@ -1,4 +1,7 @@
-"""ImportAdapter 常量 + ImportResult 测试。"""
+"""ImportAdapter 常量 + ImportResult + 连接池 / 批量导入测试。"""
+import httpx
+import pytest
+
 from pdf_sku.output.import_adapter import (
     ImportAdapter, ImportResult, ImportDataError, ImportServerError,
 )
@@ -36,3 +39,57 @@ def test_import_server_error():
         raise ImportServerError("500")
     except ImportServerError as e:
         assert "500" in str(e)
+
+
+@pytest.mark.asyncio
+async def test_client_shared_across_imports():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers["Idempotency-Key"])
+        return httpx.Response(201)
+
+    adapter = ImportAdapter(import_url="http://down/import",
+                            transport=httpx.MockTransport(handler))
+    r1 = await adapter.import_sku({"sku_id": "a"})
+    client = adapter._client
+    r2 = await adapter.import_sku({"sku_id": "b"}, revision=2)
+    assert r1.confirmed and r2.confirmed
+    assert adapter._client is client  # 连接池复用
+    assert seen == ["a_v1", "b_v2"]
+    await adapter.aclose()
+    assert adapter._client is None
+
+
+@pytest.mark.asyncio
+async def test_import_batch_maps_item_results():
+    def handler(request: httpx.Request) -> httpx.Response:
+        import json
+        items = json.loads(request.content)["items"]
+        assert [i["idempotency_key"] for i in items] == ["a_v1", "b_v1", "c_v1"]
+        return httpx.Response(200, json={"results": [
+            {"sku_id": "a", "status": 201},
+            {"sku_id": "b", "status": 400, "error": "missing name"},
+        ]})
+
+    adapter = ImportAdapter(import_url="http://down/import", bulk_url="http://down/bulk",
+                            transport=httpx.MockTransport(handler))
+    assert adapter.bulk_enabled
+    a, b, c = await adapter.import_batch([{"sku_id": "a"}, {"sku_id": "b"}, {"sku_id": "c"}])
+    assert a.confirmed
+    assert b.error == "missing name" and not b.confirmed
+    assert c.status_code == 202 and not c.confirmed and c.error is None
+
+
+@pytest.mark.asyncio
+async def test_check_status_batch_bulk_endpoint():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"results": [
+            {"job_id": "j", "page": 1, "confirmed": True},
+            {"job_id": "j", "page": 2, "confirmed": False},
+        ]})
+
+    adapter = ImportAdapter(bulk_check_url="http://down/check/bulk",
+                            transport=httpx.MockTransport(handler))
+    assert await adapter.check_status_batch([("j", 1), ("j", 2), ("j", 3)]) == [True, False, None]
+    assert await ImportAdapter().check_status_batch([("j", 1)]) == [None]
@@ -1,7 +1,13 @@
-"""IncrementalImporter 测试 (无 DB)。"""
+"""IncrementalImporter 测试: payload / 并发导入 / 批量去重 / bulk 模式。"""
+import asyncio
+import uuid
+
 import pytest
+from sqlalchemy import select
+
+from pdf_sku.common.models import ImportDedup
 from pdf_sku.output.importer import IncrementalImporter
-from pdf_sku.output.import_adapter import ImportAdapter
+from pdf_sku.output.import_adapter import ImportAdapter, ImportDataError, ImportResult
 from pdf_sku.pipeline.ir import PageResult, SKUResult
 
 
@@ -28,3 +34,66 @@ def test_no_valid_skus():
     # valid_skus filter
     valid = [s for s in result.skus if s.validity == "valid"]
     assert len(valid) == 0
+
+
+class _ConcurrentAdapter(ImportAdapter):
+    def __init__(self, bulk_size: int = 0):
+        super().__init__(import_url="http://down", bulk_url="http://bulk" if bulk_size else "",
+                         bulk_size=bulk_size or 50)
+        self.calls: list[list[str]] = []
+        self.in_flight = self.peak = 0
+
+    async def import_sku(self, payload, image_uris=None, revision=1):
+        self.calls.append([payload["sku_id"]])
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if payload["sku_id"].endswith("bad"):
+            raise ImportDataError("4xx: 400")
+        return ImportResult(confirmed=True, status_code=201)
+
+    async def import_batch(self, payloads, revision=1):
+        self.calls.append([p["sku_id"] for p in payloads])
+        return [ImportResult(confirmed=False, status_code=202) for _ in payloads]
+
+
+def _page(n: int, bad: int = 0) -> PageResult:
+    skus = [SKUResult(sku_id=f"s{i}", validity="valid") for i in range(n)]
+    skus += [SKUResult(sku_id=f"s{i}bad", validity="valid") for i in range(bad)]
+    return PageResult(status="AI_COMPLETED", skus=skus)
+
+
+async def _statuses(db, job_id):
+    rows = await db.execute(select(ImportDedup.dedup_key, ImportDedup.import_status)
+                            .where(ImportDedup.job_id == uuid.UUID(job_id)))
+    return dict(rows.all())
+
+
+@pytest.mark.asyncio
+async def test_page_import_concurrent_and_deduped(db):
+    job_id = str(uuid.uuid4())
+    adapter = _ConcurrentAdapter()
+    importer = IncrementalImporter(adapter=adapter)
+
+    ok = await importer.import_page_incremental(db, job_id, 1, _page(12, bad=1))
+    assert not ok  # 含数据错误 SKU
+    assert adapter.peak > 1
+    statuses = await _statuses(db, job_id)
+    assert len(statuses) == 13
+    assert statuses[f"{job_id}:1:s0bad:1"] == "FAILED"
+
+    adapter.calls.clear()
+    await importer.import_page_incremental(db, job_id, 1, _page(12, bad=1))
+    assert adapter.calls == []  # 全部命中去重
+
+
+@pytest.mark.asyncio
+async def test_page_import_bulk_mode(db):
+    job_id = str(uuid.uuid4())
+    adapter = _ConcurrentAdapter(bulk_size=5)
+    ok = await IncrementalImporter(adapter=adapter).import_page_incremental(
+        db, job_id, 2, _page(12))
+    assert ok
+    assert sorted(len(c) for c in adapter.calls) == [2, 5, 5]
+    assert set((await _statuses(db, job_id)).values()) == {"ASSUMED"}
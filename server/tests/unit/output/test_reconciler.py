@@ -0,0 +1,74 @@
+"""ReconciliationPoller 测试: keyset 分批 / 批量探测 / 集合 UPDATE / I5 降级。"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from pdf_sku.common.models import Page
+from pdf_sku.output import reconciler as rec_mod
+from pdf_sku.output.import_adapter import ImportAdapter
+from pdf_sku.output.reconciler import ReconciliationPoller
+
+
+class _BatchAdapter(ImportAdapter):
+    def __init__(self, confirmed_pages: set[int], available: bool = True):
+        super().__init__(check_url="http://down/check" if available else "")
+        self.confirmed_pages = confirmed_pages
+        self.batches: list[int] = []
+
+    async def check_status_batch(self, pages, concurrency=16):
+        self.batches.append(len(pages))
+        if not self.check_enabled:
+            return [None] * len(pages)
+        return [p in self.confirmed_pages for _, p in pages]
+
+
+async def _seed(db, n: int, claimed_at: datetime) -> uuid.UUID:
+    job_id = uuid.uuid4()
+    db.add_all([Page(job_id=job_id, page_number=i, status="AI_COMPLETED",
+                     import_confirmation="imported_assumed", claimed_at=claimed_at)
+                for i in range(1, n + 1)])
+    await db.flush()
+    return job_id
+
+
+@pytest.fixture(autouse=True)
+def _skip_job_finalize(monkeypatch):
+    # Job 终态判定不在本测试范围
+    async def _none(self, db):
+        return 0
+    monkeypatch.setattr(ReconciliationPoller, "_check_job_completion", _none)
+
+
+async def _confirmations(db, job_id) -> dict[int, str]:
+    rows = await db.execute(select(Page.page_number, Page.import_confirmation)
+                            .where(Page.job_id == job_id))
+    return dict(rows.all())
+
+
+@pytest.mark.asyncio
+async def test_reconcile_in_keyset_batches(db, monkeypatch):
+    monkeypatch.setattr(rec_mod, "RECONCILE_BATCH_SIZE", 4)
+    job_id = await _seed(db, 10, datetime.now(timezone.utc))
+    adapter = _BatchAdapter(confirmed_pages={2, 5, 9})
+
+    stats = await ReconciliationPoller(adapter).reconcile(db)
+    db.expire_all()
+
+    assert adapter.batches[:3] == [4, 4, 2]
+    assert stats["confirmed"] == 3
+    confirmations = await _confirmations(db, job_id)
+    assert {p for p, c in confirmations.items() if c == "imported_confirmed"} == {2, 5, 9}
+    assert stats["backlog"] >= 7
+
+
+@pytest.mark.asyncio
+async def test_reconcile_auto_confirms_when_downstream_unavailable(db):
+    old = datetime.now(timezone.utc) - timedelta(days=2)
+    job_id = await _seed(db, 3, old)
+    stats = await ReconciliationPoller(_BatchAdapter(set(), available=False)).reconcile(db)
+    db.expire_all()
+
+    assert stats["auto_confirmed"] >= 3
+    assert set((await _confirmations(db, job_id)).values()) == {"imported_confirmed"}
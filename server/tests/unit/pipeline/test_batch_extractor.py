@@ -0,0 +1,66 @@
+"""
+多页批量提取测试: 页号标注输出解析 / 缺页回退 / 用量计量 / 简单页判定。
+"""
+import orjson
+import pytest
+
+from pdf_sku.llm_adapter.client.base import LLMResponse
+from pdf_sku.llm_adapter.usage import record_llm_call
+from pdf_sku.pipeline.extractor import batch_extractor as be
+from pdf_sku.pipeline.extractor.batch_extractor import BatchExtractor, is_simple_page
+from pdf_sku.pipeline.ir import FeatureVector, ParsedPageIR
+
+
+class FakeLLM:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = []
+
+    async def call_llm(self, operation, prompt, images=None, **_):
+        self.calls.append((operation, len(images or [])))
+        resp = LLMResponse(content=self.payload,
+                           usage={"input_tokens": 900, "output_tokens": 100})
+        record_llm_call(resp)
+        return resp
+
+
+def _pages(*nos):
+    return [(ParsedPageIR(page_no=n, raw_text=f"Chair {n}"), b"png") for n in nos]
+
+
+@pytest.mark.asyncio
+async def test_page_tagged_output_parsed():
+    payload = orjson.dumps([
+        {"page": 3, "products": [{"product_name": "A", "skus": [
+            {"variant_label": "s", "size": "1"}, {"variant_label": "l", "size": "2"}]}]},
+        {"page": "4", "products": [{"product_name": "B", "model_number": "B1"}]},
+        {"page": 99, "products": [{"product_name": "X"}]},
+    ]).decode()
+    llm = FakeLLM(payload)
+    before = be.EXTRACT_LLM_CALLS.labels(mode=be.MODE_BATCH)._value.get()
+
+    res = await BatchExtractor(llm).extract_pages(_pages(3, 4, 5))
+
+    assert llm.calls == [("extract_sku_batch", 3)]
+    assert sorted(res) == [3, 4]  # 第 5 页缺失 → 逐页回退; 99 页不在请求内
+    assert [s.attributes["size"] for s in res[3]] == ["1", "2"]
+    assert res[4][0].attributes["product_name"] == "B"
+    assert all(s.extraction_method == be.BATCH_METHOD for s in res[3] + res[4])
+    assert be.EXTRACT_LLM_CALLS.labels(mode=be.MODE_BATCH)._value.get() == before + 1
+
+
+@pytest.mark.asyncio
+async def test_unparseable_response_returns_empty():
+    assert await BatchExtractor(FakeLLM("sorry, no json")).extract_pages(_pages(1, 2)) == {}
+    # 单页不走批量
+    llm = FakeLLM("[]")
+    assert await BatchExtractor(llm).extract_pages(_pages(1)) == {}
+    assert llm.calls == []
+
+
+def test_simple_page():
+    raw = ParsedPageIR(page_no=1, raw_text="Chair")
+    assert is_simple_page(FeatureVector(image_count=1, text_block_count=4), raw)
+    assert not is_simple_page(FeatureVector(image_count=1, text_block_count=4, table_count=1), raw)
+    assert not is_simple_page(FeatureVector(image_count=6, text_block_count=4), raw)
+    assert not is_simple_page(FeatureVector(image_count=1, text_block_count=40), raw)
@@ -0,0 +1,101 @@
+"""
+bbox sweep 索引测试: 与两两扫描结果一致 + 合成瓦片页微基准 (100 ~ 2000 碎片)。
+"""
+import random
+import time
+
+import numpy as np
+import pytest
+
+from pdf_sku.pipeline.bbox_index import (
+    adjacent_pairs, connected_components, overlap_pairs,
+)
+from pdf_sku.pipeline.ir import ImageInfo
+from pdf_sku.pipeline.page_processor import PageProcessor
+
+
+@pytest.fixture
+def tile_page():
+    """合成瓦片页: 约 n 个碎片排成若干拼贴块, 夹杂重叠副本与孤立小图。"""
+    def make(n: int, seed: int = 7) -> list[ImageInfo]:
+        rng = random.Random(seed)
+        images: list[ImageInfo] = []
+        while len(images) < n:
+            ox, oy = rng.uniform(0, 2000), rng.uniform(0, 2000)
+            cols, rows = rng.randint(2, 8), rng.randint(2, 8)
+            for r in range(rows):
+                for c in range(cols):
+                    x0, y0 = ox + c * 24 + rng.uniform(0, 3), oy + r * 24 + rng.uniform(0, 3)
+                    images.append(ImageInfo(
+                        image_id=f"p1_img{len(images)}", bbox=(x0, y0, x0 + 22, y0 + 22),
+                        width=rng.randint(40, 120), height=rng.randint(40, 120),
+                        short_edge=60, search_eligible=True))
+                    if rng.random() < 0.05:
+                        images.append(ImageInfo(
+                            image_id=f"p1_img{len(images)}",
+                            bbox=(x0 + 1, y0 + 1, x0 + 22, y0 + 22),
+                            width=40, height=40, short_edge=40, search_eligible=True))
+        return images[:n]
+    return make
+
+
+def _naive_overlap(bboxes, min_ratio):
+    return [(i, j) for i in range(len(bboxes)) for j in range(i + 1, len(bboxes))
+            if PageProcessor._bbox_overlap_ratio(bboxes[i], bboxes[j]) > min_ratio]
+
+
+def _naive_adjacent(bboxes, gap):
+    out = []
+    for i, bi in enumerate(bboxes):
+        for j in range(i + 1, len(bboxes)):
+            bj = bboxes[j]
+            if (bi[0] < bj[2] + gap and bj[0] < bi[2] + gap
+                    and bi[1] < bj[3] + gap and bj[1] < bi[3] + gap):
+                out.append((i, j))
+    return out
+
+
+def test_pairs_match_pairwise_scan(tile_page):
+    bboxes = [img.bbox for img in tile_page(300)] + [(5, 5, 5, 5), (0, 0, 0, 0)]
+    assert overlap_pairs(bboxes, 0.7).tolist() == [list(p) for p in _naive_overlap(bboxes, 0.7)]
+    assert adjacent_pairs(bboxes, 5).tolist() == [list(p) for p in _naive_adjacent(bboxes, 5)]
+
+
+def test_connected_components_order():
+    comps = connected_components(5, np.array([[3, 4], [0, 3], [1, 2]]))
+    assert comps == [[0, 3, 4], [1, 2]]
+
+
+def test_dedup_matches_greedy_reference(tile_page):
+    images = tile_page(400)
+    expected = [img.is_duplicate for img in _reference_dedup(tile_page(400))]
+    PageProcessor._dedup_images(images)
+    assert [img.is_duplicate for img in images] == expected
+    assert any(expected)
+
+
+def _reference_dedup(images):
+    active = [img for img in images if not img.is_duplicate and img.search_eligible]
+    for i in range(len(active)):
+        if active[i].is_duplicate:
+            continue
+        for j in range(i + 1, len(active)):
+            if active[j].is_duplicate:
+                continue
+            if PageProcessor._bbox_overlap_ratio(active[i].bbox, active[j].bbox) > 0.7:
+                ai = active[i].width * active[i].height
+                aj = active[j].width * active[j].height
+                loser = active[j] if ai >= aj else active[i]
+                loser.is_duplicate = True
+    return images
+
+
+@pytest.mark.parametrize("n", [100, 500, 2000])
+def test_tile_page_benchmark(tile_page, n):
+    images = tile_page(n)
+    t0 = time.perf_counter()
+    images = PageProcessor._dedup_images(images)
+    merged = PageProcessor._merge_tile_fragments(images, 1)
+    elapsed = time.perf_counter() - t0
+    assert any(m.image_id.startswith("p1_composite_") for m in merged)
+    assert elapsed < 10.0
@@ -0,0 +1,85 @@
+"""
+断点续跑计划测试: 页面状态 + 已落库 SKU → 待处理页 / 节省的 LLM 调用。
+"""
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from pdf_sku.common.models import PDFJob, Page, SKU, Image
+from pdf_sku.pipeline.checkpoint import build_resume_plan, reset_pages
+
+
+async def _job(db, statuses: dict[int, tuple[str, str | None, int]]):
+    jid = uuid4()
+    job = PDFJob(job_id=jid, merchant_id="m", source_file="t.pdf",
+                 file_hash=f"h{jid.hex[:8]}", total_pages=len(statuses) + 1,
+                 status="PROCESSING", user_status="PROCESSING")
+    db.add(job)
+    await db.flush()
+    for no, (status, method, sku_count) in statuses.items():
+        db.add(Page(job_id=jid, page_number=no, status=status,
+                    extraction_method=method, sku_count=sku_count))
+    await db.flush()
+    return job
+
+
+def _sku(jid, page_no, n):
+    return SKU(sku_id=f"{jid.hex[:6]}-{page_no}-{n}", job_id=jid, page_number=page_no,
+               attributes={}, validity="valid")
+
+
+@pytest.mark.asyncio
+async def test_resume_plan(db):
+    job = await _job(db, {
+        1: ("AI_COMPLETED", "two_stage", 2),
+        2: ("AI_COMPLETED", "single_stage", 1),   # SKU 行缺失 → 重跑
+        3: ("AI_FAILED", "two_stage", 0),
+        4: ("AI_PROCESSING", None, 0),
+        5: ("BLANK", None, 0),
+        6: ("HUMAN_QUEUED", None, 0),
+    })
+    jid = job.job_id
+    db.add_all([_sku(jid, 1, 1), _sku(jid, 1, 2)])
+    await db.flush()
+
+    # 第 7 页无 Page 行, 第 5 页同时在 prescan 空白页中
+    plan = await build_resume_plan(db, job, blank_pages=[5])
+    assert plan.completed_pages == [1, 6]
+    assert plan.incomplete_pages == [2]
+    assert plan.pending_pages == [2, 3, 4, 7]
+    assert plan.llm_calls_avoided == 3 + 1
+
+
+@pytest.mark.asyncio
+async def test_reset_pages(db):
+    job = await _job(db, {1: ("AI_COMPLETED", "two_stage", 1),
+                          2: ("AI_COMPLETED", "two_stage", 1)})
+    jid = job.job_id
+    db.add_all([_sku(jid, 1, 1), _sku(jid, 2, 1),
+                Image(image_id=f"{jid.hex[:6]}-img", job_id=jid, page_number=2,
+                      extracted_path="images/x.jpg")])
+    await db.flush()
+
+    await reset_pages(db, jid, [2])
+    left = (await db.execute(select(SKU.page_number).where(SKU.job_id == jid))).scalars().all()
+    assert left == [1]
+    assert not (await db.execute(select(Image).where(Image.job_id == jid))).scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_plan_resume_cleans_every_pending_page(db, monkeypatch):
+    from pdf_sku.pipeline.orchestrator import Orchestrator
+
+    job = await _job(db, {1: ("AI_COMPLETED", "two_stage", 1),
+                          2: ("AI_PROCESSING", None, 0)})   # 中断时已落一部分 SKU
+    jid = job.job_id
+    job.blank_pages = [3]
+    db.add_all([_sku(jid, 1, 1), _sku(jid, 2, 1)])
+    await db.flush()
+
+    monkeypatch.setattr(db, "commit", db.flush)  # 保持在 fixture 事务内
+    pending = await Orchestrator(None)._plan_resume(db, job, job.blank_pages)
+    assert pending == [2]
+    left = (await db.execute(select(SKU.page_number).where(SKU.job_id == jid))).scalars().all()
+    assert left == [1]
@@ -0,0 +1,84 @@
+"""
+Worker 级文档句柄缓存测试。
+"""
+import os
+
+import fitz
+import pytest
+
+from pdf_sku.pipeline.parser.doc_cache import (
+    DocCacheSharedState, DocumentCache,
+)
+
+
+def _make_pdf(path, text="hello"):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 50), text)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def pdfs(tmp_path):
+    return [_make_pdf(tmp_path / f"d{i}.pdf", f"doc {i}") for i in range(3)]
+
+
+def test_hit_and_miss(pdfs):
+    cache = DocumentCache(max_size=4)
+    d1 = cache.open_fitz(pdfs[0])
+    d2 = cache.open_fitz(pdfs[0])
+    assert d1 is d2
+    cache.open_plumber(pdfs[0])
+    s = cache.stats()
+    assert s["hits"] == 1
+    assert s["misses"] == 2
+    assert s["open_docs"] == 2
+
+
+def test_mtime_change_reopens(pdfs):
+    cache = DocumentCache(max_size=4)
+    d1 = cache.open_fitz(pdfs[0])
+    st = os.stat(pdfs[0])
+    os.utime(pdfs[0], ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    d2 = cache.open_fitz(pdfs[0])
+    assert d1 is not d2
+    assert d1.is_closed
+    assert len(cache) == 1
+
+
+def test_lru_bound(pdfs):
+    cache = DocumentCache(max_size=2)
+    first = cache.open_fitz(pdfs[0])
+    cache.open_fitz(pdfs[1])
+    cache.open_fitz(pdfs[2])
+    assert len(cache) == 2
+    assert first.is_closed
+    assert cache.stats()["evictions"] == 1
+
+
+def test_shared_eviction(pdfs):
+    shared = DocCacheSharedState(ring_size=4)
+    worker = DocumentCache(max_size=4)
+    worker.attach(shared)
+    d0 = worker.open_fitz(pdfs[0])
+    worker.open_fitz(pdfs[1])
+
+    shared.publish_eviction(pdfs[0])
+    worker.open_fitz(pdfs[1])
+    assert d0.is_closed
+    assert len(worker) == 1
+    assert shared.hits.value == 1
+    assert shared.misses.value == 2
+
+
+def test_ring_overflow_clears_all(pdfs):
+    shared = DocCacheSharedState(ring_size=2)
+    worker = DocumentCache(max_size=4)
+    worker.attach(shared)
+    d1 = worker.open_fitz(pdfs[1])
+    for p in (pdfs[0], pdfs[0], pdfs[0]):
+        shared.publish_eviction(p)
+    worker.open_fitz(pdfs[2])
+    assert d1.is_closed
@@ -0,0 +1,52 @@
+"""
+解析 + 渲染合并入口测试 (png / 共享内存 RGB 两种栅格传输)。
+"""
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+import pytest
+from PIL import Image
+
+from pdf_sku.pipeline.page_processor import PageProcessor, _extract_and_render_sync
+from pdf_sku.pipeline.parser.raster import RASTER_SHM, SharedRaster
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    doc = fitz.open()
+    page = doc.new_page(width=200, height=100)
+    page.insert_text((20, 50), "Model: XZ-500", fontsize=12)
+    path = tmp_path / "p.pdf"
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_png_transport(pdf_path):
+    ir, shot = _extract_and_render_sync(pdf_path, 1, dpi=72)
+    assert "XZ-500" in ir.raw_text
+    assert shot[:8] == b"\x89PNG\r\n\x1a\n"
+    assert Image.open(io.BytesIO(shot)).size == (200, 100)
+
+
+def test_shm_transport(pdf_path):
+    ir, raster = _extract_and_render_sync(pdf_path, 1, dpi=72, raster=RASTER_SHM)
+    assert isinstance(raster, SharedRaster)
+    assert (raster.width, raster.height) == (200, 100)
+    png = asyncio.run(PageProcessor._materialize_screenshot(raster))
+    assert Image.open(io.BytesIO(png)).size == (200, 100)
+    # 已释放: 再次 release 为空操作
+    raster.release()
+
+
+def test_shm_transport_across_pool(pdf_path):
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        ir, raster = pool.submit(
+            _extract_and_render_sync, pdf_path, 1, 72, RASTER_SHM).result()
+    try:
+        assert "XZ-500" in ir.raw_text
+        assert raster.to_pil().getpixel((0, 0)) == (255, 255, 255)
+    finally:
+        raster.release()
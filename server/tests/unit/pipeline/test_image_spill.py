@@ -0,0 +1,65 @@
+"""
+图片字节 spill 传输测试。
+"""
+import hashlib
+import io
+import os
+import pickle
+
+import fitz
+from PIL import Image
+
+from pdf_sku.pipeline.ir import ImageInfo
+from pdf_sku.pipeline.page_processor import _extract_and_render_sync
+from pdf_sku.pipeline.parser.image_spill import (
+    discard_job_spills, discard_page_spill, spill_images, spill_path,
+)
+
+
+def _png(color, size=(40, 30)):
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_spill_roundtrip(tmp_path):
+    a, b = _png((255, 0, 0)), _png((0, 0, 255))
+    images = [ImageInfo(image_id="a", data=a), ImageInfo(image_id="empty"),
+              ImageInfo(image_id="b", data=b)]
+    path = str(tmp_path / "spill" / "page-1.bin")
+
+    written = spill_images(images, path)
+    assert written == len(a) + len(b)
+    assert all(not img.data for img in images)
+    assert images[1].data_ref is None and not images[1].has_data()
+    assert images[2].data_ref.offset == len(a)
+    assert images[0].image_hash == hashlib.md5(a[:2048]).hexdigest()[:12]
+
+    # 句柄跨进程传递只序列化 offset/length
+    restored = pickle.loads(pickle.dumps(images))
+    assert restored[2].load_data() == b
+    assert restored[0].load_data() == a
+    assert restored[0].data_ref is None
+
+
+def test_extract_with_spill(tmp_path, monkeypatch):
+    monkeypatch.setenv("JOB_DATA_DIR", str(tmp_path / "jobs"))
+    doc = fitz.open()
+    page = doc.new_page(width=300, height=300)
+    page.insert_image(fitz.Rect(10, 10, 210, 160), stream=_png((0, 128, 0), (200, 150)))
+    pdf = tmp_path / "img.pdf"
+    doc.save(str(pdf))
+    doc.close()
+
+    path = spill_path("job1", 1)
+    ir, _ = _extract_and_render_sync(str(pdf), 1, 72, "png", path)
+    assert ir.images
+    img = ir.images[0]
+    assert not img.data and img.data_ref.path == path
+    assert Image.open(io.BytesIO(img.load_data())).size == (200, 150)
+
+    discard_page_spill("job1", 1)
+    assert not os.path.exists(path)
+    spill_images([ImageInfo(data=b"x")], spill_path("job1", 2))
+    discard_job_spills("job1")
+    assert not os.path.exists(os.path.dirname(path))
@@ -0,0 +1,130 @@
+"""
+页级结果缓存测试: 序列化往返 + ID 重写 / 源图片缺失 / 命中率统计 / 处理链接入。
+"""
+import pytest
+
+from pdf_sku.pipeline.ir import (
+    BindingCandidate, BindingResult, ImageInfo, PageResult, ParsedPageIR, SKUResult,
+    TableData,
+)
+from pdf_sku.pipeline.page_cache import (
+    PageResultCache, image_file_path, sku_id_prefix,
+)
+from pdf_sku.pipeline.page_processor import PageProcessor
+
+
+class DictRedis:
+    def __init__(self):
+        self.store: dict[str, bytes] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+
+def _result(job_id: str, page_no: int, file_hash: str) -> PageResult:
+    prefix = sku_id_prefix(file_hash, page_no)
+    img_id = f"p{page_no}_img0"
+    return PageResult(
+        status="AI_COMPLETED", page_type="A",
+        skus=[SKUResult(sku_id=f"{prefix}01", product_id=f"{prefix}P1",
+                        attributes={"name": "Chair"}, source_bbox=(1, 2, 3, 4))],
+        images=[ImageInfo(image_id=img_id, bbox=(0, 0, 10, 10), data=b"jpeg",
+                          search_eligible=True)],
+        bindings=[BindingResult(sku_id=f"{prefix}01", image_id=img_id,
+                                candidates=[BindingCandidate(image_id=img_id)])],
+        llm_model_used="m",
+    )
+
+
+@pytest.fixture
+def job_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("JOB_DATA_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_round_trip_rewrites_ids(job_dir):
+    cache = PageResultCache(DictRedis())
+    src = image_file_path("job-a", "p3_img0")
+    src.parent.mkdir(parents=True)
+    src.write_bytes(b"jpeg-bytes")
+
+    await cache.put("job-a", "fp", "v1", "m", 3, sku_id_prefix("aaaaaaaa11", 3),
+                    _result("job-a", 3, "aaaaaaaa11"))
+    hit = await cache.get("job-b", "fp", "v1", "m", 5, sku_id_prefix("bbbbbbbb22", 5))
+
+    assert hit is not None and hit.fallback_reason == "page_cache_hit"
+    assert hit.skus[0].sku_id == "bbbbbbbb_005_01"
+    assert hit.skus[0].product_id == "bbbbbbbb_005_P1"
+    assert hit.skus[0].source_bbox == (1, 2, 3, 4)
+    assert hit.images[0].image_id == "p5_img0"
+    assert hit.images[0].load_data() == b"jpeg-bytes"
+    assert hit.bindings[0].image_id == "p5_img0"
+    assert hit.bindings[0].candidates[0].image_id == "p5_img0"
+    # 配置版本不同 → 未命中
+    assert await cache.get("job-b", "fp", "v2", "m", 5, "x") is None
+
+
+@pytest.mark.asyncio
+async def test_missing_source_image_is_miss(job_dir):
+    cache = PageResultCache(DictRedis())
+    await cache.put("job-a", "fp", None, "m", 1, sku_id_prefix("h", 1),
+                    _result("job-a", 1, "h"))
+    assert await cache.get("job-b", "fp", None, "m", 1, sku_id_prefix("h", 1)) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_result_not_cached_and_stats(job_dir):
+    redis = DictRedis()
+    cache = PageResultCache(redis)
+    await cache.put("job-a", "fp", None, "m", 1, "p_", PageResult(status="AI_FAILED"))
+    await cache.put("job-a", "fp2", None, "m", 2, "p_", PageResult(status="SKIPPED"))
+    assert len(redis.store) == 1
+
+    assert await cache.get("job-c", "fp", None, "m", 1, "p_") is None
+    assert (await cache.get("job-c", "fp2", None, "m", 2, "p_")).status == "SKIPPED"
+    assert cache.job_stats("job-c") == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    cache.clear_job("job-c")
+    assert cache.job_stats("job-c")["hits"] == 0
+
+
+class _FakeExtractor:
+    def __init__(self):
+        self.calls: list[int] = []
+
+    def extract(self, file_path, page_no):
+        self.calls.append(page_no)
+        return ParsedPageIR(page_no=page_no, tables=[TableData(column_count=3)])
+
+
+def _processor(cache: PageResultCache) -> PageProcessor:
+    pp = PageProcessor(page_cache=cache)
+    pp._extractor = _FakeExtractor()
+    return pp
+
+
+@pytest.mark.asyncio
+async def test_hit_still_feeds_cross_page_context():
+    cache = PageResultCache(DictRedis())
+    await cache.put("job-a", "fp", None, "rules", 4, "p_", PageResult(status="SKIPPED"))
+    pp = _processor(cache)
+
+    result = await pp.process_page("job-b", "x.pdf", 4, page_fingerprint="fp")
+    assert result.fallback_reason == "page_cache_hit"
+    # 下一页的续表检测能看到命中页的表格
+    nxt = ParsedPageIR(page_no=5, tables=[TableData(column_count=3)])
+    assert await pp._xpage.find_continuation("job-b", 5, nxt) is not None
+
+
+@pytest.mark.asyncio
+async def test_bypass_cache_skips_lookup():
+    cache = PageResultCache(DictRedis())
+    await cache.put("job-a", "fp", None, "rules", 4, "p_", PageResult(status="SKIPPED"))
+    pp = _processor(cache)
+
+    prepared = await pp.prepare_page("job-b", "x.pdf", 4, "fp", bypass_cache=True)
+    assert prepared.cached is None and prepared.raw.page_no == 4
+    assert cache.job_stats("job-b")["hits"] == 0
@@ -0,0 +1,49 @@
+"""页级批量持久化测试: 多行 INSERT / 图片文件线程池写盘。"""
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from pdf_sku.common.models import SKU, Image, SKUImageBinding
+from pdf_sku.pipeline.ir import BindingResult, ImageInfo, PageResult, SKUResult
+from pdf_sku.pipeline.persistence import persist_page
+
+
+def _tile_page(n_images: int) -> PageResult:
+    skus = [SKUResult(sku_id=f"s{i}", attributes={"product_name": f"P{i}"},
+                      validity="valid", source_bbox=(0, 0, 10.5, 10))
+            for i in range(5)]
+    skus.append(SKUResult(sku_id="bad", validity="invalid"))
+    images = [ImageInfo(image_id=f"img{i}", data=b"\xff\xd8" + bytes([i % 256]),
+                        bbox=(i, i, i + 5, i + 5), width=50, height=40,
+                        search_eligible=i % 10 != 0)
+              for i in range(n_images)]
+    bindings = [BindingResult(sku_id=f"s{i % 5}", image_id=f"img{i}") for i in range(1, 20)]
+    bindings.append(BindingResult(sku_id="s0", image_id=None))
+    return PageResult(skus=skus, images=images, bindings=bindings)
+
+
+async def _count(db, model, job_id):
+    return (await db.execute(
+        select(func.count()).select_from(model).where(model.job_id == job_id))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_persist_page_bulk(db, tmp_path, monkeypatch):
+    monkeypatch.setenv("JOB_DATA_DIR", str(tmp_path))
+    job_id = uuid.uuid4()
+
+    stats = await persist_page(db, job_id, 3, _tile_page(200))
+
+    assert (stats.skus, stats.images, stats.bindings, stats.files) == (5, 180, 19, 180)
+    assert await _count(db, SKU, job_id) == 5
+    assert await _count(db, Image, job_id) == 180
+    assert await _count(db, SKUImageBinding, job_id) == 19
+
+    sku = (await db.execute(select(SKU).where(SKU.job_id == job_id, SKU.sku_id == "s1"))).scalar_one()
+    assert sku.source_bbox == [0, 0, 10, 10]
+    assert sku.status == "EXTRACTED" and sku.revision == 1  # 列默认值照常生效
+    img = (await db.execute(select(Image).where(Image.image_id == "img7"))).scalar_one()
+    assert img.extracted_path == "images/img7.jpg"
+    assert (tmp_path / str(job_id) / "images" / "img7.jpg").read_bytes() == b"\xff\xd8\x07"
+    assert not (tmp_path / str(job_id) / "images" / "img10.jpg").exists()
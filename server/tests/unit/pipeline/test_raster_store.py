@@ -0,0 +1,94 @@
+"""页面截图存储测试: single-flight / 批量补渲染 / 落盘复用。"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import fitz
+import pytest
+
+from pdf_sku.pipeline.page_processor import PageProcessor
+from pdf_sku.pipeline.raster_store import RasterStore, render_page_png, screenshot_path
+
+
+@pytest.fixture(autouse=True)
+def job_data_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("JOB_DATA_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_render_once():
+    store = RasterStore()
+    calls = []
+
+    async def render():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"png-1"
+
+    results = await asyncio.gather(*(store.get("j", 1, render, caller="api") for _ in range(5)))
+    assert results == [b"png-1"] * 5
+    assert len(calls) == 1
+    assert screenshot_path("j", 1).read_bytes() == b"png-1"
+
+    # 已落盘: 新实例 (其他 worker) 也不再渲染
+    assert await RasterStore().get("j", 1, render, caller="ocr") == b"png-1"
+    assert len(calls) == 1
+    assert list(screenshot_path("j", 1).parent.glob("*.tmp")) == []
+
+
+@pytest.mark.asyncio
+async def test_render_failure_reaches_waiters_and_is_not_cached():
+    store = RasterStore()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise IndexError("out of range")
+
+    results = await asyncio.gather(
+        store.get("j", 9, boom, caller="api"), store.get("j", 9, boom, caller="api"),
+        return_exceptions=True)
+    assert all(isinstance(r, IndexError) for r in results)
+    assert not screenshot_path("j", 9).exists()
+
+
+@pytest.mark.asyncio
+async def test_get_many_renders_only_missing_pages():
+    store = RasterStore()
+    screenshot_path("j", 2).parent.mkdir(parents=True)
+    screenshot_path("j", 2).write_bytes(b"cached-2")
+    batches = []
+
+    async def render_batch(pages):
+        batches.append(pages)
+        return [b"" if p == 3 else f"png-{p}".encode() for p in pages]
+
+    shots = await store.get_many("j", [1, 2, 3], render_batch, caller="evaluator")
+    assert shots == [b"png-1", b"cached-2", b""]
+    assert batches == [[1, 3]]
+    assert screenshot_path("j", 1).exists()
+    assert not screenshot_path("j", 3).exists()  # 渲染失败不落盘
+
+
+@pytest.mark.asyncio
+async def test_prepare_page_reuses_stored_screenshot(tmp_path):
+    doc = fitz.open()
+    doc.new_page(width=200, height=100).insert_text((20, 50), "Model: XZ-500")
+    pdf = tmp_path / "source.pdf"
+    doc.save(str(pdf))
+    doc.close()
+    # 评估 / 截图 API 先渲染
+    shot = render_page_png(str(pdf), 1)
+    screenshot_path("job-1", 1).parent.mkdir(parents=True)
+    screenshot_path("job-1", 1).write_bytes(shot)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pp = PageProcessor(llm_service=None, process_pool=pool)
+        prepared = await pp.prepare_page("job-1", str(pdf), 1)
+        fresh = await pp.prepare_page("job-2", str(pdf), 1)
+
+    assert prepared.screenshot == shot
+    assert "XZ-500" in prepared.raw.raw_text
+    assert fresh.screenshot[:8] == b"\x89PNG\r\n\x1a\n"
+    assert screenshot_path("job-2", 1).read_bytes() == fresh.screenshot
+    with pytest.raises(IndexError):
+        render_page_png(str(pdf), 5)
@@ -0,0 +1,89 @@
+"""
+全局页面调度器测试: 全局预算 / 优先级 / 商户与 Job 间公平性 / 等待统计。
+"""
+import asyncio
+
+import pytest
+
+from pdf_sku.pipeline.scheduler import (
+    PageScheduler, PRIORITY_PAGE, PRIORITY_REPROCESS, PRIORITY_UPLOAD,
+)
+
+
+async def _run_order(sched: PageScheduler, requests: list[tuple[str, str, str]]) -> list[str]:
+    """占满唯一槽位后排入请求, 逐个释放, 返回授予顺序 (job_id)。"""
+    await sched.acquire("blocker")
+    order: list[str] = []
+
+    async def one(job, merchant, prio):
+        async with sched.slot(job, merchant, prio):
+            order.append(job)
+
+    tasks = [asyncio.create_task(one(*r)) for r in requests]
+    await asyncio.sleep(0)
+    sched.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_global_budget():
+    sched = PageScheduler(capacity=3)
+    peak = 0
+
+    async def page():
+        nonlocal peak
+        async with sched.slot("j", "m"):
+            peak = max(peak, sched.in_use)
+            await asyncio.sleep(0.001)
+
+    await asyncio.gather(*[page() for _ in range(20)])
+    assert peak == 3
+    assert sched.in_use == 0
+    assert sched.job_wait_stats("j")["pages"] == 20
+
+
+@pytest.mark.asyncio
+async def test_priority_classes():
+    sched = PageScheduler(capacity=1)
+    order = await _run_order(sched, [
+        ("reproc", "m", PRIORITY_REPROCESS),
+        ("upload", "m", PRIORITY_UPLOAD),
+        ("page", "m", PRIORITY_PAGE),
+    ])
+    assert order == ["page", "upload", "reproc"]
+
+
+@pytest.mark.asyncio
+async def test_big_job_does_not_starve_small_job():
+    sched = PageScheduler(capacity=1)
+    reqs = [("big", "m1", PRIORITY_UPLOAD)] * 10 + [("small", "m2", PRIORITY_UPLOAD)] * 2
+    order = await _run_order(sched, reqs)
+    # 商户间轮转: small 的两页排在前 4 个之内
+    assert [i for i, j in enumerate(order) if j == "small"] == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_jobs_within_merchant_weighted():
+    sched = PageScheduler(capacity=1)
+    sched.set_job_weight("heavy", 2.0)
+    reqs = [("heavy", "m", PRIORITY_UPLOAD)] * 6 + [("light", "m", PRIORITY_UPLOAD)] * 6
+    order = await _run_order(sched, reqs)
+    assert order[:6].count("heavy") == 4
+
+
+@pytest.mark.asyncio
+async def test_cancel_while_waiting():
+    sched = PageScheduler(capacity=1)
+    await sched.acquire("a")
+    waiter = asyncio.create_task(sched.acquire("b"))
+    await asyncio.sleep(0)
+    assert sched.waiting() == 1
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert sched.waiting() == 0
+    sched.release()
+    assert sched.in_use == 0
+    stats = sched.forget_job("a")
+    assert stats["pages"] == 1
@@ -0,0 +1,143 @@
+"""
+Orchestrator 分阶段流水线测试 (解析预取 + LLM 消费)。
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from pdf_sku.pipeline import orchestrator as orch_mod
+from pdf_sku.pipeline.ir import PageResult, ParsedPageIR
+from pdf_sku.pipeline.orchestrator import Orchestrator
+from pdf_sku.pipeline.page_processor import PreparedPage
+from pdf_sku.pipeline.scheduler import PageScheduler
+
+
+class FakeProcessor:
+    def __init__(self, fail_pages=()):
+        self.batches: list[list[int]] = []
+        self.prepared: list[int] = []
+        self.processed: list[tuple[int, bool]] = []
+        self.started: list[int] = []
+        self.max_ahead = 0  # 已解析但尚未进入 LLM 阶段的最大页数
+        self.max_parse_inflight = 0
+        self.bypass: set[bool] = set()
+        self._parse_inflight = 0
+        self._fail = set(fail_pages)
+
+    async def prepare_page(self, job_id, file_path, page_no, bypass_cache=False, **_):
+        self.bypass.add(bypass_cache)
+        self._parse_inflight += 1
+        self.max_parse_inflight = max(self.max_parse_inflight, self._parse_inflight)
+        await asyncio.sleep(0.001)
+        self._parse_inflight -= 1
+        if page_no in self._fail:
+            raise RuntimeError("broken page")
+        self.prepared.append(page_no)
+        self.max_ahead = max(self.max_ahead, len(self.prepared) - len(self.started))
+        return PreparedPage(raw=ParsedPageIR(page_no=page_no), screenshot=b"png")
+
+    def batchable(self, prepared):
+        return prepared is not None and prepared.raw.page_no % 5 != 0
+
+    async def extract_batch(self, pages):
+        self.batches.append([p.raw.page_no for p in pages])
+        for p in pages:
+            p.batch_skus = []
+        return len(pages)
+
+    async def process_page(self, job_id, file_path, page_no, prepared=None,
+                           bypass_cache=False, **_):
+        self.bypass.add(bypass_cache)
+        self.started.append(page_no)
+        await asyncio.sleep(0.01)  # LLM 阶段更慢
+        self.processed.append((page_no, prepared is not None))
+        return PageResult(status="AI_COMPLETED")
+
+
+@asynccontextmanager
+async def _dummy_session():
+    yield SimpleNamespace(commit=_noop)
+
+
+async def _noop(*_a, **_kw):
+    return None
+
+
+async def _one_consumer(*_a, **_kw):
+    return 1
+
+
+def _make(pp, monkeypatch, parse=2, window=3, batch=1):
+    monkeypatch.setattr(orch_mod, "PIPELINE_PARSE_CONCURRENCY", parse)
+    monkeypatch.setattr(orch_mod, "PIPELINE_PREFETCH_WINDOW", window)
+    monkeypatch.setattr(orch_mod, "PIPELINE_BATCH_EXTRACT_SIZE", batch)
+    orch = Orchestrator(pp, db_session_factory=_dummy_session,
+                        scheduler=PageScheduler(capacity=8))
+    orch._on_page_done = _noop
+    return orch
+
+
+@pytest.mark.asyncio
+async def test_prefetch_runs_ahead(monkeypatch):
+    pp = FakeProcessor()
+    orch = _make(pp, monkeypatch)
+    job = SimpleNamespace(job_id="job-1", merchant_id="m1", file_hash="", category=None,
+                          frozen_config_version=None)
+
+    task = asyncio.create_task(orch._process_parallel(job, list(range(1, 11)), "x.pdf"))
+    await asyncio.sleep(0.015)
+    # LLM 阶段 (并发 2) 只完成少量页时, 解析已领先至少一个窗口
+    assert len(pp.prepared) >= len(pp.processed) + 3
+    await task
+
+    # 预取窗口 (3) 是上限: 解析结果不会堆积到全部页
+    assert pp.max_ahead <= 3
+
+    assert sorted(p for p, _ in pp.processed) == list(range(1, 11))
+    assert all(has_prepared for _, has_prepared in pp.processed)
+    assert pp.max_parse_inflight <= 2
+    for stage in (orch_mod.STAGE_PARSE, orch_mod.STAGE_LLM):
+        assert orch_mod.STAGE_QUEUE_DEPTH.labels(stage=stage)._value.get() == 0
+        assert orch_mod.STAGE_INFLIGHT.labels(stage=stage)._value.get() == 0
+
+
+@pytest.mark.asyncio
+async def test_prepare_failure_falls_back(monkeypatch):
+    pp = FakeProcessor(fail_pages={2})
+    orch = _make(pp, monkeypatch, parse=1, window=1)
+    job = SimpleNamespace(job_id="job-2", merchant_id="m1", file_hash="", category=None,
+                          frozen_config_version=None)
+    await orch._process_parallel(job, [1, 2, 3], "x.pdf")
+    assert dict(pp.processed) == {1: True, 2: False, 3: True}
+
+
+@pytest.mark.asyncio
+async def test_batch_extract_groups_consecutive_simple_pages(monkeypatch):
+    pp = FakeProcessor()
+    orch = _make(pp, monkeypatch, parse=2, window=4, batch=4)
+    monkeypatch.setattr(orch_mod, "get_concurrency_for_pages", _one_consumer)
+    job = SimpleNamespace(job_id="job-3", merchant_id="m1", file_hash="", category=None,
+                          frozen_config_version=None)
+    await orch._process_parallel(job, list(range(1, 13)), "x.pdf")
+
+    assert sorted(p for p, _ in pp.processed) == list(range(1, 13))
+    batched = [p for b in pp.batches for p in b]
+    assert batched and all(len(b) >= 2 for b in pp.batches)
+    assert 5 not in batched and 10 not in batched
+    for b in pp.batches:
+        assert b == list(range(b[0], b[0] + len(b)))
+
+
+@pytest.mark.asyncio
+async def test_reprocess_bypasses_page_cache(monkeypatch):
+    pp = FakeProcessor()
+    orch = _make(pp, monkeypatch)
+    job = SimpleNamespace(job_id="job-4", merchant_id="m1", file_hash="", category=None,
+                          frozen_config_version=None)
+    await orch._process_parallel(job, [1, 2], "x.pdf")
+    assert pp.bypass == {False}
+    pp.bypass.clear()
+    await orch._process_parallel(job, [1, 2], "x.pdf", priority=orch_mod.PRIORITY_REPROCESS)
+    assert pp.bypass == {True}
@@ -0,0 +1,72 @@
+"""StorageProvider 测试: 本地读写 / MinIO 调用不阻塞事件循环。"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pdf_sku.storage import minio_provider as minio_mod
+from pdf_sku.storage.local_provider import LocalStorageProvider
+from pdf_sku.storage.minio_provider import MinioStorageProvider
+
+
+@pytest.mark.asyncio
+async def test_local_save_and_read(tmp_path):
+    store = LocalStorageProvider(str(tmp_path))
+    path = await store.save_file("job/images/p1_0.png", b"\x89PNG" * 10)
+    assert path == str(tmp_path / "job/images/p1_0.png")
+    assert await store.read_file("job/images/p1_0.png") == b"\x89PNG" * 10
+
+    src = tmp_path / "src.pdf"
+    src.write_bytes(b"%PDF-1.7 data")
+    await store.save_file_from_path("job/source.pdf", str(src))
+    assert await store.read_file("job/source.pdf") == b"%PDF-1.7 data"
+
+
+class _BlockingMinio:
+    """同步阻塞的 minio 客户端替身。"""
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self.threads: set[str] = set()
+        self.put_kwargs: list[dict] = []
+
+    def put_object(self, bucket, name, data, length, **kwargs):
+        time.sleep(0.05)
+        self.threads.add(threading.current_thread().name)
+        self.put_kwargs.append(kwargs)
+        self.objects[name] = data.read()
+
+    def get_object(self, bucket, name):
+        import io
+        resp = io.BytesIO(self.objects[name])
+        resp.release_conn = lambda: None
+        return resp
+
+
+@pytest.mark.asyncio
+async def test_minio_calls_off_loop():
+    client = _BlockingMinio()
+    store = MinioStorageProvider(client=client)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    t = asyncio.create_task(ticker())
+    items = [(f"img/{i}.jpg", b"x" * 10) for i in range(8)]
+    t0 = time.perf_counter()
+    await asyncio.gather(*(store.save_file(p, d) for p, d in items))
+    elapsed = time.perf_counter() - t0
+    t.cancel()
+
+    assert elapsed < 0.05 * 8 / 2  # 并发上传
+    assert ticks >= 5  # 上传期间事件循环保持响应
+    assert all(name.startswith("minio-io") for name in client.threads)
+    assert client.put_kwargs[0]["part_size"] == minio_mod.MULTIPART_PART_SIZE
+
+    assert await store.read_file("img/3.jpg") == b"x" * 10
+    store.close()
@@ -1,6 +1,8 @@
 """事件链完整性测试。"""
+import asyncio
+
 import pytest
-from pdf_sku.gateway.event_bus import EventBus
+from pdf_sku.gateway.event_bus import EventBus, SUBSCRIBER_DROPPED, subscriber_name
 
 
 @pytest.mark.asyncio
@@ -74,3 +76,95 @@ def test_full_event_chain_types():
     }
     # Just verify the list is known
     assert len(expected_events) == 8
+
+
+@pytest.mark.asyncio
+async def test_event_bus_queued_publish_does_not_wait():
+    bus = EventBus()
+    bus.enable_queues(maxsize=10)
+    gate = asyncio.Event()
+    fast, slow = [], []
+
+    async def slow_handler(event):
+        await gate.wait()
+        slow.append(event["n"])
+
+    async def fast_handler(event):
+        fast.append(event["n"])
+
+    bus.subscribe("PageCompleted", slow_handler)
+    bus.subscribe("PageCompleted", fast_handler)
+    for n in range(3):
+        await bus.publish("PageCompleted", {"n": n})
+    await asyncio.sleep(0)
+    assert fast == [0, 1, 2]  # 慢订阅者不阻塞发布方与其他订阅者
+    assert slow == []
+
+    gate.set()
+    await bus.drain()
+    assert slow == [0, 1, 2]
+    await bus.aclose()
+
+
+@pytest.mark.asyncio
+async def test_event_bus_queue_overflow_drop_oldest():
+    bus = EventBus()
+    bus.enable_queues(maxsize=2, overflow="drop_oldest")
+    gate = asyncio.Event()
+    seen = []
+
+    async def handler(event):
+        await gate.wait()
+        seen.append(event["n"])
+
+    bus.subscribe("SSE", handler, lossy=True)
+    name = subscriber_name("SSE", handler)
+    before = SUBSCRIBER_DROPPED.labels(subscriber=name)._value.get()
+    await bus.publish("SSE", {"n": 0})
+    await asyncio.sleep(0)  # worker 取走 0 并阻塞
+    for n in range(1, 5):
+        await bus.publish("SSE", {"n": n})
+    gate.set()
+    await bus.drain()
+    assert seen == [0, 3, 4]
+    assert SUBSCRIBER_DROPPED.labels(subscriber=name)._value.get() - before == 2
+    await bus.aclose()
+
+
+@pytest.mark.asyncio
+async def test_event_bus_overflow_policy_only_for_lossy_subscribers():
+    bus = EventBus()
+    bus.enable_queues(maxsize=1, overflow="drop_newest")
+    gate = asyncio.Event()
+    imported, pushed = [], []
+
+    async def importer(event):
+        await gate.wait()
+        imported.append(event["n"])
+
+    async def sse(event):
+        await gate.wait()
+        pushed.append(event["n"])
+
+    bus.subscribe("PageCompleted", importer)
+    bus.subscribe("PageStatusChanged", sse, lossy=True)
+    for n in range(4):
+        await bus.publish("PageStatusChanged", {"n": n})  # 队列满直接丢弃, 不阻塞
+        await asyncio.sleep(0)
+
+    await bus.publish("PageCompleted", {"n": 0})
+    await asyncio.sleep(0)
+    publisher = asyncio.create_task(_publish_many(bus, "PageCompleted", range(1, 4)))
+    await asyncio.sleep(0.01)
+    assert not publisher.done()  # 非 lossy 订阅者恒为 block: 发布方等待而非丢弃
+    gate.set()
+    await publisher
+    await bus.drain()
+    assert imported == [0, 1, 2, 3]
+    assert pushed == [0, 1]
+    await bus.aclose()
+
+
+async def _publish_many(bus, event_type, ns):
+    for n in ns:
+        await bus.publish(event_type, {"n": n})
@@ -25,7 +25,7 @@ interface ActivityEntry {
 
 const EVENT_CONFIG: Record<string, { label: string; level: ActivityEntry["level"]; format: (d: any) => string }> = {
   page_completed:     { label: "页面完成", level: "success", format: (d) => `第 ${d.page_no} 页处理完成${d.sku_count ? `，${d.sku_count} 个 SKU` : ""}` },
-  pages_batch_update: { label: "批量更新", level: "info",    format: (d) => `${d.completed ?? "?"} 页已完成` },
+  pages_batch_update: { label: "批量更新", level: "info",    format: (d) => `${d.count ?? d.pages?.length ?? "?"} 页状态更新` },
   job_completed:      { label: "Job 完成", level: "success", format: (d) => `处理完成，共 ${d.total_skus} 个 SKU` },
   job_failed:         { label: "Job 失败", level: "error",   format: (d) => d.error_message || "处理失败" },
   human_needed:       { label: "需人工",   level: "warning", format: (d) => `${d.task_count} 个任务需要人工标注` },
@@ -6,6 +6,7 @@ import { useNotificationStore } from "./notificationStore";
 import type { Job } from "../types/models";
 import type {
   SSEPageCompleted,
+  SSEPagesBatchUpdate,
   SSEJobCompleted,
   SSEJobFailed,
   SSEHumanNeeded,
@@ -73,9 +74,14 @@ export const useSSEStore = create<SSEState>()(
         } catch { /* ignore */ }
       });
 
+      // 服务端将 PageStatusChanged 按时间窗合并为批量帧, 逐页更新页面网格
       es.addEventListener("pages_batch_update", (e: MessageEvent) => {
         try {
-          const data = JSON.parse(e.data);
+          const data: SSEPagesBatchUpdate = JSON.parse(e.data);
+          const { updatePageStatus } = useJobStore.getState();
+          for (const p of data.pages ?? []) {
+            updatePageStatus(p.page_no, p.status);
+          }
           dispatch("pages_batch_update", data);
         } catch { /* ignore */ }
       });
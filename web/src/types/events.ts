@@ -19,6 +19,8 @@ export interface SSEPageCompleted {
 }
 
 export interface SSEPagesBatchUpdate {
+  job_id: string;
+  count: number;
   pages: { page_no: number; status: string }[];
 }
 